@@ -0,0 +1,32 @@
+#!/usr/bin/env python
+"""
+Measures the (de)serialization throughput of big scalar arrays in each endianness.
+
+:file: array_endianness.py
+:date: 18/10/2026
+"""
+
+import timeit
+from hydras import *
+
+SIZES = (1024, 64 * 1024, 1024 * 1024)
+ITEM_TYPES = (u32, u32_le, u32_be)
+
+
+def bench(item_type, count, repeat=5):
+    serializer = item_type[count]()
+    value = list(range(count))
+    raw = serializer.serialize(value)
+
+    number = max(1, (64 * 1024) // count)
+    encode = min(timeit.repeat(lambda: serializer.serialize(value), number=number, repeat=repeat)) / number
+    decode = min(timeit.repeat(lambda: serializer.deserialize(raw), number=number, repeat=repeat)) / number
+    return encode, decode
+
+
+if __name__ == '__main__':
+    print(f'{"type":>16} {"items":>8} {"encode [ms]":>12} {"decode [ms]":>12}')
+    for item_type in ITEM_TYPES:
+        for count in SIZES:
+            encode, decode = bench(item_type, count)
+            print(f'{get_type_name(item_type):>16} {count:>8} {encode * 1e3:>12.3f} {decode * 1e3:>12.3f}')
@@ -0,0 +1,52 @@
+#!/usr/bin/env python
+"""
+Compares the `Framer` against naive `buf += data; buf = buf[n:]` framing of a chunked stream.
+
+:file: framing.py
+:date: 18/10/2026
+"""
+
+import time
+from hydras import *
+
+
+class Header(Struct):
+    opcode = u8
+    data_length = u32
+
+
+class DataPacket(Struct):
+    header = Header
+    payload = u8[Ref('header.data_length')]
+
+
+def naive(chunks):
+    buf = b''
+    count = 0
+    for chunk in chunks:
+        buf += chunk
+        while True:
+            length = DataPacket.peek_length(buf)
+            if length is None or length > len(buf):
+                break
+            DataPacket.deserialize(buf[:length])
+            buf = buf[length:]
+            count += 1
+    return count
+
+
+def framed(chunks):
+    framer = Framer(DataPacket)
+    return sum(1 for chunk in chunks for _ in framer.feed(chunk))
+
+
+if __name__ == '__main__':
+    packet = DataPacket(dict(payload=bytes(128))).serialize()
+    for burst in (256, 4096, 16384):
+        stream = packet * burst
+        # A burst of messages arriving in one big read, followed by small reads
+        chunks = [stream[:len(stream) // 2]] + [stream[i:i + 64] for i in range(len(stream) // 2, len(stream), 64)]
+        for name, func in (('naive', naive), ('framer', framed)):
+            start = time.perf_counter()
+            assert func(chunks) == burst
+            print(f'{name:>8} {burst:>6} messages: {(time.perf_counter() - start) * 1e3:8.2f} ms')
@@ -0,0 +1,90 @@
+#!/usr/bin/env python
+"""
+Compares the import time of eager and lazy dwarf2hydra modules for a schema of 10,000 types.
+
+:file: lazy_import.py
+:date: 18/10/2026
+"""
+
+import os
+import sys
+import compileall
+import subprocess
+import tempfile
+from hydras.tools.dwarf2hydra import write_lazy_hydra_module
+
+TYPE_COUNT = 10000
+USED_TYPES = ('struct_0', 'struct_2500', 'struct_4999', 'enum_17', 'union_33')
+
+
+def make_schema(type_count):
+    """ Make a schema of structs that refer to enums, unions and (most of them) one of the first 100 structs. """
+    descriptions = {}
+    for i in range(type_count // 4):
+        descriptions[f'enum_{i}'] = ('enum', 'u16', ((f'E{i}_A', 0), (f'E{i}_B', 1), (f'E{i}_C', 7)))
+        descriptions[f'union_{i}'] = ('union', (('word', 'u32'), ('bytes', ('u8', 4))))
+
+    struct_count = type_count - len(descriptions)
+    for i in range(struct_count):
+        members = [('opcode', f'enum_{i % (type_count // 4)}'),
+                   ('_padding_0', ('u8', 2)),
+                   ('length', 'u32'),
+                   ('w', f'union_{i % (type_count // 4)}'),
+                   ('values', ('f64', 3, 2))]
+        if i >= 100:
+            members.append(('nested', f'struct_{i % 100}'))
+        descriptions[f'struct_{i}'] = ('struct', tuple(members))
+    return descriptions
+
+
+def ref_source(ref):
+    if isinstance(ref, tuple):
+        return ref_source(ref[0]) + ''.join('[:]' if size is None else f'[{size}]' for size in ref[1:])
+    return ref
+
+
+def write_eager_module(descriptions, fp):
+    """ Write the schema as `generate_hydra_file` would, with a class statement for every type. """
+    fp.write('from hydras import *\n')
+    for name, (kind, *description) in descriptions.items():
+        if kind == 'alias':
+            fp.write(f'\n{name} = {ref_source(description[0])}\n')
+        elif kind == 'enum':
+            fp.write(f'\n\nclass {name}(Enum, underlying_type={ref_source(description[0])}):\n')
+            fp.writelines(f'    {literal} = {value}\n' for literal, value in description[1])
+        else:
+            fp.write(f'\n\nclass {name}({"Struct" if kind == "struct" else "Union"}):\n')
+            fp.writelines(f'    {member} = {ref_source(ref)}\n' for member, ref in description[0])
+
+
+def time_import(directory, module):
+    """ Import a (compiled) module in a fresh interpreter, and use a few of its types. """
+    script = (f'import time, hydras\n'
+              f'start = time.perf_counter()\n'
+              f'import {module}\n'
+              f'imported = time.perf_counter()\n'
+              f'for name in {USED_TYPES!r}:\n'
+              f'    getattr({module}, name)()\n'
+              f'print(imported - start, time.perf_counter() - imported)\n')
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join([directory] + sys.path))
+    output = subprocess.run([sys.executable, '-c', script], env=env, check=True, capture_output=True, text=True)
+    return map(float, output.stdout.split())
+
+
+def main():
+    descriptions = make_schema(TYPE_COUNT)
+    with tempfile.TemporaryDirectory() as directory:
+        for module, write in (('eager_schema', write_eager_module), ('lazy_schema', write_lazy_hydra_module)):
+            path = os.path.join(directory, f'{module}.py')
+            with open(path, 'w') as fp:
+                write(descriptions, fp)
+            compileall.compile_file(path, quiet=1)
+
+            import_time, use_time = time_import(directory, module)
+            print(f'{module:<14} {os.path.getsize(path) / 1024:8.0f} KiB  '
+                  f'import {import_time * 1000:8.1f} ms  '
+                  f'use {len(USED_TYPES)} types {use_time * 1000:6.1f} ms')
+
+
+if __name__ == '__main__':
+    main()
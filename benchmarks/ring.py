@@ -0,0 +1,89 @@
+#!/usr/bin/env python
+"""
+Compares passing the README's `DataPacket` between processes through a `RingQueue` and a `multiprocessing.Queue`.
+
+:file: ring.py
+:date: 18/10/2026
+"""
+
+import functools
+import multiprocessing
+import time
+from hydras import *
+
+
+class Header(Struct):
+    opcode = u8
+    data_length = u32
+
+
+class DataPacket(Struct):
+    header = Header(dict(opcode=15, data_length=128))
+    payload = u8[128]
+
+
+def consume_queue(queue, count):
+    for _ in range(count):
+        queue.get()
+
+
+def consume_ring(name, count, batch):
+    with RingQueue(DataPacket, 1024, name) as ring:
+        received = 0
+        while received < count:
+            popped = len(ring.pop_many(batch))
+            if popped == 0:
+                time.sleep(1e-4)
+            received += popped
+
+
+def consume_ring_views(name, count, batch):
+    with RingQueue(DataPacket, 1024, name) as ring:
+        received = 0
+        while received < count:
+            with ring.consume(batch) as views:
+                for view in views:
+                    view[0]
+            if not views:
+                time.sleep(1e-4)
+            received += len(views)
+
+
+def with_queue(packets, batch):
+    queue = multiprocessing.Queue(1024)
+    consumer = multiprocessing.Process(target=consume_queue, args=(queue, len(packets)))
+    consumer.start()
+    for packet in packets:
+        queue.put(packet)
+    consumer.join()
+    queue.close()
+    queue.join_thread()
+
+
+def with_ring(packets, batch, consume=consume_ring):
+    with RingQueue(DataPacket, 1024, create=True) as ring:
+        consumer = multiprocessing.Process(target=consume, args=(ring.name, len(packets), batch))
+        consumer.start()
+        for i in range(0, len(packets), batch):
+            pending = packets[i:i + batch]
+            while pending:
+                pushed = ring.push_many(pending)
+                if pushed == 0:
+                    time.sleep(1e-4)
+                pending = pending[pushed:]
+        consumer.join()
+        ring.unlink()
+
+
+if __name__ == '__main__':
+    count = 50000
+    packets = [DataPacket(dict(payload=bytes(range(128)))) for _ in range(count)]
+    ring_views = functools.partial(with_ring, consume=consume_ring_views)
+    for name, func, batch in (('Queue', with_queue, 1),
+                              ('RingQueue', with_ring, 1),
+                              ('RingQueue', with_ring, 64),
+                              ('views', ring_views, 64)):
+        start = time.perf_counter()
+        func(packets, batch)
+        elapsed = time.perf_counter() - start
+        print(f'{name:>10} (batches of {batch:>2}): {count / elapsed:8.0f} msg/s')
@@ -0,0 +1,75 @@
+#!/usr/bin/env python
+"""
+Compares the throughput and allocations of the ways to serialize the README's `DataPacket`.
+
+:file: serialize.py
+:date: 18/10/2026
+"""
+
+import time
+import tracemalloc
+from hydras import *
+
+
+class Opcodes(Enum, underlying_type=u8):
+    KEEP_ALIVE = 3
+    DATA = 15
+
+
+class Header(Struct):
+    opcode = Opcodes
+    data_length = u32
+
+
+class DataPacket(Struct):
+    header = Header(dict(opcode=Opcodes.DATA, data_length=128))
+    payload = u8[128]
+
+
+class LargePacket(Struct):
+    header = Header
+    payload = u8[Ref('header.data_length')]
+
+
+def to_bytes(packet, count):
+    for _ in range(count):
+        packet.serialize()
+
+
+def to_bytearray(packet, count):
+    for _ in range(count):
+        packet.serialize(as_bytearray=True)
+
+
+POOL = BufferPool()
+
+
+def pooled(packet, count):
+    for _ in range(count):
+        with POOL.serialize(packet):
+            pass
+
+
+def measure(packet, count):
+    for name, func in (('bytes', to_bytes), ('bytearray', to_bytearray), ('pool', pooled)):
+        start = time.perf_counter()
+        func(packet, count)
+        elapsed = time.perf_counter() - start
+
+        # The peak memory allocated while serializing a single message, after warming up
+        tracemalloc.start()
+        func(packet, 1)
+        tracemalloc.reset_peak()
+        base, _ = tracemalloc.get_traced_memory()
+        func(packet, 1)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        print(f'{name:>10}: {count / elapsed:8.0f} msg/s, {peak - base:5} bytes allocated at peak')
+
+
+if __name__ == '__main__':
+    for packet, count in ((DataPacket(dict(payload=bytes(range(128)))), 100000),
+                          (LargePacket(dict(payload=bytes(1 << 16))), 20000)):
+        print(f'{len(packet)} byte messages:')
+        measure(packet, count)
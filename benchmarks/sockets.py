@@ -0,0 +1,91 @@
+#!/usr/bin/env python
+"""
+Compares the socket helpers of `Struct` against naive per-message socket calls.
+
+:file: sockets.py
+:date: 18/10/2026
+"""
+
+import socket
+import threading
+import time
+from hydras import *
+
+
+class Header(Struct):
+    opcode = u8
+    data_length = u32
+
+
+class DataPacket(Struct):
+    header = Header
+    payload = u8[Ref('header.data_length')]
+
+
+def drain(sock, total):
+    while total > 0:
+        total -= len(sock.recv(1 << 16))
+
+
+def send_naive(sock, packets):
+    for packet in packets:
+        sock.sendall(packet.serialize())
+
+
+def send_batched(sock, packets):
+    buffer = bytearray(1 << 16)
+    for i in range(0, len(packets), 64):
+        Struct.send_many(sock, packets[i:i + 64], buffer)
+
+
+def serialize_copy(packets):
+    return sum(len(p.serialize()) for p in packets)
+
+
+def serialize_iov(packets):
+    return sum(len(b) for p in packets for b in p.serialize_iov())
+
+
+def recv_naive(sock, count):
+    for _ in range(count):
+        DataPacket.deserialize(sock.recvfrom(2048)[0])
+
+
+def recv_into(sock, count):
+    buffer = bytearray(2048)
+    for _ in range(count):
+        DataPacket.recv_from(sock, buffer)
+
+
+if __name__ == '__main__':
+    count = 20000
+    packets = [DataPacket(dict(payload=bytes(128))) for _ in range(count)]
+    total = sum(len(p) for p in packets)
+
+    for name, func in (('naive', send_naive), ('send_many', send_batched)):
+        left, right = socket.socketpair()
+        with left, right:
+            reader = threading.Thread(target=drain, args=(right, total))
+            reader.start()
+            start = time.perf_counter()
+            func(left, packets)
+            reader.join()
+            print(f'{name:>10} send {count} messages: {(time.perf_counter() - start) * 1e3:8.2f} ms')
+
+    large = [DataPacket(dict(payload=bytes(1 << 16))) for _ in range(2000)]
+    for name, func in (('serialize', serialize_copy), ('iov', serialize_iov)):
+        start = time.perf_counter()
+        func(large)
+        print(f'{name:>10} {len(large)} 64KiB messages: {(time.perf_counter() - start) * 1e3:8.2f} ms')
+
+    datagram = packets[0].serialize()
+    for name, func in (('naive', recv_naive), ('recv_from', recv_into)):
+        left, right = socket.socketpair(socket.AF_UNIX, socket.SOCK_DGRAM)
+        with left, right:
+            right.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 1 << 22)
+            start = time.perf_counter()
+            for i in range(0, count, 100):
+                for _ in range(100):
+                    left.send(datagram)
+                func(right, 100)
+            print(f'{name:>10} recv {count} messages: {(time.perf_counter() - start) * 1e3:8.2f} ms')
@@ -14,6 +14,17 @@ from .struct import *
 # Serializers
 from .scalars import *
 from .enum import *
+from .bitfield import *
+from .padding import *
+from .dispatch import *
+from .framing import *
 
 # Misc.
 from .validators import *
+from .pool import *
+from .shared import *
+from .ring import *
+from .lazy import *
+
+# Imported last, since modules without an `__all__` also export `typing.Union`.
+from .union import *
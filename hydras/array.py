@@ -19,13 +19,14 @@ BYTE_TYPES = (u8, u8_be, u8_le)
 
 
 class ArrayMetadata(SerializerMetadata):
-    __slots__ = ('array_size_min', 'array_size_max', 'serializer', 'allowed_py_types')
+    __slots__ = ('array_size_min', 'array_size_max', 'serializer', 'allowed_py_types', 'length_ref')
 
-    def __init__(self, array_size_min: int, array_size_max: int, serializer: Serializer):
+    def __init__(self, array_size_min: int, array_size_max: int, serializer: Serializer, length_ref: Ref = None):
         super().__init__(array_size_min * serializer.byte_size)
         self.array_size_min = array_size_min
         self.array_size_max = array_size_max
         self.serializer = serializer
+        self.length_ref = length_ref
         self.allowed_py_types = (list, tuple)
         if isinstance(serializer, BYTE_TYPES):
             self.allowed_py_types += (bytes, bytearray)
@@ -37,6 +38,9 @@ class ArrayMetadata(SerializerMetadata):
 class ArrayMeta(SerializerMeta):
     _hydras_metadata: ArrayMetadata
 
+    # Structurally identical array types are created once and then shared.
+    _interned_types = weakref.WeakValueDictionary()
+
     def __getitem__(cls, args):
         is_array_type = (
                 issubclass(cls, Array) and
@@ -47,7 +51,11 @@ class ArrayMeta(SerializerMeta):
             return super().__getitem__(args)
 
         size, serializer = args
-        if isinstance(size, int):
+        length_ref = None
+        if isinstance(size, Ref):
+            length_ref = size
+            size_min, size_max = 0, None
+        elif isinstance(size, int):
             if size < 0:
                 raise ValueError(f'Array size must not be negative, got {size}')
             size_min = size_max = size
@@ -62,18 +70,31 @@ class ArrayMeta(SerializerMeta):
             elif size_max is not None and size_max < size_min:
                 raise ValueError('Array maximum size must be greater than its minimum size')
         else:
-            raise TypeError(f'Expected int or a slice as array size, got {get_type_name(size)}')
+            raise TypeError(f'Expected int, a slice or a Ref as array size, got {get_type_name(size)}')
 
         if not issubclass(type(serializer), Serializer):
             raise TypeError('Array: items_type must be a Serializer')
 
         serializer = get_as_value(serializer)
+        serializer_key = serializer.get_interning_key()
+        if serializer_key is None:
+            return cls._create_type(size_min, size_max, serializer, length_ref)
+
+        key = (size_min, size_max, length_ref, serializer_key)
+        array_type = ArrayMeta._interned_types.get(key)
+        if array_type is None:
+            array_type = ArrayMeta._interned_types[key] = cls._create_type(size_min, size_max, serializer, length_ref)
+        return array_type
+
+    def _create_type(cls, size_min: int, size_max: int, serializer: Serializer, length_ref: Ref = None):
         return type(get_type_name(cls), (cls,), {
-            SerializerMeta.METAATTR: ArrayMetadata(size_min, size_max, serializer)
+            SerializerMeta.METAATTR: ArrayMetadata(size_min, size_max, serializer, length_ref)
         })
 
     def __repr__(cls) -> str:
-        if not cls._hydras_metadata.is_constant_size():
+        if cls._hydras_metadata.length_ref is not None:
+            size = repr(cls._hydras_metadata.length_ref)
+        elif not cls._hydras_metadata.is_constant_size():
             size = f'{cls._hydras_metadata.array_size_min}:{cls._hydras_metadata.array_size_max}'
         else:
             size = f'{cls._hydras_metadata.array_size_min}'
@@ -133,18 +154,12 @@ class Array(Serializer, metaclass=ArrayMeta):
             raise ValueError('Raw data is not aligned to item size.')
 
         # Skip deserialization when the output is bytes.
-        serializer = self._hydras_metadata.serializer
-        byte_size = serializer.byte_size
-
         if isinstance(self.default_value, (bytes, bytearray)):
             parsed = type(self.default_value)(raw_data)
-        elif isinstance(serializer, Scalar):
-            item_count = len(raw_data) // byte_size
-            fmt = serializer.get_format_string(settings, item_count)
-            parsed = type(self.default_value)(struct.unpack(fmt, raw_data))
         else:
-            parsed = type(self.default_value)(serializer.deserialize(raw_data[begin:begin + byte_size], settings)
-                                              for begin in range(0, len(raw_data), byte_size))
+            parsed = self._hydras_metadata.serializer.deserialize_many(raw_data, settings)
+            if type(parsed) is not type(self.default_value):
+                parsed = type(self.default_value)(parsed)
 
         return parsed
 
@@ -167,8 +182,45 @@ class Array(Serializer, metaclass=ArrayMeta):
     def get_actual_length(self, value):
         return len(value) * self._hydras_metadata.serializer.byte_size
 
+    def is_self_delimiting(self) -> bool:
+        return self._hydras_metadata.length_ref is not None
+
+    def get_length_ref(self):
+        if self._hydras_metadata.length_ref is None:
+            return None
+        return self._hydras_metadata.length_ref.path
+
+    def get_linked_length(self, parent) -> Optional[int]:
+        if self._hydras_metadata.length_ref is None:
+            return None
+        path = self._hydras_metadata.length_ref.path
+        count = parent._hydras_get_path(path)
+        if count < 0:
+            raise ValueError(f'Length reference "{path}" holds a negative item count: {count}')
+        return count * self._hydras_metadata.serializer.byte_size
+
+    def get_serialized_buffer(self, value) -> Optional[memoryview]:
+        if isinstance(value, (bytes, bytearray)) and len(value) >= self._hydras_metadata.array_size_min:
+            return memoryview(value)
+        return None
+
+    def get_interning_key(self):
+        default_value = self.default_value
+        if isinstance(default_value, bytearray):
+            frozen_default = bytes(default_value)
+        else:
+            frozen_default = tuple(get_value_interning_key(item) for item in default_value)
+        key = (type(self), self.validator, type(default_value), frozen_default)
+        try:
+            hash(key)
+        except TypeError:
+            return None
+        return key
+
     def __repr__(self) -> str:
-        if not self.is_constant_size:
+        if self._hydras_metadata.length_ref is not None:
+            size = repr(self._hydras_metadata.length_ref)
+        elif not self.is_constant_size:
             size = f'{self._hydras_metadata.array_size_min}:{self._hydras_metadata.array_size_max}'
         else:
             size = f'{self._hydras_metadata.array_size_min}'
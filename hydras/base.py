@@ -8,8 +8,10 @@ Contains the core classes of the framework.
 """
 
 import copy
+import struct
+import weakref
 import collections
-from typing import Any, List, Dict, Union, Iterator, Callable
+from typing import Any, List, Dict, Tuple, Optional, Union, Iterator, Callable
 from abc import ABCMeta, abstractmethod
 from .validators import *
 
@@ -116,6 +118,15 @@ class SerializerMeta(ABCMeta):
         return self.byte_size
 
 
+def get_value_interning_key(value):
+    """
+    Returns a key that is equal only for identical values, as opposed to equal ones (e.g. `0.0 == -0.0`, `1 == True`).
+    """
+    if isinstance(value, float):
+        return float, struct.pack('<d', value)
+    return type(value), value
+
+
 class Serializer(metaclass=SerializerMeta):
     """ The base type for Hydra's serializers. """
     __slots__ = ('byte_size', 'is_constant_size', 'validator', 'default_value')
@@ -143,11 +154,14 @@ class Serializer(metaclass=SerializerMeta):
     def get_initial_values(self, count):
         return [self.get_initial_value() for _ in range(count)]
 
-    def serialize(self, value, settings: HydraSettings = None) -> bytes:
-        """ When implemented in derived classes, returns the byte representation of the give value. """
+    def serialize(self, value, settings: HydraSettings = None, as_bytearray: bool = False) -> bytes:
+        """
+        Returns the byte representation of the given value.
+        When `as_bytearray` is set, the `bytearray` the value was serialized into is returned, saving a copy.
+        """
         storage = bytearray(self.get_actual_length(value))
         self.serialize_into(memoryview(storage), 0, value, settings)
-        return bytes(storage)
+        return storage if as_bytearray else bytes(storage)
 
     @abstractmethod
     def serialize_into(self,
@@ -176,6 +190,12 @@ class Serializer(metaclass=SerializerMeta):
         """ When implemented in derived classes, parses the raw data. """
         raise NotImplementedError()
 
+    def deserialize_many(self, raw_data, settings: HydraSettings = None) -> List[Any]:
+        """ Parses raw data made of consecutive values of this serializer. """
+        byte_size = self.byte_size
+        return [self.deserialize(raw_data[begin:begin + byte_size], settings)
+                for begin in range(0, len(raw_data), byte_size)]
+
     def render_lines(self, name, value, options: RenderOptions = None) -> List[str]:
         if name is None:
             return [str(value)]
@@ -199,6 +219,44 @@ class Serializer(metaclass=SerializerMeta):
         """ When used on variable length formatters, returns the actual serialized length of the given python value. """
         return self.byte_size
 
+    def is_self_delimiting(self) -> bool:
+        """
+        Determines whether a variable-size serializer can tell the length of its data without consuming
+        the rest of the buffer, allowing other members to follow it.
+        """
+        return False
+
+    def get_length_ref(self):
+        """ Get the path of the member holding this serializer's item count, if its length is linked to one. """
+        return None
+
+    def holds_value(self) -> bool:
+        """ Determines whether structs store a value for members of this serializer (unlike e.g. padding). """
+        return True
+
+    def get_linked_length(self, parent) -> Optional[int]:
+        """ Get the byte length of a linked serializer, using the already deserialized members of `parent`. """
+        return None
+
+    def get_serialized_buffer(self, value) -> Optional[memoryview]:
+        """
+        Get a buffer that is already the serialized form of `value`, allowing it to be referenced instead of copied,
+        or `None` if the value has to be serialized.
+        """
+        return None
+
+    def get_interning_key(self):
+        """
+        Returns a hashable key that is shared by all serializers behaving identically to this one,
+        or `None` if this serializer cannot be shared with others (e.g. its default value is mutable).
+        """
+        key = (type(self), self.validator, get_value_interning_key(self.default_value))
+        try:
+            hash(key)
+        except TypeError:
+            return None
+        return key
+
     def __getitem__(self, item_count):
         """
         This hack enables the familiar array syntax: `type()[count]`.
@@ -0,0 +1,197 @@
+"""
+Contains the bitfield type formatter.
+
+:file:  bitfield.py
+:date:  18/10/2026
+"""
+
+from .base import *
+from .scalars import *
+from .utils import *
+
+__all__ = ('Bitfield', 'BitfieldValue')
+
+_UNSIGNED_FORMATS = ('B', 'H', 'I', 'Q')
+
+
+class BitfieldValue:
+    """
+    The base class for values of bitfields.
+    Every bitfield type has its own value class, with an attribute per field.
+
+    Bits of the storage unit that belong to no field are kept as they were deserialized,
+    and are written back when serializing.
+    """
+    __slots__ = ('_hydras_reserved', )
+
+    # (name, shift, mask) of every field, in declaration order.
+    _hydras_fields = ()
+    _hydras_masks = {}
+    # The bits of the storage unit that belong to any field.
+    _hydras_used_mask = 0
+
+    def __init__(self, initial_values: dict = None):
+        initial_values = initial_values or {}
+        for name in initial_values:
+            if name not in self._hydras_masks:
+                raise TypeError(f'Unknown bitfield "{name}"')
+
+        object.__setattr__(self, '_hydras_reserved', 0)
+        for name, _, _ in self._hydras_fields:
+            setattr(self, name, initial_values.get(name, 0))
+
+    @classmethod
+    def from_int(cls, raw: int) -> 'BitfieldValue':
+        """ Unpack the fields from the integral value of the storage unit. """
+        obj = object.__new__(cls)
+        object.__setattr__(obj, '_hydras_reserved', raw & ~cls._hydras_used_mask)
+        for name, shift, mask in cls._hydras_fields:
+            object.__setattr__(obj, name, (raw >> shift) & mask)
+        return obj
+
+    def __int__(self):
+        """ Pack the fields into the integral value of the storage unit. """
+        raw = self._hydras_reserved
+        for name, shift, _ in self._hydras_fields:
+            raw |= getattr(self, name) << shift
+        return raw
+
+    def __setattr__(self, key, value):
+        mask = self._hydras_masks.get(key)
+        if mask is None:
+            raise AttributeError(f'Unknown bitfield "{key}"')
+        elif not isinstance(value, int) or not 0 <= value <= mask:
+            raise ValueError(f'Value {value} does not fit in bitfield "{key}"')
+        object.__setattr__(self, key, value)
+
+    def __iter__(self):
+        """ Support conversion to dict """
+        for name, _, _ in self._hydras_fields:
+            yield name, getattr(self, name)
+
+    def __eq__(self, other):
+        if isinstance(other, BitfieldValue):
+            return type(self) is type(other) and int(self) == int(other)
+        return int(self) == other
+
+    __hash__ = None
+
+    def __copy__(self):
+        return self.from_int(int(self))
+
+    def __deepcopy__(self, memo):
+        return self.from_int(int(self))
+
+    def __repr__(self):
+        fields = ', '.join(f'{name}={value}' for name, value in self)
+        if self._hydras_reserved:
+            fields += f', <reserved>={self._hydras_reserved:#x}'
+        return f'{{{fields}}}'
+
+
+class BitfieldMetadata(SerializerMetadata):
+    __slots__ = ('serializer', 'value_type', 'used_mask')
+
+    def __init__(self, serializer: Scalar, fields: Dict[str, int]):
+        if not isinstance(serializer, Scalar) or serializer._hydras_metadata.fmt not in _UNSIGNED_FORMATS:
+            raise TypeError(f'Bitfield storage must be an unsigned integer, got {serializer}')
+
+        super().__init__(serializer.byte_size)
+
+        layout = []
+        masks = {}
+        shift = 0
+        for name, width in fields.items():
+            if not isinstance(width, int) or width <= 0:
+                raise ValueError(f'Bitfield "{name}" must have a positive bit width, got {width}')
+            layout.append((name, shift, mask(width)))
+            masks[name] = mask(width)
+            shift += width
+
+        if shift > serializer.byte_size * 8:
+            raise ValueError(f'Bitfields require {shift} bits, which do not fit in {serializer}')
+
+        self.serializer = serializer
+        self.used_mask = mask(shift)
+        self.value_type = type('BitfieldValue', (BitfieldValue, ), {
+            '__slots__': tuple(masks),
+            '_hydras_fields': tuple(layout),
+            '_hydras_masks': masks,
+            '_hydras_used_mask': self.used_mask,
+        })
+
+
+class BitfieldMeta(SerializerMeta):
+    _hydras_metadata: BitfieldMetadata
+
+    # Structurally identical bitfield types are created once and then shared.
+    _interned_types = weakref.WeakValueDictionary()
+
+    def __getitem__(cls, args):
+        if cls is not Bitfield or not isinstance(args, tuple) or len(args) != 2:
+            return super().__getitem__(args)
+
+        serializer, fields = args
+        serializer = get_as_value(serializer)
+        key = (type(serializer), tuple(fields.items()))
+        bitfield_type = BitfieldMeta._interned_types.get(key)
+        if bitfield_type is None:
+            bitfield_type = BitfieldMeta._interned_types[key] = type(get_type_name(cls), (cls,), {
+                SerializerMeta.METAATTR: BitfieldMetadata(serializer, fields)
+            })
+        return bitfield_type
+
+    def __repr__(cls):
+        masks = cls._hydras_metadata.value_type._hydras_masks
+        fields = ', '.join(f'{name}={field_mask.bit_length()}' for name, field_mask in masks.items())
+        return f'{get_type_name(cls._hydras_metadata.serializer)}.bits({fields})'
+
+
+class Bitfield(Serializer, metaclass=BitfieldMeta):
+    """
+    A formatter of C-style bitfields that share a single unsigned-integer storage unit.
+    Bitfields are allocated from the least-significant bit of the storage unit, in declaration order.
+
+    Bitfield types are created using the `bits` method of unsigned scalars (e.g. `u32.bits(version=3, kind=5)`).
+    The storage unit is packed and unpacked once, using precomputed shifts and masks.
+    """
+
+    __slots__ = ()
+    _hydras_metadata: BitfieldMetadata
+
+    def __init__(self, default_value=None, *args, **kwargs):
+        value_type = self._hydras_metadata.value_type
+        if default_value is None:
+            default_value = value_type()
+        elif isinstance(default_value, dict):
+            default_value = value_type(default_value)
+        elif not isinstance(default_value, value_type):
+            raise TypeError('Default value of invalid type', default_value)
+
+        super(Bitfield, self).__init__(default_value, *args, **kwargs)
+
+    def get_initial_value(self):
+        return copy.copy(self.default_value)
+
+    def serialize_into(self, storage: memoryview, offset: int, value, settings: HydraSettings = None) -> int:
+        return self._hydras_metadata.serializer.serialize_into(storage, offset, int(value), settings)
+
+    def deserialize(self, raw_data, settings: HydraSettings = None):
+        raw = self._hydras_metadata.serializer.deserialize(raw_data, settings)
+        return self._hydras_metadata.value_type.from_int(raw)
+
+    def deserialize_many(self, raw_data, settings: HydraSettings = None) -> List[BitfieldValue]:
+        values = self._hydras_metadata.serializer.deserialize_many(raw_data, settings)
+        return list(map(self._hydras_metadata.value_type.from_int, values))
+
+    def validate(self, value):
+        if not isinstance(value, self._hydras_metadata.value_type):
+            raise TypeError(f'Expected a value of {type(self)!r}, got {type(value)}')
+
+        super(Bitfield, self).validate(value)
+
+    def values_equal(self, a, b):
+        return int(a) == int(b)
+
+    def __repr__(self):
+        return f'{type(self)!r}()'
@@ -0,0 +1,95 @@
+"""
+Contains the tagged-union dispatcher.
+
+:file:  dispatch.py
+:date:  18/10/2026
+"""
+
+from .base import *
+from .struct import *
+from .scalars import *
+from .enum import *
+import struct
+
+__all__ = ('Dispatcher', )
+
+
+class Dispatcher:
+    """
+    Decodes messages whose type is determined by a tag (discriminator) found at a static offset.
+
+    The tag is peeked directly from the raw data, without decoding the header that contains it,
+    and only the struct matching the tag is decoded.
+    Messages with unknown tags are returned as raw `bytes`.
+
+    Example:
+        dispatcher = Dispatcher(Header, 'opcode', {Opcodes.DATA: DataPacket,
+                                                   Opcodes.KEEP_ALIVE: KeepAlivePacket})
+        packet = dispatcher.deserialize(raw_data)
+    """
+
+    def __init__(self, header: Type[Struct], tag: str, mapping: Dict[Any, Type[Struct]] = None, body_offset: int = 0):
+        """
+        Create a new dispatcher.
+
+        :param header:      A struct describing the common prefix of all messages.
+        :param tag:         The path of the tag inside the header (e.g. `opcode` or `header.opcode`).
+        :param mapping:     A dictionary from tag values (enum literals or integers) to struct types.
+        :param body_offset: The offset at which the mapped structs begin. By default, mapped structs include the header.
+        """
+        self.header = header
+        self.tag_offset, tag_serializer = header.offset_of(tag)
+        self.body_offset = body_offset
+
+        # The tag is always read through its integral representation.
+        if isinstance(tag_serializer, Enum):
+            tag_serializer = tag_serializer._hydras_metadata.serializer
+        if not isinstance(tag_serializer, Scalar) or float in tag_serializer._hydras_metadata.py_types:
+            raise TypeError(f'Dispatcher tag must be an integer or an enum, got {tag_serializer}')
+        self.tag_serializer = tag_serializer
+
+        self.mapping = {}
+        for tag_value, struct_type in (mapping or {}).items():
+            self.register(tag_value, struct_type)
+
+    def register(self, tag_value, struct_type: Type[Struct]):
+        """ Map the given tag value to a struct type. """
+        self.mapping[int(tag_value)] = struct_type
+
+    def peek(self, raw_data, settings: HydraSettings = None) -> int:
+        """ Read the integral tag of the given message without decoding it. """
+        if len(raw_data) < len(self.header):
+            raise ValueError('The supplied raw data is too short for a message header')
+        return struct.unpack_from(self.tag_serializer.get_format_string(settings), raw_data, self.tag_offset)[0]
+
+    def get_struct_type(self, raw_data, settings: HydraSettings = None):
+        """ Get the struct type of the given message, or `None` if its tag is unknown. """
+        return self.mapping.get(self.peek(raw_data, settings))
+
+    def peek_length(self, raw_data, settings: HydraSettings = None) -> Optional[int]:
+        """
+        Determine the length of the message at the start of the given (possibly partial) data.
+
+        :return:    The length of the message, or `None` if more data is needed to determine it.
+        :raise ValueError:  If the message's tag is unknown, as its length cannot be determined.
+        """
+        if len(raw_data) < max(len(self.header), self.body_offset):
+            return None
+
+        tag = self.peek(raw_data, settings)
+        struct_type = self.mapping.get(tag)
+        if struct_type is None:
+            raise ValueError(f'Cannot determine the length of a message with an unknown tag: {tag}')
+
+        length = struct_type.peek_length(memoryview(raw_data)[self.body_offset:], settings)
+        return None if length is None else self.body_offset + length
+
+    def deserialize(self, raw_data, settings: HydraSettings = None):
+        """ Decode the given message into the struct matching its tag, or into `bytes` if the tag is unknown. """
+        struct_type = self.mapping.get(self.peek(raw_data, settings))
+        if struct_type is None:
+            return bytes(raw_data)
+
+        if self.body_offset != 0:
+            raw_data = memoryview(raw_data)[self.body_offset:]
+        return struct_type.deserialize(raw_data, settings)
@@ -13,7 +13,10 @@ from .scalars import *
 import collections
 
 
-__all__ = ('Enum', 'auto')
+__all__ = ('Enum', 'Flags', 'auto')
+
+# The number of combined flag-sets (i.e. values that are not literals) that are cached per flags type.
+FLAG_SETS_CACHE_SIZE = 1024
 
 
 class auto:
@@ -24,10 +27,20 @@ class auto:
 
 
 class Literal:
+    """
+    An immutable named enum value.
+    A single `Literal` object is created for every literal when the enum class is created.
+    """
+    __slots__ = ('enum', 'literal_name', 'value', '_hash')
+
     def __init__(self, enum_type, literal_name, value):
-        self.enum = enum_type
-        self.literal_name = literal_name
-        self.value = value
+        object.__setattr__(self, 'enum', enum_type)
+        object.__setattr__(self, 'literal_name', literal_name)
+        object.__setattr__(self, 'value', value)
+        object.__setattr__(self, '_hash', hash((enum_type, literal_name, value)))
+
+    def __setattr__(self, key, value):
+        raise AttributeError('Enum literals are immutable')
 
     def __int__(self):
         return self.value
@@ -36,14 +49,99 @@ class Literal:
         return f'{get_type_name(self.enum)}.{self.literal_name}'
 
     def __eq__(self, other):
-        return int(self) == int(other)
+        if self is other:
+            return True
+        elif isinstance(other, Literal):
+            return self.value == other.value
+        return self.value == int(other)
+
+    def __hash__(self):
+        return self._hash
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def __reduce__(self):
+        return getattr, (self.enum, self.literal_name)
+
+
+class FlagSet:
+    """
+    An immutable set of flags, stored as the integral value of the flags' bitwise-or.
+    Literals have a single `FlagSet` object each, and the most recently used combined values are cached.
+    """
+    __slots__ = ('flags_type', 'value')
+
+    def __init__(self, flags_type, value):
+        object.__setattr__(self, 'flags_type', flags_type)
+        object.__setattr__(self, 'value', value)
+
+    def __setattr__(self, key, value):
+        raise AttributeError('Flag sets are immutable')
+
+    def __int__(self):
+        return self.value
+
+    def __index__(self):
+        return self.value
+
+    def __bool__(self):
+        return self.value != 0
+
+    def __or__(self, other):
+        return self.flags_type.get_flag_set(self.value | int(other))
+
+    def __and__(self, other):
+        return self.flags_type.get_flag_set(self.value & int(other))
+
+    def __xor__(self, other):
+        return self.flags_type.get_flag_set(self.value ^ int(other))
+
+    __ror__ = __or__
+    __rand__ = __and__
+    __rxor__ = __xor__
+
+    def __invert__(self):
+        return self.flags_type.get_flag_set(~self.value & self.flags_type._hydras_metadata.valid_mask)
+
+    def __contains__(self, item):
+        item = int(item)
+        return self.value & item == item
+
+    def __iter__(self):
+        """ Iterate over the named flags contained in this set. """
+        for flag in self.flags_type._hydras_metadata.literal_objects.values():
+            if flag.value != 0 and flag in self:
+                yield flag
+
+    def __eq__(self, other):
+        if self is other:
+            return True
+        elif isinstance(other, FlagSet):
+            return self.value == other.value
+        return self.value == int(other)
 
     def __hash__(self):
-        return hash((self.enum, self.literal_name, self.value))
+        return hash(self.value)
+
+    def __repr__(self):
+        return self.flags_type.get_literal_name(self.value) or f'{get_type_name(self.flags_type)}(0)'
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def __reduce__(self):
+        return self.flags_type.get_flag_set, (self.value, )
 
 
 class EnumMetadata(SerializerMetadata):
-    __slots__ = ('flags', 'serializer', 'literals', 'reverse_map')
+    __slots__ = ('flags', 'serializer', 'literals', 'literal_objects', 'reverse_map', 'flag_sets', 'valid_mask')
     _VALID_UNDERLYING_TYPES = (
         u8, u16, u32, u64, i8, i16, i32, i64,
         u8_le, u16_le, u32_le, u64_le, i8_le, i16_le, i32_le, i64_le,
@@ -51,7 +149,6 @@ class EnumMetadata(SerializerMetadata):
 
     def __init__(self, *,
                  literals: collections.OrderedDict,
-                 reverse_map: Dict,
                  underlying: Type['Scalar'],
                  flags: bool = False):
         super().__init__(underlying.byte_size)
@@ -68,21 +165,37 @@ class EnumMetadata(SerializerMetadata):
         self.flags = flags
         self.serializer = serializer
         self.literals = literals
-        self.reverse_map = reverse_map
+        # Populated with the `Literal` (or `FlagSet`) singletons once the enum type is created.
+        self.literal_objects = collections.OrderedDict()
+        self.reverse_map = {}
+        # For flags, a LRU cache of the flag-sets of combined values, bounded by `FLAG_SETS_CACHE_SIZE`.
+        self.flag_sets = collections.OrderedDict()
+
+        self.valid_mask = None
+        if flags:
+            self.valid_mask = 0
+            for v in literals.values():
+                self.valid_mask |= v
 
 
 class EnumMeta(SerializerMeta):
     _hydras_metadata: EnumMetadata
 
-    def __new__(mcs, name, bases, classdict: collections.OrderedDict, underlying_type=i32):
+    def __new__(mcs, name, bases, classdict: collections.OrderedDict, underlying_type=None, flags=None):
         if not hasattr(mcs, SerializerMeta.METAATTR):
+            # Flags are inherited from the base enum.
+            if flags is None:
+                flags = any(b._hydras_metadata.flags for b in bases if isinstance(b, EnumMeta))
+            if underlying_type is None:
+                underlying_type = u32 if flags else i32
+
             literals = (
                 (k, v) for k, v in classdict.items()
                 if isinstance(v, (int, auto)) and not k.startswith('_')
             )
             literals_dict = collections.OrderedDict()
 
-            next_expected_value = 0
+            next_expected_value = 1 if flags else 0
             for lit_name, literal in literals:
                 # Replace `auto` instances with the correct values.
                 if isinstance(literal, auto):
@@ -90,24 +203,29 @@ class EnumMeta(SerializerMeta):
                     literal = next_expected_value
                     classdict[lit_name] = literal
 
-                next_expected_value = literal + 1
+                # Automatic flags take the next unused bit.
+                next_expected_value = (1 << literal.bit_length()) if flags else literal + 1
                 literals_dict[lit_name] = literal
 
             for lit_name in literals_dict:
                 del classdict[lit_name]
 
-            reverse_map = {
-                value: Literal(mcs, name, value)
-                for name, value in literals_dict.items()
-            }
-            metadata = EnumMetadata(literals=literals_dict, reverse_map=reverse_map, underlying=underlying_type)
+            metadata = EnumMetadata(literals=literals_dict, underlying=underlying_type, flags=flags)
 
             classdict.update({SerializerMeta.METAATTR: metadata})
 
-            # Patch the actual enum type once we get it from super.
+            # Create the literal objects once we get the actual enum type from super.
             gen_mcs = super(EnumMeta, mcs).__new__(mcs, name, bases, classdict)
-            for lit in reverse_map.values():
-                lit.enum = gen_mcs
+            for lit_name, value in literals_dict.items():
+                if flags:
+                    # Flags that share a value share their flag-set as well.
+                    lit = metadata.reverse_map.get(value)
+                    if lit is None:
+                        lit = FlagSet(gen_mcs, value)
+                else:
+                    lit = Literal(gen_mcs, lit_name, value)
+                metadata.literal_objects[lit_name] = lit
+                metadata.reverse_map[value] = lit
             return gen_mcs
 
         return super(EnumMeta, mcs).__new__(mcs, name, bases, classdict)
@@ -117,7 +235,11 @@ class EnumMeta(SerializerMeta):
 
     def __contains__(cls, item):
         if isinstance(item, Literal):
-            return item.enum == cls and cls.literals.get(item.literal_name) == item.value
+            return cls._hydras_metadata.literal_objects.get(item.literal_name) is item
+        elif isinstance(item, FlagSet):
+            return item.flags_type is cls
+        elif isinstance(item, int) and cls._hydras_metadata.flags:
+            return item & ~cls._hydras_metadata.valid_mask == 0
         elif isinstance(item, int):
             return item in cls.literals.values()
         return False
@@ -127,9 +249,9 @@ class EnumMeta(SerializerMeta):
         return cls._hydras_metadata.literals
 
     def __getattr__(cls, name):
-        # Wrap literals in a `Literal` object
-        if name in cls._hydras_metadata.literals:
-            return Literal(cls, name, cls._hydras_metadata.literals[name])
+        lit = cls._hydras_metadata.literal_objects.get(name)
+        if lit is not None:
+            return lit
         return super().__getattr__(name)
 
     def __repr__(cls):
@@ -173,12 +295,40 @@ class Enum(Serializer, metaclass=EnumMeta):
     def deserialize(self, raw_data, settings: HydraSettings = None):
         value = self._hydras_metadata.serializer.deserialize(raw_data, settings)
 
-        lit = self._hydras_metadata.reverse_map[value]
+        lit = self._hydras_metadata.reverse_map.get(value)
         if lit is None:
             raise ValueError('Parsed enum value is unknown: %d' % value)
 
         return lit
 
+    def deserialize_many(self, raw_data, settings: HydraSettings = None) -> List[Literal]:
+        values = self._hydras_metadata.serializer.deserialize_many(raw_data, settings)
+        try:
+            return list(map(self._hydras_metadata.reverse_map.__getitem__, values))
+        except KeyError as e:
+            raise ValueError('Parsed enum value is unknown: %d' % e.args[0])
+
+    def deserialize_codes(self, raw_data, settings: HydraSettings = None, as_numpy: bool = False):
+        """
+        Parse raw data made of consecutive enum values into their integral codes, without mapping them to literals.
+        The codes are not checked against the enum's literals.
+
+        :param raw_data:    The raw data to parse.
+        :param settings:    [Optional] Deserialization settings overrides.
+        :param as_numpy:    Return a NumPy array instead of a list. Requires NumPy to be installed.
+        """
+        serializer = self._hydras_metadata.serializer
+        if len(raw_data) % serializer.byte_size != 0:
+            raise ValueError('Raw data is not aligned to item size.')
+
+        if not as_numpy:
+            return serializer.deserialize_many(raw_data, settings)
+
+        import numpy
+        kind = 'i' if serializer._hydras_metadata.fmt.islower() else 'u'
+        dtype = numpy.dtype(f'{serializer.get_endianness(settings).value}{kind}{serializer.byte_size}')
+        return numpy.frombuffer(raw_data, dtype=dtype)
+
     def validate(self, value):
         """ Validate the given enum value. """
         if not self.is_constant_valid(int(value)):
@@ -200,17 +350,109 @@ class Enum(Serializer, metaclass=EnumMeta):
 
     @classmethod
     def get_literal_by_name(cls, name):
-        return Literal(cls, name, cls._hydras_metadata.literals[name])
+        return cls._hydras_metadata.literal_objects[name]
 
     @classmethod
     def get_literal_by_value(cls, value):
         return cls._hydras_metadata.reverse_map.get(value)
 
     def values_equal(self, a, b):
-        return int(a) == int(b)
+        return a is b or int(a) == int(b)
 
     def __repr__(self):
         value = self.get_initial_value()
         if value.literal_name == next(iter(self._hydras_metadata.literals.keys())):
             value = ''
         return f'{get_type_name(self)}({value})'
+
+
+class Flags(Enum, flags=True):
+    """
+    A bit-flags formatter. Literals are flags (or combinations of flags) that can be combined using bitwise operators.
+    Values are `FlagSet` objects, e.g. `MyFlags.a | MyFlags.b`.
+    """
+    __slots__ = ()
+
+    def __init__(self, default_value=None, *args, **kwargs):
+        if type(self) is Flags:
+            raise RuntimeError('Cannot instantiate `Flags` directly. Must subclass it.')
+
+        if default_value is None:
+            default_value = self.get_flag_set(0)
+        elif isinstance(default_value, FlagSet):
+            if default_value.flags_type is not type(self):
+                raise ValueError('Invalid or corrupted flag-set')
+        else:
+            default_value = self.get_flag_set(default_value)
+
+        Serializer.__init__(self, default_value, *args, **kwargs)
+
+    def serialize_into(self, storage: memoryview, offset: int, value: FlagSet, settings: HydraSettings = None) -> int:
+        return self._hydras_metadata.serializer.serialize_into(storage, offset, int(value), settings)
+
+    def deserialize(self, raw_data, settings: HydraSettings = None):
+        value = self._hydras_metadata.serializer.deserialize(raw_data, settings)
+        if not HydraSettings.resolve(settings).validate and not self.is_constant_valid(value):
+            # Unknown bits are kept as-is, and are not cached
+            return FlagSet(type(self), value)
+        return self.get_flag_set(value)
+
+    def deserialize_many(self, raw_data, settings: HydraSettings = None) -> List[FlagSet]:
+        values = self._hydras_metadata.serializer.deserialize_many(raw_data, settings)
+        if not HydraSettings.resolve(settings).validate:
+            return [self.get_flag_set(value) if self.is_constant_valid(value) else FlagSet(type(self), value)
+                    for value in values]
+        return list(map(self.get_flag_set, values))
+
+    def validate(self, value):
+        """ Validate the given flags value. """
+        if not self.is_constant_valid(int(value)):
+            raise ValueError('Flags value contains unknown bits')
+
+        Serializer.validate(self, int(value))
+
+    @classmethod
+    def is_constant_valid(cls, num):
+        """ Determine if the given number is made only of known flags. """
+        return num & ~cls._hydras_metadata.valid_mask == 0
+
+    @classmethod
+    def get_flag_set(cls, value: int) -> FlagSet:
+        """ Get the (cached) flag-set object of the given integral value. """
+        metadata = cls._hydras_metadata
+        flag_set = metadata.reverse_map.get(value)
+        if flag_set is not None:
+            return flag_set
+
+        flag_set = metadata.flag_sets.get(value)
+        if flag_set is not None:
+            metadata.flag_sets.move_to_end(value)
+            return flag_set
+
+        if not cls.is_constant_valid(value):
+            raise ValueError('Flags value contains unknown bits: 0x%X' % value)
+        flag_set = metadata.flag_sets[value] = FlagSet(cls, value)
+        if len(metadata.flag_sets) > FLAG_SETS_CACHE_SIZE:
+            metadata.flag_sets.popitem(last=False)
+        return flag_set
+
+    @classmethod
+    def get_literal_name(cls, num):
+        """ Get the names of the flags making up the given value, joined by `|`. """
+        num = int(num)
+        if num == 0:
+            return next((f'{get_type_name(cls)}.{name}' for name, value in cls.literals.items() if value == 0), None)
+
+        names = []
+        for name, flag in sorted(cls._hydras_metadata.literal_objects.items(), key=lambda item: -item[1].value):
+            if flag.value != 0 and num & flag.value == flag.value:
+                names.append(f'{get_type_name(cls)}.{name}')
+                num &= ~flag.value
+        if num:
+            # Unknown bits, of values deserialized without validation
+            names.insert(0, f'{get_type_name(cls)}({num:#x})')
+        return '|'.join(reversed(names)) or None
+
+    def __repr__(self):
+        value = self.get_initial_value()
+        return f'{get_type_name(self)}({value if value else ""})'
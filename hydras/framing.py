@@ -0,0 +1,121 @@
+"""
+Contains utilities for extracting messages out of byte streams.
+
+:file:  framing.py
+:date:  18/10/2026
+"""
+
+from .base import *
+from .struct import *
+
+__all__ = ('Framer', 'FramingError')
+
+
+class FramingError(ValueError):
+    """ Raised by `Framer.feed` when a buffered message cannot be framed or decoded. """
+
+    def __init__(self, reason: str, messages: List[Any]):
+        super(FramingError, self).__init__(reason)
+        # The messages that were framed by the same `feed` call before the error, which are otherwise lost.
+        self.messages = messages
+
+
+class Framer:
+    """
+    Extracts whole messages out of a byte stream (e.g. a TCP socket) that is received in arbitrary chunks.
+
+    The framed type can be a constant-size struct, a struct whose length is linked to its members (see `Ref`)
+    or a `Dispatcher` of such structs.
+
+    Partial messages are kept in a growable buffer, which is only compacted when it runs out of space,
+    so every received byte is copied a constant number of times regardless of the chunk sizes.
+
+    A message that fails to decode is dropped, and framing continues from the message that follows it.
+    A message whose length cannot be determined (e.g. a `Dispatcher` tag that isn't mapped) leaves no way to
+    find the next message, so all of the buffered data is dropped. Either way, `feed` raises a `FramingError`.
+
+    Example:
+        framer = Framer(DataPacket)
+        while True:
+            for packet in framer.feed(sock.recv(4096)):
+                handle(packet)
+    """
+
+    def __init__(self, message_type, settings: HydraSettings = None, initial_capacity: int = 4096):
+        """
+        Create a new framer.
+
+        :param message_type:        A struct type or a `Dispatcher`, with `peek_length` and `deserialize` methods.
+        :param settings:            [Optional] Deserialization settings overrides.
+        :param initial_capacity:    The initial size of the buffer, in bytes.
+        """
+        if isinstance(message_type, type) and issubclass(message_type, Struct) and \
+                not message_type.is_constant_size() and not message_type.is_self_delimiting():
+            raise TypeError(f'The length of {get_type_name(message_type)} cannot be determined from a stream')
+
+        self.message_type = message_type
+        self.settings = settings
+        self._buffer = bytearray(max(initial_capacity, 1))
+        # Unread data is stored in `_buffer[_start:_end]`
+        self._start = 0
+        self._end = 0
+
+    def __len__(self):
+        """ Get the number of buffered bytes that were not yet framed. """
+        return self._end - self._start
+
+    def _reserve(self, size: int):
+        """ Make sure there is room for `size` more bytes at the end of the buffer. """
+        if self._end + size <= len(self._buffer):
+            return
+
+        pending = self._end - self._start
+        if pending + size > len(self._buffer):
+            # Grow geometrically, so that growing is amortized as well
+            new_buffer = bytearray(max(len(self._buffer) * 2, pending + size))
+            new_buffer[:pending] = self._buffer[self._start:self._end]
+            self._buffer = new_buffer
+        else:
+            self._buffer[:pending] = self._buffer[self._start:self._end]
+        self._start, self._end = 0, pending
+
+    def feed(self, data) -> List[Any]:
+        """
+        Append received data to the buffer and frame the messages that are now complete.
+
+        :param data:    A bytes-like object.
+        :return:        A list of deserialized messages.
+        :raise FramingError:    If a buffered message cannot be framed or decoded, after dropping it.
+        """
+        self._reserve(len(data))
+        self._buffer[self._end:self._end + len(data)] = data
+        self._end += len(data)
+
+        messages = []
+        while self._start < self._end:
+            view = memoryview(self._buffer)[self._start:self._end]
+            try:
+                try:
+                    length = self.message_type.peek_length(view, self.settings)
+                except ValueError as e:
+                    self._start = self._end = 0
+                    raise FramingError(f'Cannot determine the length of a message, dropped {len(view)} bytes: {e}',
+                                       messages) from e
+                if length is None or length > len(view):
+                    break
+                elif length <= 0:
+                    # Would never advance through the stream
+                    self._start = self._end = 0
+                    raise FramingError(f'Invalid message length {length}, dropped {len(view)} bytes', messages)
+
+                self._start += length
+                try:
+                    message = self.message_type.deserialize(view[:length], self.settings)
+                except ValueError as e:
+                    raise FramingError(f'Cannot decode a message, dropped {length} bytes: {e}', messages) from e
+            finally:
+                view.release()
+                if self._start == self._end:
+                    self._start = self._end = 0
+            messages.append(message)
+        return messages
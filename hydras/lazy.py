@@ -0,0 +1,119 @@
+"""
+Contains a namespace of types that are only built when first accessed, out of compact type descriptions.
+
+:file:  lazy.py
+:date:  18/10/2026
+"""
+
+import collections
+from . import scalars
+from .base import *
+from .struct import *
+from .struct import StructMeta
+from .padding import *
+from .enum import *
+from .enum import EnumMeta
+from .union import *
+from .union import UnionMeta
+
+__all__ = ('LazyTypes', )
+
+
+class LazyTypes:
+    """
+    A namespace of structs, unions, enums and aliases, built from a table of type descriptions on first access.
+
+    Accessing a type builds it along with its dependencies, so a schema of thousands of types costs
+    only as much as the types that are actually used.
+
+    Every description is a tuple, keyed by the name of the type:
+        ('struct', ((member_name, ref), ...))
+        ('union', ((member_name, ref), ...))
+        ('enum', underlying_ref, ((literal_name, value), ...))
+        ('alias', ref)
+
+    A `ref` is either the name of a described type, the name of a scalar (e.g. `'u32'`),
+    a tuple `(ref, size, ...)` of an array, whose sizes are applied in order (`None` for a VLA):
+    `('f64', 3, 2)` is `f64[3][2]`, a dict of a bitfield: `{'bits': 'u16', 'fields': (('mode', 3), ...)}`
+    is `u16.bits(mode=3, ...)`, or the number of bytes of padding: `3` is `Padding(3)`.
+
+    Example:
+        types = LazyTypes({'header_t': ('struct', (('opcode', 'u8'), ('length', 'u32')))})
+        header = types.header_t()
+    """
+
+    def __init__(self, descriptions: dict, module: str = None):
+        """
+        :param descriptions:    The descriptions of the types, by name.
+        :param module:          [Optional] The `__module__` of the built types, so they can be pickled.
+        """
+        self._descriptions = descriptions
+        self._module = module
+        self._types = {}
+
+    def _resolve(self, ref):
+        if isinstance(ref, tuple):
+            typ = self._resolve(ref[0])
+            for size in ref[1:]:
+                typ = typ[slice(None) if size is None else size]
+            return typ
+        elif isinstance(ref, dict):
+            return self._resolve(ref['bits']).bits(**dict(ref['fields']))
+        elif isinstance(ref, int):
+            return Padding(ref)
+        elif ref in self._descriptions:
+            return self[ref]
+        return getattr(scalars, ref)
+
+    def _build(self, name: str):
+        kind, *description = self._descriptions[name]
+        if kind == 'alias':
+            return self._resolve(description[0])
+
+        attributes = collections.OrderedDict()
+        if self._module is not None:
+            attributes['__module__'] = self._module
+        attributes['__qualname__'] = name
+
+        if kind == 'struct':
+            attributes.update((member_name, self._resolve(ref)) for member_name, ref in description[0])
+            return StructMeta(name, (Struct, ), attributes)
+        elif kind == 'union':
+            attributes.update((member_name, self._resolve(ref)) for member_name, ref in description[0])
+            return UnionMeta(name, (Union, ), attributes)
+        elif kind == 'enum':
+            underlying_ref, literals = description
+            attributes.update(literals)
+            return EnumMeta(name, (Enum, ), attributes, underlying_type=self._resolve(underlying_ref))
+        raise ValueError(f'Unknown kind of type description "{kind}"', name)
+
+    def __getitem__(self, name: str):
+        typ = self._types.get(name)
+        if typ is None:
+            typ = self._types[name] = self._build(name)
+        return typ
+
+    def __getattr__(self, name: str):
+        # Looked up through `__dict__`, since `__getattr__` may be called before `__init__` (e.g. by `copy`).
+        if name not in self.__dict__.get('_descriptions', ()):
+            raise AttributeError(f'No type named "{name}"')
+        return self[name]
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._descriptions
+
+    def __iter__(self):
+        return iter(self._descriptions)
+
+    def __len__(self):
+        return len(self._descriptions)
+
+    def __dir__(self):
+        return list(self._descriptions)
+
+    def built_types(self) -> List[str]:
+        """ The names of the types that have been built so far. """
+        return list(self._types)
+
+    def __repr__(self):
+        return f'<LazyTypes: {len(self._types)} of {len(self._descriptions)} built>'
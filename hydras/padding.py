@@ -0,0 +1,58 @@
+"""
+Contains the padding formatter.
+
+:file:  padding.py
+:date:  18/10/2026
+"""
+
+from .base import *
+
+__all__ = ('Padding', )
+
+
+class Padding(Serializer):
+    """
+    A formatter of unused bytes, e.g. compiler introduced padding: `_padding_0 = Padding(3)`.
+
+    Padding holds no value, so structs neither store, compare, validate nor render it.
+    It is skipped when deserializing, and filled with a constant byte when serializing.
+    """
+
+    __slots__ = ('fill', )
+    _hydras_metadata = SerializerMetadata(0)
+
+    def __init__(self, size: int, fill: int = 0):
+        """
+        :param size:    The number of padding bytes.
+        :param fill:    The value of the padding bytes when serializing.
+        """
+        if not isinstance(size, int) or size < 0:
+            raise ValueError(f'Padding size must be a non-negative integer, got {size}')
+        elif not isinstance(fill, int) or not 0 <= fill <= 0xff:
+            raise ValueError(f'Padding fill must be a byte, got {fill}')
+
+        super(Padding, self).__init__(None)
+        self.byte_size = size
+        self.fill = fill
+
+    def serialize_into(self, storage: memoryview, offset: int, value, settings: HydraSettings = None) -> int:
+        end = offset + self.byte_size
+        storage[offset:end] = bytes((self.fill, )) * self.byte_size
+        return end
+
+    def deserialize(self, raw_data, settings: HydraSettings = None):
+        return None
+
+    def holds_value(self) -> bool:
+        return False
+
+    def values_equal(self, a, b):
+        return True
+
+    def get_interning_key(self):
+        return type(self), self.byte_size, self.fill
+
+    def __repr__(self):
+        if self.fill:
+            return f'Padding({self.byte_size}, fill={self.fill:#x})'
+        return f'Padding({self.byte_size})'
@@ -0,0 +1,75 @@
+"""
+Contains a pool of reusable serialization buffers.
+
+:file:  pool.py
+:date:  18/10/2026
+"""
+
+import contextlib
+from .base import *
+
+__all__ = ('BufferPool', )
+
+
+class BufferPool:
+    """
+    A pool of `bytearray`s in power-of-two size classes, letting high-rate senders reuse buffers
+    instead of allocating one for every serialized message.
+
+    Buffers larger than `max_size` are allocated on demand and never kept.
+    """
+
+    def __init__(self, min_size: int = 256, max_size: int = 1 << 20, max_free: int = 64):
+        """
+        :param min_size:    The size of the smallest size class.
+        :param max_size:    The size of the largest size class.
+        :param max_free:    The number of released buffers kept by each size class.
+        """
+        if min_size <= 0 or max_size < min_size:
+            raise ValueError('Invalid size class bounds.', min_size, max_size)
+
+        self._min_class = (min_size - 1).bit_length()
+        self._max_class = (max_size - 1).bit_length()
+        self._max_free = max_free
+        self._free: List[List[bytearray]] = [[] for _ in range(self._max_class + 1)]
+
+    def _size_class(self, size: int) -> int:
+        return max((size - 1).bit_length(), self._min_class)
+
+    def acquire(self, size: int) -> bytearray:
+        """ Get a buffer of at least `size` bytes. Its contents are undefined. """
+        size_class = self._size_class(size)
+        if size_class > self._max_class:
+            return bytearray(size)
+
+        free = self._free[size_class]
+        return free.pop() if free else bytearray(1 << size_class)
+
+    def release(self, buffer: bytearray):
+        """ Return a buffer obtained from `acquire` to the pool. """
+        size = len(buffer)
+        size_class = self._size_class(size)
+        if size_class > self._max_class or size != 1 << size_class:
+            return
+
+        free = self._free[size_class]
+        if len(free) < self._max_free:
+            free.append(buffer)
+
+    @contextlib.contextmanager
+    def serialize(self, obj, settings: HydraSettings = None) -> Iterator[memoryview]:
+        """
+        Serialize a struct into a pooled buffer.
+        The yielded view is valid only inside the `with` block, after which the buffer is returned to the pool.
+
+            with pool.serialize(packet) as data:
+                sock.sendall(data)
+        """
+        buffer = self.acquire(len(obj))
+        try:
+            with memoryview(buffer) as view:
+                length = obj.serialize_into(view, 0, settings)
+                with view[:length] as data:
+                    yield data
+        finally:
+            self.release(buffer)
@@ -0,0 +1,169 @@
+"""
+Contains a queue of constant-size structs in shared memory, for passing messages between processes.
+
+:file:  ring.py
+:date:  18/10/2026
+"""
+
+import contextlib
+from multiprocessing import shared_memory
+from .base import *
+from .struct import *
+from .utils import *
+
+__all__ = ('RingQueue', )
+
+# The consumer's and producers' u64 indices are kept on separate cache lines, followed by the slots.
+_HEAD_INDEX = 0
+_TAIL_INDEX = 8
+_SLOTS_OFFSET = 128
+
+
+class RingQueue:
+    """
+    A bounded queue of constant-size structs, stored as a ring of slots in a `multiprocessing.shared_memory` block.
+
+    With a single producer and a single consumer the queue is lock-free: the producer only advances the tail index
+    after writing its slots, and the consumer only advances the head index after reading them.
+    Multiple producers must share a `producer_lock` (e.g. a `multiprocessing.Lock`).
+    """
+
+    __slots__ = ('struct_type', 'capacity', 'settings', '_shm', '_buf', '_indices', '_slot_size', '_producer_lock')
+
+    def __init__(self,
+                 struct_type,
+                 capacity: int,
+                 name: str = None,
+                 create: bool = False,
+                 producer_lock=None,
+                 settings: HydraSettings = None):
+        """
+        :param struct_type:     The type of the queued structs. Must be constant-size.
+        :param capacity:        The number of slots in the ring.
+        :param name:            The name of the shared memory block. Random when creating a block without a name.
+        :param create:          Whether to create a new, empty queue or attach to an existing one.
+        :param producer_lock:   [Optional] A lock shared by all producers, required when there are several of them.
+        :param settings:        [Optional] Serialization settings overrides.
+        """
+        if not struct_type.is_constant_size():
+            raise TypeError(f'Queued structs must be constant-size, unlike {get_type_name(struct_type)}')
+        elif capacity <= 0:
+            raise ValueError('The capacity of a queue must be positive.', capacity)
+
+        self.struct_type = struct_type
+        self.capacity = capacity
+        self.settings = HydraSettings.resolve(settings)
+        self._slot_size = len(struct_type)
+        self._producer_lock = producer_lock
+
+        size = _SLOTS_OFFSET + capacity * self._slot_size
+        self._shm = shared_memory.SharedMemory(name, create, size)
+        if self._shm.size < size:
+            self._shm.close()
+            raise ValueError(f'Shared memory "{name}" is too small for the queue')
+        self._buf = self._shm.buf
+        # Indices are accessed through a typed view, since `struct.pack_into` zero-fills before writing
+        # and other processes could observe the intermediate value.
+        self._indices = self._buf[:_SLOTS_OFFSET].cast('Q')
+
+        if create:
+            self._indices[_HEAD_INDEX] = 0
+            self._indices[_TAIL_INDEX] = 0
+
+    @property
+    def name(self) -> str:
+        return self._shm.name
+
+    def _head(self) -> int:
+        return self._indices[_HEAD_INDEX]
+
+    def _tail(self) -> int:
+        return self._indices[_TAIL_INDEX]
+
+    def _slot_offset(self, index: int) -> int:
+        return _SLOTS_OFFSET + (index % self.capacity) * self._slot_size
+
+    def push(self, value) -> bool:
+        """
+        Add a struct to the queue.
+
+        :return: Whether the struct was added, or the queue was full.
+        """
+        return self.push_many((value, )) == 1
+
+    def push_many(self, values: List) -> int:
+        """
+        Add as many of the given structs to the queue as there is room for, making them visible at once.
+
+        :return: The number of structs that were added.
+        """
+        lock = self._producer_lock
+        if lock is not None:
+            lock.acquire()
+        try:
+            tail = self._tail()
+            count = min(len(values), self.capacity - (tail - self._head()))
+            for i in range(count):
+                values[i].serialize_into(self._buf, self._slot_offset(tail + i), self.settings)
+            if count > 0:
+                self._indices[_TAIL_INDEX] = tail + count
+            return count
+        finally:
+            if lock is not None:
+                lock.release()
+
+    @contextlib.contextmanager
+    def consume(self, max_count: int = None) -> Iterator[List[memoryview]]:
+        """
+        Get views of the oldest queued structs without copying them.
+        The structs are removed from the queue when the `with` block exits, after which the views are released.
+
+            with queue.consume() as views:
+                for view in views:
+                    handle(view)
+        """
+        head = self._head()
+        count = self._tail() - head
+        if max_count is not None:
+            count = min(count, max_count)
+
+        views = [self._buf[offset:offset + self._slot_size]
+                 for offset in map(self._slot_offset, range(head, head + count))]
+        try:
+            yield views
+        finally:
+            for view in views:
+                view.release()
+        self._indices[_HEAD_INDEX] = head + count
+
+    def pop(self):
+        """ Remove the oldest struct from the queue, or return `None` if the queue is empty. """
+        values = self.pop_many(1)
+        return values[0] if values else None
+
+    def pop_many(self, max_count: int = None) -> List:
+        """ Remove up to `max_count` of the oldest structs from the queue (all of them by default). """
+        with self.consume(max_count) as views:
+            return [self.struct_type.deserialize(view, self.settings) for view in views]
+
+    def close(self):
+        """ Detach from the shared memory. """
+        self._indices.release()
+        self._buf.release()
+        self._shm.close()
+
+    def unlink(self):
+        """ Destroy the shared memory block, once all the processes have closed it. """
+        self._shm.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def __len__(self):
+        return self._tail() - self._head()
+
+    def __repr__(self):
+        return f'<RingQueue of {self.capacity} {get_type_name(self.struct_type)} at "{self.name}">'
@@ -9,11 +9,31 @@ Contains various primitive type formatters.
 """
 
 from .base import *
+import array as _pyarray
 import struct
 
 
+def _find_array_typecode(fmt: str):
+    """ Find an `array.array` typecode whose item size matches the standard size of the given `struct` format. """
+    candidates = {'i': 'il', 'I': 'IL'}.get(fmt, fmt)
+    for typecode in candidates:
+        if _pyarray.array(typecode).itemsize == struct.calcsize('=' + fmt):
+            return typecode
+    return None
+
+
+def _zero_fill(storage: memoryview, begin: int, end: int) -> int:
+    """
+    Zero the missing items of a short array, as storage may be reused (e.g. pooled buffers or shared memory)
+    rather than freshly allocated. Returns the end of the array.
+    """
+    if end > begin:
+        storage[begin:end] = bytes(end - begin)
+    return end
+
+
 class ScalarMetadata(SerializerMetadata):
-    __slots__ = ('endianness', 'fmt', 'validator', 'py_types')
+    __slots__ = ('endianness', 'fmt', 'validator', 'py_types', 'typecode')
     _FORMATTERS_INFO = {
         'B': (1, (int, ), RangeValidator(0, 255)),
         'b': (1, (int, ), RangeValidator(-128, 127)),
@@ -31,6 +51,7 @@ class ScalarMetadata(SerializerMetadata):
         size, self.py_types, self.validator = ScalarMetadata._FORMATTERS_INFO[fmt]
         self.endianness = endianness
         self.fmt = fmt
+        self.typecode = _find_array_typecode(fmt)
         super(ScalarMetadata, self).__init__(size)
 
 
@@ -50,6 +71,10 @@ class Scalar(Serializer, metaclass=ScalarMeta):
     __slots__ = ()
     _hydras_metadata: ScalarMetadata
 
+    # Sequences of at least this many items are converted in bulk using `array.array` (and byte-swapped if needed)
+    # rather than through an N-item `struct` format string.
+    BULK_THRESHOLD = 64
+
     def __init__(self, default_value=0, *args, **kwargs):
         """
         Initialize the scalar object.
@@ -78,28 +103,50 @@ class Scalar(Serializer, metaclass=ScalarMeta):
                             value: List[Any],
                             min_values_count: int,
                             settings: HydraSettings) -> int:
-        fmt = self.get_format_string(settings, len(value))
-        struct.pack_into(fmt, storage, offset, *value)
-        return offset + self.byte_size * max(len(value), min_values_count)
+        count = len(value)
+        typecode = self._hydras_metadata.typecode
+        if count >= self.BULK_THRESHOLD and typecode is not None:
+            items = _pyarray.array(typecode, value)
+            if self.get_endianness(settings).is_byteswapped():
+                items.byteswap()
+            storage[offset:offset + count * self.byte_size] = memoryview(items).cast('B')
+        elif count > 0:
+            struct.pack_into(self.get_format_string(settings, count), storage, offset, *value)
+        return _zero_fill(storage, offset + count * self.byte_size, offset + max(count, min_values_count) * self.byte_size)
 
     def deserialize(self, raw_data, settings: HydraSettings = None):
-        settings = HydraSettings.resolve(settings)
-
-        if self._hydras_metadata.endianness == Endianness.TARGET:
-            endian = settings.target_endian
-        else:
-            endian = self._hydras_metadata.endianness
+        return struct.unpack(self.get_format_string(settings), raw_data)[0]
+
+    def deserialize_many(self, raw_data, settings: HydraSettings = None) -> List[Any]:
+        count = len(raw_data) // self.byte_size
+        typecode = self._hydras_metadata.typecode
+        if count >= self.BULK_THRESHOLD and typecode is not None:
+            items = _pyarray.array(typecode)
+            items.frombytes(raw_data)
+            if self.get_endianness(settings).is_byteswapped():
+                items.byteswap()
+            return items.tolist()
+        return list(struct.unpack(self.get_format_string(settings, count), raw_data))
+
+    @classmethod
+    def bits(cls, **fields):
+        """
+        Create a bitfield type whose storage unit is of this type.
+        For example, `u32.bits(version=3, kind=5, length=24)`.
 
-        return struct.unpack(endian.value + self._hydras_metadata.fmt, raw_data)[0]
+        :param fields:  The bit width of every field, in allocation order (starting from the LSB).
+        """
+        return create_bitfield(cls, fields)
 
-    def get_format_string(self, settings: HydraSettings = None, count: int = 1):
+    def get_endianness(self, settings: HydraSettings = None) -> Endianness:
+        """ Resolve the concrete endianness of this scalar, taking the "target" endianness from the settings. """
         if self._hydras_metadata.endianness == Endianness.TARGET:
-            settings = HydraSettings.resolve(settings)
-            endian = settings.target_endian
-        else:
-            endian = self._hydras_metadata.endianness
+            return HydraSettings.resolve(settings).target_endian
+        return self._hydras_metadata.endianness
 
-        if count > 1:
+    def get_format_string(self, settings: HydraSettings = None, count: int = 1):
+        endian = self.get_endianness(settings)
+        if count != 1:
             return endian.value + str(count) + self._hydras_metadata.fmt
         return endian.value + self._hydras_metadata.fmt
 
@@ -135,7 +182,7 @@ class ByteType(Scalar, fmt='B'):
         if not isinstance(value, (bytes, bytearray)):
             return super().serialize_many_into(storage, offset, value, min_values_count, settings)
         storage[offset:offset + len(value)] = value
-        return offset + max(len(value), min_values_count)
+        return _zero_fill(storage, offset + len(value), offset + max(len(value), min_values_count))
 
 # Target endian scalars
 class u8(ByteType, fmt='B', endianness=Endianness.TARGET): pass
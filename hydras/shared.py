@@ -0,0 +1,199 @@
+"""
+Contains structs that live in shared memory, for zero-copy communication between processes.
+
+:file:  shared.py
+:date:  18/10/2026
+"""
+
+import contextlib
+import time
+from multiprocessing import shared_memory
+from .base import *
+from .struct import *
+from .utils import *
+
+__all__ = ('SharedStruct', )
+
+# The size of the seqlock's u64 version counter, which precedes the struct.
+_VERSION_SIZE = 8
+
+
+class SharedStruct:
+    """
+    A constant-size struct stored in a `multiprocessing.shared_memory.SharedMemory` block.
+
+    Members are read and written in place at their static offsets, so processes attached to the same block
+    share a single copy of the struct without pickling it.
+    Members of nested structs are addressed by dotted paths (e.g. `header.opcode`), and top-level members
+    can also be accessed as attributes.
+
+    With `seqlock=True`, a version counter guards the struct: the (single) writer makes it odd while writing,
+    and readers retry until they copy the data with an even, unchanged version, getting consistent snapshots.
+    Readers give up after `read_timeout` seconds, in case the writer died in the middle of a write.
+    """
+
+    __slots__ = ('struct_type', 'settings', '_shm', '_data', '_version', '_write_depth', '_fields', 'read_timeout')
+
+    def __init__(self,
+                 struct_type,
+                 name: str = None,
+                 create: bool = False,
+                 seqlock: bool = False,
+                 read_timeout: float = 1.0,
+                 settings: HydraSettings = None):
+        """
+        :param struct_type: The type of the shared struct. Must be constant-size.
+        :param name:        The name of the shared memory block. Random when creating a block without a name.
+        :param create:      Whether to create a new block, initialized with the struct's default value,
+                            or attach to an existing one.
+        :param seqlock:     Whether the block is guarded by a seqlock. Must match between all the attached processes.
+        :param read_timeout: How long seqlock readers retry before raising `TimeoutError`, in seconds.
+        :param settings:    [Optional] Serialization settings overrides.
+        """
+        if not struct_type.is_constant_size():
+            raise TypeError(f'Shared structs must be constant-size, unlike {get_type_name(struct_type)}')
+
+        header_size = _VERSION_SIZE if seqlock else 0
+        size = header_size + len(struct_type)
+        shm = shared_memory.SharedMemory(name, create, size)
+        if shm.size < size:
+            shm.close()
+            raise ValueError(f'Shared memory "{name}" is too small for {get_type_name(struct_type)}')
+
+        object.__setattr__(self, 'struct_type', struct_type)
+        object.__setattr__(self, 'settings', HydraSettings.resolve(settings))
+        object.__setattr__(self, '_shm', shm)
+        object.__setattr__(self, '_data', shm.buf[header_size:size])
+        # The version is accessed through a typed view, since `struct.pack_into` zero-fills before writing
+        # and readers could observe the intermediate value.
+        object.__setattr__(self, '_version', shm.buf[:_VERSION_SIZE].cast('Q') if seqlock else None)
+        object.__setattr__(self, '_write_depth', 0)
+        object.__setattr__(self, '_fields', {})
+        object.__setattr__(self, 'read_timeout', read_timeout)
+
+        if create:
+            if seqlock:
+                self._version[0] = 0
+            struct_type().serialize_into(self._data, 0, self.settings)
+
+    @property
+    def name(self) -> str:
+        return self._shm.name
+
+    @property
+    def buf(self) -> memoryview:
+        """ The raw bytes of the shared struct. """
+        return self._data
+
+    def _field(self, path: str) -> Tuple[int, int, Serializer]:
+        field = self._fields.get(path)
+        if field is None:
+            offset, serializer = self.struct_type.offset_of(path)
+            field = self._fields[path] = (offset, offset + serializer.byte_size, serializer)
+        return field
+
+    def _copy(self, ranges):
+        """ Copy the given byte ranges of the struct, retrying until the copies are consistent. """
+        data = self._data
+        version = self._version
+        if version is None:
+            return [bytes(data[begin:end]) for begin, end in ranges]
+
+        deadline = None
+        while True:
+            before = version[0]
+            if not before & 1:
+                copies = [bytes(data[begin:end]) for begin, end in ranges]
+                if version[0] == before:
+                    return copies
+
+            # Only check the clock once contended, keeping uncontended reads cheap
+            now = time.monotonic()
+            if deadline is None:
+                deadline = now + self.read_timeout
+            elif now > deadline:
+                raise TimeoutError(f'No consistent copy of "{self.name}" within {self.read_timeout} seconds, '
+                                   f'the writer may have died mid-write')
+
+    @contextlib.contextmanager
+    def writing(self):
+        """ Group several writes, so that seqlock readers observe all of them or none. """
+        if self._version is not None and self._write_depth == 0:
+            self._version[0] += 1
+        object.__setattr__(self, '_write_depth', self._write_depth + 1)
+        try:
+            yield self
+        finally:
+            object.__setattr__(self, '_write_depth', self._write_depth - 1)
+            if self._version is not None and self._write_depth == 0:
+                self._version[0] += 1
+
+    def get(self, path: str):
+        """ Read a single member. """
+        begin, end, serializer = self._field(path)
+        raw, = self._copy(((begin, end), ))
+        return serializer.deserialize(raw, self.settings)
+
+    def set(self, path: str, value):
+        """ Write a single member. """
+        begin, _, serializer = self._field(path)
+        serializer.validate(value)
+        with self.writing():
+            serializer.serialize_into(self._data, begin, value, self.settings)
+
+    def snapshot(self, *paths: str) -> tuple:
+        """ Read several members consistently. """
+        fields = [self._field(path) for path in paths]
+        raws = self._copy([(begin, end) for begin, end, _ in fields])
+        return tuple(serializer.deserialize(raw, self.settings) for (_, _, serializer), raw in zip(fields, raws))
+
+    def view(self, path: str) -> memoryview:
+        """
+        Get a writable view of a member's bytes, bypassing the seqlock.
+        The view must be released before closing the shared struct.
+        """
+        begin, end, _ = self._field(path)
+        return self._data[begin:end]
+
+    def read(self):
+        """ Read the whole struct. """
+        raw, = self._copy(((0, len(self._data)), ))
+        return self.struct_type.deserialize(raw, self.settings)
+
+    def write(self, value):
+        """ Write the whole struct. """
+        with self.writing():
+            value.serialize_into(self._data, 0, self.settings)
+
+    def close(self):
+        """ Detach from the shared memory. """
+        if self._version is not None:
+            self._version.release()
+        self._data.release()
+        self._shm.close()
+
+    def unlink(self):
+        """ Destroy the shared memory block, once all the processes have closed it. """
+        self._shm.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def __getattr__(self, name):
+        if name in self.struct_type._hydras_metadata.members:
+            return self.get(name)
+        raise AttributeError(f'{get_type_name(self.struct_type)} has no member "{name}"')
+
+    def __setattr__(self, name, value):
+        if name not in self.struct_type._hydras_metadata.members:
+            raise AttributeError(f'{get_type_name(self.struct_type)} has no member "{name}"')
+        self.set(name, value)
+
+    def __len__(self):
+        return len(self._data)
+
+    def __repr__(self):
+        return f'<SharedStruct of {get_type_name(self.struct_type)} at "{self.name}">'
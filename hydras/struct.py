@@ -1,7 +1,8 @@
 from .base import *
+from .scalars import Scalar
 from .utils import *
 
-__all__ = ('Struct', 'NestedStruct', 'Mixin')
+__all__ = ('Struct', 'NestedStruct', 'Mixin', 'Ref')
 
 
 class EmptyFieldValueType:
@@ -15,7 +16,13 @@ class StructMetadata(object):
     name = None
     size = 0
     members: collections.OrderedDict = None
+    # The members that hold values, i.e. all but padding.
+    valued_members: collections.OrderedDict = None
+    offsets: Dict[str, int] = None
+    # (array name, path of the member holding its item count) of every length-linked array.
+    length_refs: List[Tuple[str, str]] = ()
     is_constant_size = True
+    is_self_delimiting = False
 
 
 class Mixin:
@@ -24,6 +31,29 @@ class Mixin:
         self.prefix = prefix
 
 
+class Ref:
+    """
+    A reference to a preceding integral member, used as the size of a length-linked array.
+    For example, `payload = u8[Ref('header.data_length')]`.
+
+    When deserializing, the array's item count is taken from the referenced member;
+    when serializing, the referenced member is set to the array's item count.
+    """
+    __slots__ = ('path', )
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def __eq__(self, other):
+        return isinstance(other, Ref) and other.path == self.path
+
+    def __hash__(self):
+        return hash(self.path)
+
+    def __repr__(self):
+        return f'Ref({self.path!r})'
+
+
 class StructMeta(type):
     HYDRAS_METAATTR = '_hydras_metadata'
     _hydras_metadata: StructMetadata
@@ -46,7 +76,7 @@ class StructMeta(type):
                 if last_base is not None and len(base._hydras_metadata.members) > 0:
                     raise TypeError('When deriving a variable-length struct, it must be last in the inheritance list')
 
-                if not base.is_constant_size():
+                if not base.is_constant_size() and not base.is_self_delimiting():
                     last_base = base
 
                 for member_name, formatter in base._hydras_metadata.members.items():
@@ -55,26 +85,15 @@ class StructMeta(type):
                     members[member_name] = formatter
 
             for member_name, value in attributes.items():
-                fmt = ()
-                if issubclass(type(value), Serializer):
-                    fmt = [(member_name, value)]
-                elif inspect.isclass(value) and issubclass(value, Serializer):
-                    fmt = [(member_name, value())]
-                # We want to check if `value` is either a subclass of `Struct` or an instance of such type
-                # but `Struct` is not a valid identifier at this point.
-                elif issubclass(type(value), StructMeta) or issubclass(type(type(value)), StructMeta):
-                    fmt = [(member_name, NestedStruct[value]())]
-                elif isinstance(value, Mixin):
-                    typ = value.typ
-                    fmt = [(value.prefix + _name, _fmt) for _name, _fmt in typ._hydras_metadata.members.items()]
-
-                for _name, _fmt in fmt:
+                for _name, _fmt in mcs._hydras_member_serializers(member_name, value):
                     if last_base is not None or last_member is not None:
                         raise TypeError('...')
                     elif _name in members:
                         raise TypeError('Name-clash detected')
 
-                    if not _fmt.is_constant_size:
+                    if _fmt.get_length_ref() is not None:
+                        mcs._hydras_check_length_ref(members, _fmt.get_length_ref())
+                    if not _fmt.is_constant_size and not _fmt.is_self_delimiting():
                         last_member = _fmt
                     members[_name] = _fmt
 
@@ -83,7 +102,21 @@ class StructMeta(type):
             metadata.name = name
             metadata.size = sum(m.byte_size for m in members.values())
             metadata.members = members
-            metadata.is_constant_size = last_base is None and last_member is None
+            metadata.valued_members = collections.OrderedDict(
+                (member_name, member) for member_name, member in members.items() if member.holds_value())
+            metadata.offsets = {}
+            offset = 0
+            for member_name, member in members.items():
+                metadata.offsets[member_name] = offset
+                # Members following a variable-size member have no static offset
+                if offset is not None and not member.is_constant_size:
+                    offset = None
+                elif offset is not None:
+                    offset += member.byte_size
+            metadata.length_refs = [(member_name, member.get_length_ref()) for member_name, member in members.items()
+                                    if member.get_length_ref() is not None]
+            metadata.is_constant_size = all(m.is_constant_size for m in members.values())
+            metadata.is_self_delimiting = last_base is None and last_member is None and not metadata.is_constant_size
 
             attributes.update({
                 mcs.HYDRAS_METAATTR: metadata,
@@ -91,6 +124,37 @@ class StructMeta(type):
 
         return super(StructMeta, mcs).__new__(mcs, name, bases, attributes)
 
+    @staticmethod
+    def _hydras_check_length_ref(members: collections.OrderedDict, path: str):
+        """ Make sure that a length reference points to a preceding integral member. """
+        serializer = None
+        for name in path.split('.'):
+            if members is None or name not in members:
+                raise TypeError(f'Length reference "{path}" must refer to a preceding member')
+            serializer = members[name]
+            members = serializer.struct._hydras_metadata.members if isinstance(serializer, NestedStruct) else None
+
+        if not isinstance(serializer, Scalar) or float in serializer._hydras_metadata.py_types:
+            raise TypeError(f'Length reference "{path}" must refer to an integer member')
+
+    @staticmethod
+    def _hydras_member_serializers(member_name, value) -> List[Tuple[str, Serializer]]:
+        """ Get the (name, serializer) pairs of the members declared by a class attribute; empty for non-members. """
+        if issubclass(type(value), Serializer):
+            return [(member_name, value)]
+        # Serializer types are recognized by their metaclass, since `issubclass` of a non-serializer type
+        # walks (and caches into) every subclass of the `Serializer` ABC, making the creation of each struct O(n).
+        elif isinstance(value, SerializerMeta):
+            return [(member_name, value())]
+        # We want to check if `value` is either a subclass of `Struct` or an instance of such type
+        # but `Struct` is not a valid identifier at this point.
+        elif issubclass(type(value), StructMeta) or issubclass(type(type(value)), StructMeta):
+            return [(member_name, NestedStruct[value]())]
+        elif isinstance(value, Mixin):
+            typ = value.typ
+            return [(value.prefix + _name, _fmt) for _name, _fmt in typ._hydras_metadata.members.items()]
+        return []
+
     def __len__(cls):
         return cls._hydras_metadata.size
 
@@ -119,7 +183,7 @@ class Struct(metaclass=StructMeta):
         initial_values = initial_values or {}
 
         # Initialize a copy of the data properties.
-        for var_name, var_formatter in self._hydras_metadata.members.items():
+        for var_name, var_formatter in self._hydras_metadata.valued_members.items():
             # Accept a non-default value through the keyword arguments.
             if var_name in initial_values:
                 setattr(self, var_name, initial_values[var_name])
@@ -139,25 +203,111 @@ class Struct(metaclass=StructMeta):
     def is_constant_size(cls):
         return cls._hydras_metadata.is_constant_size
 
-    def serialize(self, settings: HydraSettings = None):
+    @classmethod
+    def is_self_delimiting(cls):
+        """ Determines whether this variable-size struct can be followed by other data (i.e. it only has linked VLAs). """
+        return cls._hydras_metadata.is_self_delimiting
+
+    @classmethod
+    def offset_of(cls, path: str) -> Tuple[int, Serializer]:
+        """
+        Find the static offset of a member, and its serializer.
+
+        :param path:    The name of the member; members of nested structs are separated by dots (e.g. `header.opcode`).
+        :return:        The byte offset of the member from the start of the struct, and the member's serializer.
+        """
+        struct_type = cls
+        offset = 0
+        serializer = None
+        for name in path.split('.'):
+            if struct_type is None:
+                raise TypeError(f'"{path}" does not refer to a member of a nested struct')
+            elif name not in struct_type._hydras_metadata.members:
+                raise AttributeError(f'{get_type_name(struct_type)} has no member "{name}"')
+
+            member_offset = struct_type._hydras_metadata.offsets[name]
+            if member_offset is None:
+                raise TypeError(f'Member "{name}" of {get_type_name(struct_type)} has no static offset')
+
+            offset += member_offset
+            serializer = struct_type._hydras_metadata.members[name]
+            struct_type = type(serializer.struct) if isinstance(serializer, NestedStruct) else None
+        return offset, serializer
+
+    @classmethod
+    def peek_length(cls, raw_data, settings: HydraSettings = None) -> Optional[int]:
+        """
+        Determine the length of the struct at the start of the given (possibly partial) data, without deserializing it.
+
+        :param raw_data:    The raw data, which may be shorter than the struct.
+        :param settings:    [Optional] Deserialization settings overrides.
+        :return:            The length of the struct, or `None` if more data is needed to determine it.
+        :raise ValueError:  If a length reference holds a negative item count.
+        """
+        if cls.is_constant_size():
+            return len(cls)
+        elif not cls.is_self_delimiting():
+            raise TypeError(f'The length of {get_type_name(cls)} cannot be determined without external framing')
+
+        members = cls._hydras_metadata.members
+        offsets = {}
+        offset = 0
+        for name, serializer in members.items():
+            offsets[name] = offset
+            if serializer.is_constant_size:
+                offset += serializer.byte_size
+                continue
+
+            path = serializer.get_length_ref()
+            if path is None:
+                # A self-delimiting nested struct
+                length = type(serializer.struct).peek_length(raw_data[offset:], settings)
+                if length is None:
+                    return None
+                offset += length
+                continue
+
+            # Locate the length member, whose offset inside its top-level member is static.
+            head, _, tail = path.partition('.')
+            ref_offset, ref_serializer = offsets[head], members[head]
+            if tail:
+                nested_offset, ref_serializer = type(ref_serializer.struct).offset_of(tail)
+                ref_offset += nested_offset
+            if len(raw_data) < ref_offset + ref_serializer.byte_size:
+                return None
+
+            count = ref_serializer.deserialize(raw_data[ref_offset:ref_offset + ref_serializer.byte_size], settings)
+            if count < 0:
+                raise ValueError(f'Length reference "{path}" holds a negative item count: {count}')
+            # Only the item count of the value is needed in order to get its length
+            offset += serializer.get_actual_length(range(count))
+        return offset
+
+    def serialize(self, settings: HydraSettings = None, as_bytearray: bool = False):
         """
         Serialize this struct into a byte string.
 
-        :param settings:    [Optional] Serialization settings overrides.
+        :param settings:        [Optional] Serialization settings overrides.
+        :param as_bytearray:    Return the `bytearray` the struct was serialized into, saving a copy into `bytes`.
         :return: A byte-string representing the struct.
         """
         output = bytearray(len(self))
         self.serialize_into(memoryview(output), 0, settings)
-        return bytes(output)
+        return output if as_bytearray else bytes(output)
 
     def serialize_into(self, storage: memoryview, offset: int, settings: HydraSettings = None):
         settings = settings or HydraSettings()
 
+        # Update the item counts of length-linked arrays
+        for name, path in self._hydras_metadata.length_refs:
+            self._hydras_set_path(path, len(getattr(self, name)))
+
         if not settings.dry_run:
             self.before_serialize()
 
+        valued_members = self._hydras_metadata.valued_members
         for name, formatter in self._hydras_metadata.members.items():
-            value = getattr(self, name)
+            value = getattr(self, name) if name in valued_members else None
             offset = formatter.serialize_into(storage, offset, value, settings)
 
         if not settings.dry_run:
@@ -165,6 +315,59 @@ class Struct(metaclass=StructMeta):
 
         return offset
 
+    def serialize_iov(self, settings: HydraSettings = None, copy_threshold: int = 512) -> List[memoryview]:
+        """
+        Serialize this struct into a list of buffers, suitable for scatter/gather I/O
+        (e.g. `socket.sendmsg`, `os.writev` or `writelines`).
+
+        Byte-array members holding `bytes` or `bytearray` values are referenced as is instead of being copied,
+        while the rest of the members are packed into segments of a single buffer between them.
+        Referenced values must not be modified until the buffers have been written.
+
+        :param settings:        [Optional] Serialization settings overrides.
+        :param copy_threshold:  Values shorter than this are copied anyway, as that's cheaper than another buffer.
+        :return: The buffers whose concatenation is the serialized struct.
+        """
+        settings = settings or HydraSettings()
+
+        # Update the item counts of length-linked arrays
+        for name, path in self._hydras_metadata.length_refs:
+            self._hydras_set_path(path, len(getattr(self, name)))
+
+        if not settings.dry_run:
+            self.before_serialize()
+
+        members = []
+        packed_size = 0
+        valued_members = self._hydras_metadata.valued_members
+        for name, formatter in self._hydras_metadata.members.items():
+            value = getattr(self, name) if name in valued_members else None
+            buffer = formatter.get_serialized_buffer(value)
+            if buffer is not None and len(buffer) < copy_threshold:
+                buffer = None
+            if buffer is None:
+                packed_size += formatter.get_actual_length(value)
+            members.append((formatter, value, buffer))
+
+        storage = memoryview(bytearray(packed_size))
+        buffers = []
+        offset = segment_start = 0
+        for formatter, value, buffer in members:
+            if buffer is None:
+                offset = formatter.serialize_into(storage, offset, value, settings)
+                continue
+            if offset > segment_start:
+                buffers.append(storage[segment_start:offset])
+                segment_start = offset
+            buffers.append(buffer)
+        if offset > segment_start:
+            buffers.append(storage[segment_start:offset])
+
+        if not settings.dry_run:
+            self.after_serialize()
+
+        return buffers
+
     @classmethod
     def deserialize(cls, raw_data, settings=None):
         """ Deserialize the given raw data into an object. """
@@ -180,19 +383,37 @@ class Struct(metaclass=StructMeta):
         if len(raw_data) < len(class_object):
             raise ValueError('The supplied raw data is too short for a struct of type "%s"' % get_type_name(cls))
 
+        valued_members = cls._hydras_metadata.valued_members
         for name, serializer in cls._hydras_metadata.members.items():
-            if serializer.is_constant_size:
-                data_piece = raw_data[:serializer.byte_size]
+            if name not in valued_members:
+                # Padding is skipped, making sure that it's there.
+                if len(raw_data) < serializer.byte_size:
+                    raise ValueError(f'The supplied raw data is too short for member "{name}"')
                 raw_data = raw_data[serializer.byte_size:]
+                continue
+
+            if serializer.is_constant_size:
+                size = serializer.byte_size
+            else:
+                # Linked members know their length in advance, the others are given the rest of the data.
+                size = serializer.get_linked_length(class_object)
+
+            if size is not None:
+                data_piece = raw_data[:size]
+                if len(data_piece) < size:
+                    raise ValueError(f'The supplied raw data is too short for member "{name}"')
             else:
                 data_piece = raw_data
-                raw_data = []
 
             try:
                 value = serializer.deserialize(data_piece, settings)
             except Exception as e:
                 raise ValidationError(data_piece, name, class_object, e)
 
+            if size is None:
+                size = serializer.get_actual_length(value)
+            raw_data = raw_data[size:]
+
             # Call base setattr in order to avoid validation
             super(Struct, class_object).__setattr__(name, value)
 
@@ -201,6 +422,55 @@ class Struct(metaclass=StructMeta):
 
         return class_object
 
+    @classmethod
+    def recv_from(cls, sock, buffer: bytearray = None, settings: HydraSettings = None):
+        """
+        Receive a single datagram from a socket and deserialize it.
+
+        :param sock:        A datagram socket.
+        :param buffer:      [Optional] A buffer to receive into, which can be reused between calls in order to avoid
+                            allocations. Datagrams longer than the buffer are rejected.
+                            By default, a buffer of 64KiB is allocated.
+        :param settings:    [Optional] Deserialization settings overrides.
+        :return:            The deserialized struct and the address of the sender.
+        """
+        if buffer is None:
+            buffer = bytearray(0x10000)
+
+        if hasattr(sock, 'recvmsg_into'):
+            import socket
+            length, _, flags, address = sock.recvmsg_into([buffer])
+            if flags & socket.MSG_TRUNC:
+                raise ValueError(f'A datagram longer than the {len(buffer)} bytes buffer was truncated')
+        else:
+            # Where `recvmsg` is missing (i.e. Windows), receiving a truncated datagram raises by itself.
+            length, address = sock.recvfrom_into(buffer)
+        with memoryview(buffer) as view:
+            return cls.deserialize(view[:length], settings), address
+
+    @staticmethod
+    def send_many(sock, structs: List['Struct'], buffer: bytearray = None, settings: HydraSettings = None) -> int:
+        """
+        Serialize a batch of structs into a single buffer and send it over a stream socket at once.
+
+        :param sock:        A stream socket.
+        :param structs:     The structs to send, in order.
+        :param buffer:      [Optional] A buffer to serialize into, which can be reused between calls in order to avoid
+                            allocations. A new buffer is allocated if it is missing or too short.
+        :param settings:    [Optional] Serialization settings overrides.
+        :return:            The number of bytes sent.
+        """
+        length = sum(len(s) for s in structs)
+        if buffer is None or len(buffer) < length:
+            buffer = bytearray(length)
+
+        with memoryview(buffer) as view:
+            offset = 0
+            for s in structs:
+                offset = s.serialize_into(view, offset, settings)
+            sock.sendall(view[:offset])
+        return offset
+
     ###################
     #      Hooks      #
     ###################
@@ -214,7 +484,7 @@ class Struct(metaclass=StructMeta):
 
     def validate(self):
         """ Determine the validity of the object's data. """
-        for field_name, formatter in self._hydras_metadata.members.items():
+        for field_name, formatter in self._hydras_metadata.valued_members.items():
             value = getattr(self, field_name)
             try:
                 formatter.validate(value)
@@ -230,12 +500,24 @@ class Struct(metaclass=StructMeta):
         length = self._hydras_metadata.size
 
         if not self.is_constant_size():
-            name, last_member = next(reversed(self._hydras_metadata.members.items()))
-            length -= last_member.byte_size
-            length += last_member.get_actual_length(getattr(self, name))
+            for name, member in self._hydras_metadata.members.items():
+                if not member.is_constant_size:
+                    length += member.get_actual_length(getattr(self, name)) - member.byte_size
 
         return length
 
+    def _hydras_get_path(self, path: str):
+        """ Get the value of a (possibly nested) member, e.g. `header.data_length`. """
+        value = self
+        for name in path.split('.'):
+            value = getattr(value, name)
+        return value
+
+    def _hydras_set_path(self, path: str, value):
+        """ Set the value of a (possibly nested) member, e.g. `header.data_length`. """
+        *parents, name = path.split('.')
+        setattr(self._hydras_get_path('.'.join(parents)) if parents else self, name, value)
+
     def __bytes__(self):
         return self.serialize()
 
@@ -244,7 +526,7 @@ class Struct(metaclass=StructMeta):
         if type(other) != type(self):
             raise TypeError('Cannot equate struct of differing types.')
 
-        for name, formatter in self._hydras_metadata.members.items():
+        for name, formatter in self._hydras_metadata.valued_members.items():
             if not formatter.values_equal(getattr(self, name), getattr(other, name)):
                 return False
 
@@ -256,8 +538,8 @@ class Struct(metaclass=StructMeta):
 
     def __setattr__(self, key, value):
         """ A validation of struct members using the dot-notation. """
-        if HydraSettings.validate and key in self._hydras_metadata.members:
-            self._hydras_metadata.members[key].validate(value)
+        if HydraSettings.validate and key in self._hydras_metadata.valued_members:
+            self._hydras_metadata.valued_members[key].validate(value)
 
         super(Struct, self).__setattr__(key, value)
 
@@ -270,7 +552,7 @@ class Struct(metaclass=StructMeta):
 
     def __iter__(self):
         """ Support conversion to dict """
-        for key in self._hydras_metadata.members:
+        for key in self._hydras_metadata.valued_members:
             value = getattr(self, key)
             if issubclass(type(value), Struct):
                 yield key, dict(value)
@@ -292,7 +574,7 @@ class Struct(metaclass=StructMeta):
         return create_array(item_count, NestedStruct[self]())
 
     def __repr__(self):
-        lines = (f"'{name}': {repr(getattr(self, name))}" for name in self._hydras_metadata.members)
+        lines = (f"'{name}': {repr(getattr(self, name))}" for name in self._hydras_metadata.valued_members)
         params = ', '.join(lines)
         return f'{get_type_name(self)}({{{params}}})'
 
@@ -302,7 +584,7 @@ class Struct(metaclass=StructMeta):
             f'{get_type_name(self)} {{'
         ]
 
-        for name, serializer in self._hydras_metadata.members.items():
+        for name, serializer in self._hydras_metadata.valued_members.items():
             lines.extend(options.indent + sub_line
                          for sub_line in serializer.render_lines(name,
                                                                  getattr(self, name),
@@ -332,14 +614,32 @@ class NestedStructMetadata(SerializerMetadata):
 class NestedStructMeta(SerializerMeta):
     _hydras_metadata: NestedStructMetadata
 
+    # Serializer types of struct classes (as opposed to struct objects with custom values) are created once
+    # and then shared.
+    _interned_types = weakref.WeakValueDictionary()
+
     def __getitem__(cls, struct_type_or_object):
-        if not issubclass(get_as_type(struct_type_or_object), Struct):
+        if not isinstance(get_as_type(struct_type_or_object), StructMeta):
             raise TypeError("struct_type_or_object should be either a Struct class or a Struct object.")
 
+        if not inspect.isclass(struct_type_or_object):
+            return cls._create_type(struct_type_or_object)
+
+        nested_type = NestedStructMeta._interned_types.get(struct_type_or_object)
+        if nested_type is None:
+            nested_type = cls._create_type(struct_type_or_object())
+            NestedStructMeta._interned_types[struct_type_or_object] = nested_type
+        return nested_type
+
+    def _create_type(cls, struct: 'Struct'):
         return type(get_type_name(cls), (cls,), {
-            SerializerMeta.METAATTR: NestedStructMetadata(get_as_value(struct_type_or_object))
+            SerializerMeta.METAATTR: NestedStructMetadata(struct)
         })
 
+    @property
+    def is_interned(cls) -> bool:
+        return NestedStructMeta._interned_types.get(get_as_type(cls._hydras_metadata.struct)) is cls
+
     def __repr__(self):
         # This impl is not accurate and will result in invalid representations,
         # but this will most likely be used for debugging purposes.
@@ -368,8 +668,8 @@ class NestedStruct(Serializer, metaclass=NestedStructMeta):
 
         super(NestedStruct, self).__init__(copy.deepcopy(self.struct), *args, **kwargs)
 
-    def serialize(self, value, settings=None):
-        return value.serialize(settings)
+    def serialize(self, value, settings=None, as_bytearray: bool = False):
+        return value.serialize(settings, as_bytearray)
 
     def get_initial_value(self):
         return copy.deepcopy(self.struct)
@@ -383,6 +683,19 @@ class NestedStruct(Serializer, metaclass=NestedStructMeta):
     def validate(self, value):
         value.validate()
 
+    def is_self_delimiting(self) -> bool:
+        return self.struct.is_self_delimiting()
+
+    def get_actual_length(self, value):
+        return len(value)
+
+    def get_interning_key(self):
+        # The default value of a nested struct is always taken from its type, so
+        # interned types are enough to tell identical serializers apart.
+        if not type(self).is_interned:
+            return None
+        return type(self), self.validator
+
     def render_lines(self, name: str, value: Struct, options: RenderOptions = None) -> List[str]:
         lines = value.render_lines(options)
         if name is not None:
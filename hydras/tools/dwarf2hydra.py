@@ -11,14 +11,25 @@ and tries to reconstruct Hydras definitions from those symbols.
 import re
 import os
 import sys
+import zlib
+import time
+import pickle
+import hashlib
+import sqlite3
 import argparse
+import itertools
+import contextlib
 
 from elftools.dwarf.compileunit import CompileUnit
 from elftools.elf.elffile import ELFFile
+from elftools.elf.sections import NoteSection
 from elftools.dwarf.die import DIE
-from typing import TextIO, List, Union
-from collections import OrderedDict
+from typing import TextIO, List, Dict, Tuple, Union, Optional
+from collections import OrderedDict, namedtuple, Counter
+from concurrent.futures import ProcessPoolExecutor
 from enum import IntEnum
+from struct import calcsize
+from hydras.lazy import LazyTypes
 
 
 autogen_comment = ['# This item has been automatically generated, see top of file',
@@ -57,8 +68,19 @@ TYPE_SETS = {
     },
 }
 
+# The `struct` format characters of primitives, used for the layouts of structs.
+STRUCT_FORMATS = {
+    'int': {1: 'b', 2: 'h', 4: 'i', 8: 'q'},
+    'uint': {1: 'B', 2: 'H', 4: 'I', 8: 'Q'},
+    'float': {4: 'f', 8: 'd'}
+}
+
 flatten_arrays = False
 chosen_type_set = None
+emit_layouts = False
+materialize_padding = False
+# The `Profiler` of the run, if profiling.
+profiler = None
 
 
 def eprint(*args, **kwargs):
@@ -89,10 +111,120 @@ def error(*args, **kwargs):
     print('\x1b[0m', file=sys.stderr)
 
 
+class Profiler(object):
+    """
+    Collects the wall time and peak memory of the phases of a run, and statistics of the parsed types.
+
+    Phases may be nested, in which case the time of the inner phase is only accounted to it.
+    Memory is measured by the peak RSS of the process, and every phase is accounted the growth of the peak
+    while it ran, since tracing allocations would slow parsing down several times.
+    """
+
+    # The number of slowest compile units to report.
+    SLOWEST_CUS = 10
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        # [seconds, peak RSS growth in KiB] of every phase, by name.
+        self.phases = OrderedDict()
+        # (name, segment start time, segment start peak RSS) of the running phases, innermost last.
+        self._running = []
+        # (seconds, location, number of collected types) of every compile unit.
+        self.cus = []
+        # The number of types collected out of DIEs, and of those left after deduplication, by kind.
+        self.collected_kinds = Counter()
+        self.unique_kinds = Counter()
+        # The number of collected types replaced by previous definitions of the same name,
+        # or by structurally identical types.
+        self.name_hits = 0
+        self.hash_hits = 0
+
+    @staticmethod
+    def get_peak_rss() -> int:
+        """ Get the peak RSS of the process, in KiB. """
+        import resource
+        peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # macOS reports bytes rather than KiB.
+        return peak_rss // 1024 if sys.platform == 'darwin' else peak_rss
+
+    def _account_segment(self):
+        """ Account the time and memory since the innermost phase was (re)started to it, and restart it. """
+        name, since, since_rss = self._running[-1]
+        now, peak_rss = time.perf_counter(), self.get_peak_rss()
+        totals = self.phases.setdefault(name, [0.0, 0])
+        totals[0] += now - since
+        totals[1] += peak_rss - since_rss
+        self._running[-1] = (name, now, peak_rss)
+
+    @contextlib.contextmanager
+    def phase(self, name: str):
+        if self._running:
+            self._account_segment()
+        self._running.append((name, time.perf_counter(), self.get_peak_rss()))
+        try:
+            yield
+        finally:
+            self._account_segment()
+            self._running.pop()
+            if self._running:
+                outer_name, _, _ = self._running[-1]
+                self._running[-1] = (outer_name, time.perf_counter(), self.get_peak_rss())
+
+    def iter_cus(self, cu_types):
+        """ Time the collection of the types of every compile unit, and their processing until the next one. """
+        cu_types = iter(cu_types)
+        while True:
+            start = time.perf_counter()
+            with self.phase('CU iteration'):
+                item = next(cu_types, None)
+            if item is None:
+                return
+            yield item
+            location, types = item
+            self.cus.append((time.perf_counter() - start, location, len(types)))
+
+    def report(self):
+        total = time.perf_counter() - self.start
+        eprint(f'{"Phase":<24}{"Time":>10}{"":>8}{"Peak RSS":>14}')
+        for name, (seconds, rss_growth) in self.phases.items():
+            eprint(f'{name:<24}{seconds:>9.3f}s{seconds / total:>8.1%}{rss_growth / 1024:>+10.1f} MiB')
+        other = total - sum(seconds for seconds, _ in self.phases.values())
+        eprint(f'{"Other":<24}{other:>9.3f}s{other / total:>8.1%}')
+        eprint(f'{"Total":<24}{total:>9.3f}s{"":>8}{self.get_peak_rss() / 1024:>10.1f} MiB')
+
+        eprint()
+        eprint(f'{"Kind":<24}{"Collected":>10}{"Unique":>10}')
+        for kind in sorted(self.collected_kinds.keys() | self.unique_kinds.keys()):
+            eprint(f'{kind:<24}{self.collected_kinds[kind]:>10}{self.unique_kinds[kind]:>10}')
+
+        collected = sum(self.collected_kinds.values())
+        eprint()
+        eprint(f'Deduplication: {collected} types collected, '
+               f'{self.name_hits} ({self.name_hits / max(collected, 1):.1%}) reused by name, '
+               f'{self.hash_hits} ({self.hash_hits / max(collected, 1):.1%}) merged by structure')
+
+        eprint()
+        eprint(f'Slowest compile units (of {len(self.cus)}):')
+        for seconds, location, type_count in sorted(self.cus, key=lambda cu: cu[0], reverse=True)[:self.SLOWEST_CUS]:
+            eprint(f'{seconds:>9.3f}s  {location} ({type_count} types)')
+
+
+def profile_phase(name: str):
+    """ Account the code run in the context to the given phase, if profiling. """
+    return profiler.phase(name) if profiler is not None else contextlib.nullcontext()
+
+
 class CodeOutput:
     def __init__(self, fp: TextIO):
         self.fp = fp
         self.last_item_was_typedef = False
+        self.anonymous_count = 0
+
+    def name_anonymous_type(self, typ: 'Type'):
+        """ Name an anonymous type (e.g. the type of `struct { ... } member;`), as its class must have a name. """
+        if typ.is_anonymous():
+            typ.name = f'_anonymous_{self.anonymous_count}'
+            self.anonymous_count += 1
 
     def write_struct(self, lines: List[str]):
         self.fp.write('\n\n')
@@ -120,12 +252,17 @@ class TypeState(IntEnum):
 
 
 class Type(object):
+    # C keeps the tags of structs, unions and enums apart from ordinary names (e.g. of typedefs),
+    # so `typedef struct foo foo;` defines two types named `foo`.
+    namespace = 'ordinary'
 
     def __init__(self, die: DIE):
-        self.source_object = die
+        # Types don't keep their DIEs alive, so that they can be pickled (e.g. from worker processes).
+        self.location = None
         self.name = None
         self.byte_size = None
         self.state = TypeState.INITIAL
+        self.structural_hash = None
 
     def get_type_dependencies(self) -> Union[List[int], List['Type']]:
         return []
@@ -139,29 +276,58 @@ class Type(object):
 
         self.state = TypeState.IN_PROCESS
         self.do_finalize(types, finalization_order)
-        if self not in finalization_order:
-            finalization_order.append(self)
+        # Structurally identical types are merged before finalization, so every type is only finalized once.
+        finalization_order.append(self)
         self.state = TypeState.FINALIZED
 
     def do_finalize(self, types, finalization_order):
         pass
 
-    def get_location(self):
-        node = self.source_object
-        while node is not None and node.tag != 'DW_TAG_compile_unit':
-            node = node.get_parent()
+    def get_structural_hash(self, types: Dict[int, 'Type'] = None) -> bytes:
+        """
+        Get a Merkle-style hash of the type's structure, covering its kind, name, size and layout,
+        and the hashes of its dependencies. The hash is memoized, so hashing a whole graph of types is linear.
 
-        if node is None:
+        :param types:   The types of the CU by offsets, used for resolving the dependencies of types that were not
+                        finalized yet.
+        """
+        if self.structural_hash is None:
+            key = (type(self).__name__, ) + self.get_structural_key(types)
+            self.structural_hash = hashlib.blake2b(repr(key).encode(), digest_size=16).digest()
+        return self.structural_hash
+
+    def get_structural_key(self, types) -> tuple:
+        """ The fields covered by the structural hash. """
+        return self.name, self.byte_size
+
+    @staticmethod
+    def get_dependency_hash(types, dependency) -> Optional[bytes]:
+        if dependency is None:
             return None
+        elif not isinstance(dependency, Type):
+            dependency = types[dependency]
+        return dependency.get_structural_hash(types)
 
-        comp_dir = node.attributes['DW_AT_comp_dir'].value
-        file_name = node.attributes['DW_AT_name'].value
-        file_name = os.path.join(comp_dir, file_name)
-        return file_name
+    def __eq__(self, other):
+        return isinstance(other, Type) and self.get_structural_hash() == other.get_structural_hash()
+
+    def __hash__(self):
+        return hash(self.get_structural_hash())
+
+    def get_location(self):
+        return self.location
 
     def get_hydras_type(self):
         pass
 
+    def get_hydras_ref(self, table: 'TypeTable'):
+        """ Get a reference to the type for `hydras.lazy.LazyTypes`, describing it (and its dependencies) in the table. """
+        return self.get_hydras_type()
+
+    def get_struct_format(self) -> Optional[str]:
+        """ Get the flattened `struct` format of the type, without a byte order, or `None` if it has none. """
+        return None
+
     def generate_hydras_definition(self, fp: CodeOutput):
         """
         Recursively generate hydras definitions for data types
@@ -185,8 +351,15 @@ class Type(object):
     def is_pointer(self) -> bool:
         return False
 
+    def is_anonymous(self) -> bool:
+        return self.name is None or self.name.startswith('<')
+
+    def get_name_key(self) -> Tuple[str, str]:
+        """ The key of the type's name, unique within the types of a program. """
+        return self.namespace, self.name
+
     def get_sorting_key(self):
-        return self.name
+        return self.name or ''
 
 
 class Primitive(Type):
@@ -199,23 +372,24 @@ class Primitive(Type):
     def __repr__(self):
         return self.get_hydras_type()
 
-    def get_hydras_type(self):
+    def get_category(self) -> str:
         if self.name in ['float', 'double']:
-            type_set = chosen_type_set['float']
+            return 'float'
         elif 'unsigned' in self.name:
-            type_set = chosen_type_set['uint']
-        else:
-            type_set = chosen_type_set['int']
+            return 'uint'
+        return 'int'
 
-        return type_set[self.byte_size]
+    def get_hydras_type(self):
+        return chosen_type_set[self.get_category()][self.byte_size]
+
+    def get_struct_format(self) -> Optional[str]:
+        return STRUCT_FORMATS[self.get_category()].get(self.byte_size)
 
-    def __eq__(self, other):
-        return isinstance(other, Primitive) and \
-               other.byte_size == self.byte_size and \
-               other.name == self.name
 
 
 class Struct(Type):
+    namespace = 'tag'
+
     def __init__(self, die: DIE):
         super().__init__(die)
 
@@ -228,24 +402,50 @@ class Struct(Type):
             self.byte_size = die.attributes['DW_AT_byte_size'].value
 
         self.members = []
+        bitfields = []
         for c in die.iter_children():
             if c.tag not in ['DW_TAG_member', 'DW_TAG_inheritance']:
                 continue
 
-            member_offset = c.attributes['DW_AT_data_member_location'].value
             type_num = c.attributes['DW_AT_type'].value
             if 'DW_AT_name' in c.attributes:
                 member_name = c.attributes['DW_AT_name'].value.decode('utf-8') if c.tag == 'DW_TAG_member' else '<base>'
             else:
                 member_name = '<unnamed>'
-            self.members.append((member_offset, type_num, member_name))
+
+            if 'DW_AT_bit_size' in c.attributes:
+                bitfields.append((self._get_bit_offset(c), c.attributes['DW_AT_bit_size'].value, member_name))
+            else:
+                self.members.append((c.attributes['DW_AT_data_member_location'].value, type_num, member_name))
+
+        if bitfields:
+            self.members.extend(BitfieldUnit.group(bitfields, [offset for offset, _, _ in self.members],
+                                                   self.byte_size, die.dwarfinfo.config.little_endian))
+            self.members.sort(key=lambda member: member[0])
+
+    @staticmethod
+    def _get_bit_offset(die: DIE) -> int:
+        """ Get the offset of a bitfield in bits, from the start of the struct. """
+        if 'DW_AT_data_bit_offset' in die.attributes:
+            return die.attributes['DW_AT_data_bit_offset'].value
+
+        # DWARF 2/3 describe the offset of the bitfield from the MSB of a storage unit.
+        storage_offset = die.attributes.get('DW_AT_data_member_location')
+        storage_offset = 0 if storage_offset is None else storage_offset.value
+        bit_offset = die.attributes['DW_AT_bit_offset'].value
+        if die.dwarfinfo.config.little_endian:
+            storage_bits = die.attributes['DW_AT_byte_size'].value * 8
+            return storage_offset * 8 + storage_bits - bit_offset - die.attributes['DW_AT_bit_size'].value
+        return storage_offset * 8 + bit_offset
 
     def do_finalize(self, types, finalization_order):
         new_members = []
 
         for offset, type_num, member_name in self.members:
-            types[type_num].finalize(types, finalization_order)
-            new_members.append((offset, types[type_num], member_name))
+            # Bitfield storage units are not described by DIEs, and are referenced directly.
+            member_type = type_num if isinstance(type_num, Type) else types[type_num]
+            member_type.finalize(types, finalization_order)
+            new_members.append((offset, member_type, member_name))
 
         self.members = new_members
 
@@ -264,28 +464,78 @@ class Struct(Type):
     def get_hydras_type(self):
         return self.name
 
-    def __eq__(self, other):
-        return isinstance(other, Struct) and \
-               other.byte_size == self.byte_size and \
-               other.members == self.members and \
-               other.name == self.name
+    def get_structural_key(self, types) -> tuple:
+        return self.name, self.byte_size, tuple((offset, self.get_dependency_hash(types, member_type), member_name)
+                                                for offset, member_type, member_name in self.members)
 
-    def do_generate_hydras_definition(self, fp: CodeOutput):
+    def iter_layout(self):
+        """
+        Iterate the `(name, member_type)` pairs of the struct's members, including compiler introduced padding,
+        whose type is the number of padding bytes.
+        """
         padding_counter = 0
         last_ending_offset = 0
-        byte_type = chosen_type_set['uint'][1]
-
-        # Adding 2 empty lines in order to comply w/ PEP8
-        struct_lines = autogen_comment.copy()
-        struct_lines.append(f'class {self.name}(Struct):')
 
         for offset, member_type, member_name in self.members:
             # Generate entries for compiler introduced padding
             if last_ending_offset < offset:
-                struct_lines.append(f'    _padding_{padding_counter} = {byte_type}[{offset - last_ending_offset}]')
+                yield f'_padding_{padding_counter}', offset - last_ending_offset
                 padding_counter += 1
             last_ending_offset = offset + member_type.byte_size
 
+            yield member_name, member_type
+
+        # The compiler can also generate postfix padding.
+        if last_ending_offset != self.byte_size:
+            yield f'_padding_{padding_counter}', self.byte_size - last_ending_offset
+
+    @staticmethod
+    def get_padding_ref(size: int):
+        return (chosen_type_set['uint'][1], size) if materialize_padding else size
+
+    def get_hydras_ref(self, table: 'TypeTable'):
+        return table.describe(self, lambda: ('struct', tuple(
+            (member_name, self.get_padding_ref(member_type) if isinstance(member_type, int)
+             else member_type.get_hydras_ref(table))
+            for member_name, member_type in self.iter_layout())))
+
+    def get_struct_format(self) -> Optional[str]:
+        formats = []
+        for _, member_type in self.iter_layout():
+            fmt = f'{member_type}x' if isinstance(member_type, int) else member_type.get_struct_format()
+            if fmt is None:
+                return None
+            formats.append(fmt)
+        return ''.join(formats)
+
+    def get_layout(self) -> Optional[Tuple[str, Tuple[Tuple[str, int], ...]]]:
+        """
+        Get the flattened `struct` format of the struct (with padding as pad bytes), and the `(name, offset)`
+        of its members, or `None` if it can't be described by a single format (e.g. it has a VLA).
+        Union members are described as raw bytes (`Ns`).
+        """
+        fmt = self.get_struct_format()
+        if fmt is None or calcsize('<' + fmt) != self.byte_size:
+            return None
+        return fmt, tuple((member_name, offset) for offset, _, member_name in self.members)
+
+    def do_generate_hydras_definition(self, fp: CodeOutput):
+        fp.name_anonymous_type(self)
+        byte_type = chosen_type_set['uint'][1]
+
+        # Adding 2 empty lines in order to comply w/ PEP8
+        struct_lines = autogen_comment.copy()
+        struct_lines.append(f'class {self.name}(Struct):')
+        layout = self.get_layout() if emit_layouts else None
+        if layout is not None:
+            struct_lines.append(f'    __hydras_layout__ = {layout!r}')
+
+        for member_name, member_type in self.iter_layout():
+            if isinstance(member_type, int):
+                padding = f'{byte_type}[{member_type}]' if materialize_padding else f'Padding({member_type})'
+                struct_lines.append(f'    {member_name} = {padding}')
+                continue
+
             if member_type.is_pointer():
                 struct_lines.append(f'    # <POINTER> ({repr(member_type)})')
 
@@ -293,14 +543,117 @@ class Struct(Type):
             type_hint = f': List[{member_type.item_type.get_hydras_type()}]' if type(member_type) == Array else ''
             struct_lines.append(f'    {member_name}{type_hint} = {member_type.get_hydras_type()}')
 
-        # The compiler can also generate postfix padding.
-        if last_ending_offset != self.byte_size:
-            struct_lines.append(f'    _padding_{padding_counter} = {byte_type}[{self.byte_size - last_ending_offset}]')
-
+        if emit_layouts:
+            struct_lines.extend(['', '', f'assert len({self.name}) == {self.byte_size}'])
         fp.write_struct(struct_lines)
 
 
+class BitfieldUnit(Type):
+    """
+    A storage unit of adjacent C bitfields, emitted as a Hydras bitfield (e.g. `u16.bits(mode=3, divider=12)`).
+
+    Fields are listed from the LSB of the storage unit, and gaps between them are filled by reserved fields.
+    Signed bitfields are decoded as unsigned, since Hydras bitfields are unsigned.
+    """
+
+    def __init__(self, byte_size: int, fields: List[Tuple[str, int]]):
+        super().__init__(None)
+        self.byte_size = byte_size
+        # (name, width) of every field, from the LSB, or `None` if the bitfields can't be represented as a scalar.
+        self.fields = fields
+
+    @staticmethod
+    def group(bitfields: List[Tuple[int, int, str]], member_offsets: List[int], struct_size: int, little_endian: bool):
+        """
+        Group bitfields into storage units.
+
+        Every unit is the smallest unsigned scalar that covers its fields, without overlapping the next member,
+        so a unit may be smaller than the declared type of its bitfields.
+
+        :param bitfields:       The `(bit offset, bit size, name)` of every bitfield of the struct.
+        :param member_offsets:  The offsets of the struct's other members.
+        :return:                The `(offset, unit, name)` members of the struct.
+        """
+        groups = []
+        for bit_offset, bit_size, name in sorted(bitfields):
+            end_bit = bit_offset + bit_size
+            if groups:
+                start, fields = groups[-1]
+                size = BitfieldUnit._get_scalar_size(start, end_bit)
+                limit = min((offset for offset in member_offsets if offset > start), default=struct_size)
+                # Units can't share a byte, so a bitfield that begins in the unit's last byte must join it.
+                shares_byte = bit_offset // 8 < (max(o + s for o, s, _ in fields) + 7) // 8
+                if (size is not None and start + size <= limit) or shares_byte:
+                    fields.append((bit_offset, bit_size, name))
+                    continue
+            groups.append((bit_offset // 8, [(bit_offset, bit_size, name)]))
+
+        units = []
+        for index, (start, fields) in enumerate(groups):
+            end = (max(bit_offset + bit_size for bit_offset, bit_size, _ in fields) + 7) // 8
+            limit = min((offset for offset in member_offsets if offset > start), default=struct_size)
+            size = BitfieldUnit._get_scalar_size(start, end * 8)
+            if size is None or start + size > limit:
+                warn(f'Bitfields {", ".join(name for _, _, name in fields)} do not fit a scalar, emitting raw bytes')
+                units.append((start, BitfieldUnit(end - start, None), f'bitfield_{index}'))
+                continue
+
+            layout = []
+            for bit_offset, bit_size, name in fields:
+                shift = bit_offset - start * 8
+                if not little_endian:
+                    # Big-endian targets allocate bitfields from the MSB of the storage unit.
+                    shift = size * 8 - shift - bit_size
+                layout.append((shift, bit_size, name))
+
+            unit_fields = []
+            next_bit = 0
+            for shift, bit_size, name in sorted(layout):
+                if next_bit < shift:
+                    unit_fields.append((f'_reserved_{len(unit_fields)}', shift - next_bit))
+                unit_fields.append((name, bit_size))
+                next_bit = shift + bit_size
+            units.append((start, BitfieldUnit(size, unit_fields), f'bitfield_{index}'))
+        return units
+
+    @staticmethod
+    def _get_scalar_size(start: int, end_bit: int) -> Optional[int]:
+        """ Get the size of the smallest unsigned scalar that covers the bits from byte `start` up to `end_bit`. """
+        for size in (1, 2, 4, 8):
+            if start * 8 + size * 8 >= end_bit:
+                return size
+        return None
+
+    def get_structural_key(self, types) -> tuple:
+        return self.byte_size, None if self.fields is None else tuple(self.fields)
+
+    def get_hydras_type(self):
+        byte_type = chosen_type_set['uint'][1]
+        if self.fields is None:
+            return f'{byte_type}[{self.byte_size}]'
+        fields = ', '.join(f'{name}={width}' for name, width in self.fields)
+        return f'{chosen_type_set["uint"][self.byte_size]}.bits({fields})'
+
+    def get_hydras_ref(self, table: 'TypeTable'):
+        if self.fields is None:
+            return chosen_type_set['uint'][1], self.byte_size
+        return {'bits': chosen_type_set['uint'][self.byte_size], 'fields': tuple(self.fields)}
+
+    def get_struct_format(self) -> Optional[str]:
+        if self.fields is None:
+            return f'{self.byte_size}s'
+        return STRUCT_FORMATS['uint'][self.byte_size]
+
+    def __repr__(self):
+        return self.get_hydras_type()
+
+    def get_sorting_key(self):
+        return self.get_hydras_type()
+
+
 class EnumType(Type):
+    namespace = 'tag'
+
     def __init__(self, die: DIE):
         super().__init__(die)
 
@@ -336,13 +689,17 @@ class EnumType(Type):
     def get_hydras_type(self):
         return f'{self.name}'
 
-    def __eq__(self, other):
-        return isinstance(other, EnumType) and \
-               other.name == self.name and \
-               other.item_type == self.item_type and \
-               other.literals == self.literals
+    def get_hydras_ref(self, table: 'TypeTable'):
+        return table.describe(self, lambda: ('enum', self.item_type.get_hydras_ref(table), tuple(self.literals.items())))
+
+    def get_struct_format(self) -> Optional[str]:
+        return self.item_type.get_struct_format()
+
+    def get_structural_key(self, types) -> tuple:
+        return self.name, self.get_dependency_hash(types, self.item_type), tuple(self.literals.items())
 
     def do_generate_hydras_definition(self, fp: CodeOutput):
+        fp.name_anonymous_type(self)
         enum_lines = autogen_comment.copy()
         enum_lines.append(f'class {self.name}(Enum, underlying_type={self.item_type.get_hydras_type()}):')
 
@@ -354,6 +711,8 @@ class EnumType(Type):
 
 
 class UnionType(Type):
+    namespace = 'tag'
+
     def __init__(self, die: DIE):
         super().__init__(die)
 
@@ -384,10 +743,29 @@ class UnionType(Type):
     def get_hydras_type(self):
         return self.name
 
-    def __eq__(self, other):
-        return isinstance(other, UnionType) and \
-               other.name == self.name and \
-               other.variants == self.variants
+    def get_hydras_ref(self, table: 'TypeTable'):
+        return table.describe(self, lambda: ('union', tuple((name, variant.get_hydras_ref(table))
+                                                             for name, variant in self.variants.items())))
+
+    def get_struct_format(self) -> Optional[str]:
+        # The variants of a union overlap, so it can only be unpacked as raw bytes.
+        return f'{self.byte_size}s'
+
+    def get_structural_key(self, types) -> tuple:
+        return self.name, self.byte_size, tuple((name, self.get_dependency_hash(types, variant))
+                                                for name, variant in self.variants.items())
+
+    def do_generate_hydras_definition(self, fp: CodeOutput):
+        fp.name_anonymous_type(self)
+        union_lines = autogen_comment.copy()
+        union_lines.append(f'class {self.name}(Union):')
+
+        for name, variant in self.variants.items():
+            if variant.is_pointer():
+                union_lines.append(f'    # <POINTER> ({repr(variant)})')
+            union_lines.append(f'    {name} = {variant.get_hydras_type()}')
+
+        fp.write_struct(union_lines)
 
 
 class Array(Type):
@@ -414,7 +792,8 @@ class Array(Type):
     def do_finalize(self, types, finalization_order):
         self.item_type = types[self.item_type]
         self.item_type.finalize(types, finalization_order)
-        self.byte_size = self.item_type.byte_size
+        # Flexible array members take no space in their struct, like Hydras VLAs.
+        self.byte_size = 0 if self.is_vla else self.item_type.byte_size
         for d in self.dimensions:
             self.byte_size *= d
 
@@ -442,8 +821,22 @@ class Array(Type):
 
         return t
 
-    def __eq__(self, other):
-        return isinstance(other, Array) and other.dimensions == self.dimensions and other.item_type == self.item_type
+    def get_hydras_ref(self, table: 'TypeTable'):
+        return (self.item_type.get_hydras_ref(table), *self.dimensions[::-1], *([None] if self.is_vla else []))
+
+    def get_struct_format(self) -> Optional[str]:
+        item_format = self.item_type.get_struct_format()
+        if item_format is None or self.is_vla:
+            return None
+
+        count = 1
+        for d in self.dimensions:
+            count *= d
+        # A single format character can be repeated by a count, others (e.g. of structs) are repeated as a whole.
+        return f'{count}{item_format}' if len(item_format) == 1 else item_format * count
+
+    def get_structural_key(self, types) -> tuple:
+        return self.get_dependency_hash(types, self.item_type), tuple(self.dimensions), self.is_vla
 
     def is_pointer(self) -> bool:
         return self.item_type.is_pointer()
@@ -486,17 +879,39 @@ class Typedef(Type):
 
         return self.name
 
+    def get_hydras_ref(self, table: 'TypeTable'):
+        if self._match_primitive_type():
+            return self.get_hydras_type()
+        elif self._names_alias():
+            table.reserve_name(self.alias, self.name)
+            alias_ref = self.alias.get_hydras_ref(table)
+            if alias_ref == self.name:
+                return alias_ref
+            # The alias was already named (e.g. by another typedef of a structurally identical type).
+            return table.describe(self, lambda: ('alias', alias_ref))
+        return table.describe(self, lambda: ('alias', self.alias.get_hydras_ref(table)))
+
+    def get_struct_format(self) -> Optional[str]:
+        if self._match_primitive_type():
+            return STRUCT_FORMATS[self.category].get(self.byte_size)
+        return None if self.alias is None else self.alias.get_struct_format()
+
     def __repr__(self):
         return self.name
 
-    def __eq__(self, other):
+    def get_structural_key(self, types) -> tuple:
         if self._match_primitive_type():
-            return isinstance(other, Typedef) and other.name == self.name
+            return self.name,
+        return self.name, self.get_dependency_hash(types, self.alias)
 
-        return isinstance(other, Typedef) and other.name == self.name and other.alias == self.alias
+    def generate_hydras_definition(self, fp: CodeOutput):
+        if self.state == TypeState.FINALIZED and not self._match_primitive_type() and \
+                self._names_alias() and self.alias.is_anonymous():
+            self.alias.name = self.name
+        super().generate_hydras_definition(fp)
 
     def do_generate_hydras_definition(self, fp: CodeOutput):
-        if self._match_primitive_type():
+        if self._match_primitive_type() or self.alias.name == self.name:
             return
 
         typedef_lines = []
@@ -508,6 +923,11 @@ class Typedef(Type):
     def _match_primitive_type(self):
         return re.match(r'(float|u?int)(8|16|32|64)_t', self.name)
 
+    def _names_alias(self) -> bool:
+        """ `typedef struct {...} name;` and `typedef struct name name;` describe a single type. """
+        return isinstance(self.alias, (Struct, EnumType, UnionType)) and \
+            (self.alias.is_anonymous() or self.alias.name == self.name)
+
 
 class Pointer(Type):
     def __init__(self, die: DIE):
@@ -531,11 +951,18 @@ class Pointer(Type):
     def get_hydras_type(self):
         return chosen_type_set['uint'][self.byte_size]
 
+    def get_struct_format(self) -> Optional[str]:
+        return STRUCT_FORMATS['uint'][self.byte_size]
+
     def is_pointer(self) -> bool:
         return True
 
-    def __eq__(self, other):
-        return isinstance(other, Pointer) and other.name == self.name and other.item_type == self.item_type
+    def get_structural_key(self, types) -> tuple:
+        # Pointers may be part of cycles (e.g. linked lists), so they only cover the name of the pointed type.
+        item_type = self.item_type
+        if item_type is not None and not isinstance(item_type, Type):
+            item_type = types[item_type]
+        return self.byte_size, None if item_type is None else (type(item_type).__name__, item_type.name)
 
     def __repr__(self):
         if self.item_type is None:
@@ -568,8 +995,14 @@ class ConstType(Type):
     def get_hydras_type(self):
         return self.item_type.get_hydras_type()
 
-    def __eq__(self, other):
-        return isinstance(other, ConstType) and other.name == self.name and other.item_type == self.item_type
+    def get_hydras_ref(self, table: 'TypeTable'):
+        return self.item_type.get_hydras_ref(table)
+
+    def get_struct_format(self) -> Optional[str]:
+        return None if self.item_type is None else self.item_type.get_struct_format()
+
+    def get_structural_key(self, types) -> tuple:
+        return self.get_dependency_hash(types, self.item_type),
 
     def __repr__(self):
         if self.item_type is None:
@@ -586,7 +1019,6 @@ class ConstType(Type):
 class FunctionPointer(Type):
     def __init__(self, die: DIE):
         super().__init__(die)
-        self.die = die
 
         self.parameters = []
         for child in die.iter_children():
@@ -597,6 +1029,9 @@ class FunctionPointer(Type):
     def get_type_dependencies(self) -> List[int]:
         return self.parameters
 
+    def get_structural_key(self, types) -> tuple:
+        return tuple(self.get_dependency_hash(types, parameter) for parameter in self.parameters)
+
     def do_finalize(self, types, finalization_order):
         self.parameters = [types[offset] for offset in self.parameters]
         for typ in self.parameters:
@@ -615,7 +1050,10 @@ class FunctionPointer(Type):
 class UnsupportedType(Type):
     def __init__(self, die: DIE):
         super().__init__(die)
-        self.die = die
+        self.tag = die.tag
+
+    def get_structural_key(self, types) -> tuple:
+        return self.tag,
 
     def do_finalize(self, types, finalization_order):
         pass
@@ -638,75 +1076,518 @@ TAG_TYPE_MAPPING = {
 }
 
 
-def parse_dwarf_info(elf, whitelist_re, skip_duplicated_symbols):
-    def _get_cu_name(cu: CompileUnit) -> str:
-        return cu.get_top_DIE().attributes['DW_AT_name'].value.decode('utf-8')
-
-    # A mapping of `name: type` across all translation units.
-    aggregated_types_by_name = {}
-    # List of types by finalization order
-    finalization_order = []
-
-    for cu in elf.get_dwarf_info().iter_CUs():
-        info(f'Processing {_get_cu_name(cu)}')
-
-        # First, we must collect all DIEs into this dictionary so that code
-        # from here-on-out will be able to index into it.
-        dies = {die.offset - cu.cu_offset: die for die in cu.iter_DIEs()}
-        types = {}
-
-        # Collect all top-level nodes that are whitelisted and make sure that
-        # all of their dependencies are processed as well.
-        pred = lambda die: 'DW_AT_name' in die.attributes and \
-                           whitelist_re.match(die.attributes['DW_AT_name'].value.decode('utf-8'))
-
-        type_deps_to_process = {offset for offset, die in dies.items() if pred(die)}
-        processed_types = set()
+def _get_cu_location(cu: CompileUnit) -> str:
+    top = cu.get_top_DIE()
+    file_name = top.attributes['DW_AT_name'].value.decode('utf-8')
+    if 'DW_AT_comp_dir' in top.attributes:
+        file_name = os.path.join(top.attributes['DW_AT_comp_dir'].value.decode('utf-8'), file_name)
+    return file_name
+
+
+def _iter_named_dies(die: DIE):
+    """ Iterate the named DIEs at the top level of a CU, including those inside namespaces. """
+    for child in die.iter_children():
+        if child.tag == 'DW_TAG_namespace':
+            yield from _iter_named_dies(child)
+        elif 'DW_AT_name' in child.attributes:
+            yield child
+
+
+def _release_cu_dies(cu: CompileUnit):
+    # pyelftools caches every DIE it parses in its CU, and the CU itself for the lifetime of the DWARF info.
+    # The cache is private, so versions of pyelftools that store it differently just keep the DIEs in memory.
+    die_list, die_map = getattr(cu, '_dielist', None), getattr(cu, '_diemap', None)
+    if isinstance(die_list, list) and isinstance(die_map, list):
+        die_list.clear()
+        die_map.clear()
+
+
+def find_pubtypes_roots(dwarf_info, whitelist_re) -> Dict[int, List[int]]:
+    """
+    Find the whitelisted types using the `.debug_pubtypes` section, if present.
+
+    :return: A mapping of the offsets of the CUs covered by the section, to the CU-relative offsets
+             of their whitelisted types.
+    """
+    pubtypes = dwarf_info.get_pubtypes()
+    if pubtypes is None:
+        return {}
+
+    roots = {header.debug_info_offset: [] for header in pubtypes.get_cu_headers()}
+    for name, entry in pubtypes.items():
+        if whitelist_re.match(name):
+            roots[entry.cu_ofs].append(entry.die_ofs - entry.cu_ofs)
+    return roots
+
+
+def collect_cu_types(cu: CompileUnit, whitelist_re, roots: List[int] = None, release_dies: bool = True) -> Dict[int, Type]:
+    """
+    Collect the whitelisted types of a single compile unit and their dependencies.
+    The returned types are not finalized yet, and refer to each other by their offsets in the CU.
+
+    :param roots:           The CU-relative offsets of the whitelisted types, if already known (e.g. from `.debug_pubtypes`).
+                            Otherwise, the named DIEs at the top level of the CU are matched against the whitelist.
+    :param release_dies:    Whether to release the parsed DIEs once the types are collected.
+    """
+    location = _get_cu_location(cu)
+
+    if roots is None:
+        # Parsing the top-level DIEs and matching their names are profiled separately.
+        named_dies = [(die.offset - cu.cu_offset, die.attributes['DW_AT_name'].value)
+                      for die in _iter_named_dies(cu.get_top_DIE())]
+        with profile_phase('Whitelist matching'):
+            roots = [offset for offset, name in named_dies if whitelist_re.match(name.decode('utf-8'))]
+
+    # Only the DIEs of the whitelisted types and their dependencies are parsed,
+    # and they are released once the types extracted what they need.
+    types = {}
+    type_deps_to_process = set(roots)
+    with profile_phase('DIE collection'):
         while len(type_deps_to_process) > 0:
             offset = type_deps_to_process.pop()
-            if offset in processed_types:
+            # Types that aren't described by DIEs (e.g. bitfield storage units) are referenced directly.
+            if offset is None or isinstance(offset, Type) or offset in types:
                 continue
-            processed_types.add(offset)
 
-            die = dies[offset]
+            die = cu.get_DIE_from_refaddr(cu.cu_offset + offset)
             types[offset] = TAG_TYPE_MAPPING.get(die.tag, UnsupportedType)(die)
+            types[offset].location = location
             type_deps_to_process.update(types[offset].get_type_dependencies())
 
+    if release_dies:
+        _release_cu_dies(cu)
+    return types
+
+
+def merge_cu_types(types: Dict[int, Type], skip_duplicated_symbols, aggregated_types_by_name, finalization_order,
+                   aggregated_types_by_hash: Dict[bytes, Type]):
+    """
+    Finalize the types collected from a single compile unit, and merge them into the types of the previous ones.
+
+    Types are identified by their structural hashes, so structurally identical types (including anonymous ones)
+    are shared across (and within) compile units, and only the first of them is finalized.
+    """
+    if profiler is not None:
+        profiler.collected_kinds.update(type(typ).__name__ for typ in types.values())
+
+    with profile_phase('Deduplication'):
+        # When the same symbol is defined in multiple Translation-Units,
+        # we perform either of the following:
+        #  - Parse only once and reuse the same definition.
+        #  - Parse both definitions and make sure they are the same
+        name_hits = hash_hits = 0
+        if skip_duplicated_symbols:
+            for offset, typ in types.items():
+                if not typ.is_anonymous() and typ.get_name_key() in aggregated_types_by_name:
+                    types[offset] = aggregated_types_by_name[typ.get_name_key()]
+                    name_hits += 1
+
         for offset, typ in types.items():
-            # When the same symbol is defined in multiple Translation-Units,
-            # we perform either of the following:
-            #  - Parse both definitions and make sure they are the same
-            #  - Parse only once and reuse the same definition.
-            if typ.name is not None and typ.name in aggregated_types_by_name:
-                if skip_duplicated_symbols:
-                    # debug(f'Replacing offset {offset} with cached type {typ.name}. '
-                    #       f'(OID={id(typ)},NID={id(aggregated_types_by_name[typ.name])})')
-                    types[offset] = aggregated_types_by_name[typ.name]
-                else:
-                    # TODO: This implementation is broken because
-                    #       `finalize` still modifies `types` and it can create duplicates.
-                    # We still finalize the type so we could check it,
-                    # but we provide an empty list for the initialization order
-                    # so we could avoid duplicates
+            canonical = aggregated_types_by_hash.setdefault(typ.get_structural_hash(types), typ)
+            if canonical is not typ:
+                types[offset] = canonical
+                hash_hits += 1
+            elif not typ.is_anonymous():
+                previous = aggregated_types_by_name.setdefault(typ.get_name_key(), typ)
+                if previous is not typ and not skip_duplicated_symbols:
+                    # Finalized only so that its members are printed by their types
                     typ.finalize(types, [])
-                    if typ != aggregated_types_by_name[typ.name]:
-                        error(f'Conflicting definitions for type `{typ.name}`')
-                        info(f'First occurrence:')
-                        eprint(repr(typ))
-                        info(f'Second occurrence:')
-                        eprint(repr(aggregated_types_by_name))
-                        sys.exit(1)
-
+                    error(f'Conflicting definitions for type `{typ.name}`')
+                    info(f'First occurrence ({previous.get_location()}):')
+                    eprint(repr(previous))
+                    info(f'Second occurrence ({typ.get_location()}):')
+                    eprint(repr(typ))
+                    sys.exit(1)
+
+    if profiler is not None:
+        profiler.name_hits += name_hits
+        profiler.hash_hits += hash_hits
+
+    with profile_phase('Finalization'):
         for offset, typ in types.items():
             typ.finalize(types, finalization_order)
 
-        # Update the aggregate
-        for typ in types.values():
-            aggregated_types_by_name[typ.name] = typ
 
+def _init_worker(flatten):
+    global flatten_arrays
+    flatten_arrays = flatten
+
+
+def _collect_cus_worker(elf_path: str, cus: List[Tuple[int, List[int]]], whitelist_re) -> List[Tuple[str, Dict[int, Type]]]:
+    with open(elf_path, 'rb') as f:
+        dwarf_info = ELFFile(f).get_dwarf_info()
+        results = []
+        for cu_offset, roots in cus:
+            cu = dwarf_info.get_CU_at(cu_offset)
+            results.append((_get_cu_location(cu), collect_cu_types(cu, whitelist_re, roots)))
+        return results
+
+
+def _map_cus_parallel(elf, worker, cus: list, jobs: int, *args):
+    """
+    Process compile units in a pool of worker processes, calling `worker(elf_path, chunk, *args)` on chunks of `cus`.
+    Every worker parses its own copy of the ELF, and results are yielded in the order of the compile units.
+    """
+    # Small chunks keep the workers balanced when the sizes of compile units vary a lot.
+    chunk_size = max(1, len(cus) // (jobs * 4))
+    chunks = [cus[i:i + chunk_size] for i in range(0, len(cus), chunk_size)]
+
+    with ProcessPoolExecutor(jobs, initializer=_init_worker, initargs=(flatten_arrays, )) as executor:
+        for results in executor.map(worker, itertools.repeat(elf.stream.name), chunks,
+                                    *map(itertools.repeat, args)):
+            yield from results
+
+
+def _iter_cu_types_parallel(elf, whitelist_re, pubtypes_roots, jobs: int):
+    """ Collect the types of all compile units in a pool of worker processes. """
+    cus = [(cu.cu_offset, pubtypes_roots.get(cu.cu_offset)) for cu in elf.get_dwarf_info().iter_CUs()]
+    return _map_cus_parallel(elf, _collect_cus_worker, cus, jobs, whitelist_re)
+
+
+# Bump whenever the pickled `Type`s change, to invalidate existing cache entries.
+CACHE_FORMAT_VERSION = 3
+
+# Forms of attributes whose strings are stored in `.debug_str` / `.debug_line_str`.
+# A CU refers to them by offset, so a CU whose bytes didn't change may still read different strings.
+STRING_TABLE_FORMS = ('DW_FORM_strp', 'DW_FORM_line_strp')
+# Forms of attributes whose strings can't be verified without the CU's DIEs.
+INDIRECT_STRING_FORMS = ('DW_FORM_strx', 'DW_FORM_strx1', 'DW_FORM_strx2', 'DW_FORM_strx3', 'DW_FORM_strx4',
+                         'DW_FORM_GNU_str_index', 'DW_FORM_strp_sup', 'DW_FORM_GNU_strp_alt')
+
+DW_FORM_implicit_const = 0x21
+
+# The types of all the named top-level DIEs of a CU, as stored in the cache.
+#  - roots:     A mapping of the CU-relative offsets of the named DIEs to their names.
+#  - types:     The collected types, or `None` if the CU can't be cached and must be parsed every time.
+#  - strings:   The `(form, offset, value)` of every string the CU's DIEs read from the string tables,
+#               or `None` if the entry may only be reused for the very same ELF.
+CachedCU = namedtuple('CachedCU', ('location', 'roots', 'types', 'strings'))
+
+
+def get_elf_cache_key(elf) -> str:
+    """ Identify an ELF by its GNU build-id, or by a hash of its contents if it has none. """
+    identity = None
+    for section in elf.iter_sections():
+        if isinstance(section, NoteSection):
+            for note in section.iter_notes():
+                if note['n_type'] == 'NT_GNU_BUILD_ID':
+                    identity = f'build-id:{note["n_desc"]}'
+
+    if identity is None:
+        digest = hashlib.sha256()
+        elf.stream.seek(0)
+        for chunk in iter(lambda: elf.stream.read(1 << 20), b''):
+            digest.update(chunk)
+        identity = f'sha256:{digest.hexdigest()}'
+
+    return hashlib.sha256(f'{CACHE_FORMAT_VERSION}:{flatten_arrays}:{identity}'.encode()).hexdigest()
+
+
+def _read_abbrev_table(stream, offset: int) -> bytes:
+    """ Read the raw bytes of the abbreviation table at the given offset of `.debug_abbrev`. """
+    stream.seek(offset)
+    data = bytearray()
+
+    def read_leb128() -> int:
+        value = shift = 0
+        while True:
+            byte, = stream.read(1)
+            data.append(byte)
+            value |= (byte & 0x7f) << shift
+            shift += 7
+            if byte & 0x80 == 0:
+                return value
+
+    while read_leb128() != 0:           # Abbreviation code
+        read_leb128()                   # Tag
+        data += stream.read(1)          # Children
+        while True:
+            name, form = read_leb128(), read_leb128()
+            if form == DW_FORM_implicit_const:
+                read_leb128()
+            if name == 0 and form == 0:
+                break
+
+    return bytes(data)
+
+
+def get_cu_cache_key(dwarf_info, cu: CompileUnit) -> str:
+    """ Identify a CU by its raw bytes and abbreviations, so that it is recognized across builds of an ELF. """
+    digest = hashlib.sha256(f'{CACHE_FORMAT_VERSION}:{flatten_arrays}:'.encode())
+    stream = dwarf_info.debug_info_sec.stream
+    stream.seek(cu.cu_offset)
+    digest.update(stream.read(cu.size))
+    digest.update(_read_abbrev_table(dwarf_info.debug_abbrev_sec.stream, cu['debug_abbrev_offset']))
+    return digest.hexdigest()
+
+
+def _get_cu_strings(cu: CompileUnit) -> Optional[List[Tuple[str, int, bytes]]]:
+    """ Get the strings the parsed DIEs of a CU read from the string tables, or `None` if they can't be verified. """
+    # The parsed DIEs are cached privately by pyelftools; other versions verify every DIE of the CU instead.
+    dies = getattr(cu, '_dielist', None)
+    if not isinstance(dies, list):
+        dies = cu.iter_DIEs()
+
+    strings = set()
+    for die in dies:
+        for attribute in die.attributes.values():
+            if attribute.form in STRING_TABLE_FORMS:
+                strings.add((attribute.form, attribute.raw_value, attribute.value))
+            elif attribute.form in INDIRECT_STRING_FORMS:
+                return None
+    return sorted(strings)
+
+
+def _verify_cu_strings(dwarf_info, strings: List[Tuple[str, int, bytes]]) -> bool:
+    for form, offset, value in strings:
+        if form == 'DW_FORM_strp':
+            actual = dwarf_info.get_string_from_table(offset)
+        else:
+            actual = dwarf_info.get_string_from_linetable(offset)
+        if actual != value:
+            return False
+    return True
+
+
+def collect_cu_cache_entry(cu: CompileUnit) -> CachedCU:
+    """ Collect the types of all the named top-level DIEs of a CU, so they can serve any whitelist. """
+    location = _get_cu_location(cu)
+    roots = {die.offset - cu.cu_offset: die.attributes['DW_AT_name'].value.decode('utf-8')
+             for die in _iter_named_dies(cu.get_top_DIE())}
+    try:
+        types = collect_cu_types(cu, None, list(roots), release_dies=False)
+        strings = _get_cu_strings(cu)
+    except Exception as e:
+        # Some DIEs can only be parsed as dependencies of specific types; these CUs are parsed on every run.
+        debug(f'Not caching {os.path.basename(location)}: {e!r}')
+        types = strings = None
+    finally:
+        _release_cu_dies(cu)
+
+    return CachedCU(location, roots, types, strings)
+
+
+def select_cached_types(entry: CachedCU, whitelist_re) -> Dict[int, Type]:
+    """ Select the whitelisted types of a cached CU and their dependencies. """
+    selected = {}
+    pending = [offset for offset, name in entry.roots.items() if whitelist_re.match(name)]
+    while len(pending) > 0:
+        offset = pending.pop()
+        if offset is None or isinstance(offset, Type) or offset in selected:
+            continue
+        selected[offset] = entry.types[offset]
+        pending.extend(selected[offset].get_type_dependencies())
+
+    # Keep the order in which the types were collected, like a live parse would.
+    return {offset: typ for offset, typ in entry.types.items() if offset in selected}
+
+
+class TypeCache(object):
+    """
+    An on-disk cache of the types collected from ELF files, stored in an SQLite database.
+
+    Every CU is cached separately by its contents, so rebuilding an ELF only parses the CUs that changed.
+    In addition, the list of CUs of every ELF is cached by its build-id, so parsing an ELF that was seen before
+    doesn't read its DWARF info at all.
+    """
+
+    def __init__(self, path: str):
+        path = os.path.expanduser(path)
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.db = sqlite3.connect(path)
+        self.db.executescript('''
+            CREATE TABLE IF NOT EXISTS elves (key TEXT PRIMARY KEY, cus TEXT NOT NULL);
+            CREATE TABLE IF NOT EXISTS cus (key TEXT PRIMARY KEY, names TEXT NOT NULL, strings BLOB, data BLOB NOT NULL);
+        ''')
+
+    @staticmethod
+    def default_path() -> str:
+        cache_home = os.environ.get('XDG_CACHE_HOME') or os.path.expanduser(os.path.join('~', '.cache'))
+        return os.path.join(cache_home, 'hydras', 'dwarf2hydra.sqlite3')
+
+    def get_elf(self, key: str) -> Optional[List[Tuple[int, str]]]:
+        """ Get the offsets and keys of the CUs of a cached ELF. """
+        row = self.db.execute('SELECT cus FROM elves WHERE key = ?', (key, )).fetchone()
+        if row is None:
+            return None
+        return [(int(offset), cu_key) for offset, cu_key in (line.split(':') for line in row[0].split())]
+
+    def put_elf(self, key: str, cus: List[Tuple[int, str]]):
+        self.db.execute('INSERT OR REPLACE INTO elves VALUES (?, ?)',
+                        (key, '\n'.join(f'{offset}:{cu_key}' for offset, cu_key in cus)))
+
+    def get_cu_header(self, key: str) -> Optional[Tuple[List[str], Optional[list]]]:
+        """ Get the root names and the strings of a cached CU, without loading its types. """
+        row = self.db.execute('SELECT names, strings FROM cus WHERE key = ?', (key, )).fetchone()
+        if row is None:
+            return None
+        names, strings = row
+        return names.split('\n'), strings and pickle.loads(zlib.decompress(strings))
+
+    def get_cu(self, key: str) -> CachedCU:
+        data, = self.db.execute('SELECT data FROM cus WHERE key = ?', (key, )).fetchone()
+        return pickle.loads(zlib.decompress(data))
+
+    def put_cu(self, key: str, entry: CachedCU):
+        strings = None if entry.strings is None else zlib.compress(pickle.dumps(entry.strings))
+        self.db.execute('INSERT OR REPLACE INTO cus VALUES (?, ?, ?, ?)',
+                        (key, '\n'.join(entry.roots.values()), strings,
+                         zlib.compress(pickle.dumps(entry, pickle.HIGHEST_PROTOCOL))))
+
+    def commit(self):
+        self.db.commit()
+
+    def close(self):
+        self.db.close()
+
+
+def _collect_cache_entries_worker(elf_path: str, cu_offsets: List[int]) -> List[CachedCU]:
+    with open(elf_path, 'rb') as f:
+        dwarf_info = ELFFile(f).get_dwarf_info()
+        return [collect_cu_cache_entry(dwarf_info.get_CU_at(cu_offset)) for cu_offset in cu_offsets]
+
+
+def _iter_cached_cu_types(elf, whitelist_re, jobs: int, cache: TypeCache):
+    """
+    Collect the types of all compile units through the cache, collecting and storing the missing CUs.
+    The types are yielded in the order of the compile units, just like a live parse.
+    """
+    def matches(names):
+        return any(whitelist_re.match(name) for name in names)
+
+    with profile_phase('Cache access'):
+        elf_key = get_elf_cache_key(elf)
+        cached_cus = cache.get_elf(elf_key)
+    dwarf_info = None
+
+    if cached_cus is None:
+        # Reuse the entries of unchanged CUs, and collect the rest.
+        with profile_phase('ELF open'):
+            dwarf_info = elf.get_dwarf_info()
+        with profile_phase('Cache access'):
+            cached_cus = [(cu.cu_offset, get_cu_cache_key(dwarf_info, cu)) for cu in dwarf_info.iter_CUs()]
+
+            missing = []
+            for cu_offset, cu_key in cached_cus:
+                header = cache.get_cu_header(cu_key)
+                if header is None or header[1] is None or not _verify_cu_strings(dwarf_info, header[1]):
+                    missing.append((cu_offset, cu_key))
+        info(f'Collecting {len(missing)} of {len(cached_cus)} compile units into the cache')
+
+        missing_offsets = [cu_offset for cu_offset, _ in missing]
+        if jobs > 1 and len(missing) > 1:
+            entries = _map_cus_parallel(elf, _collect_cache_entries_worker, missing_offsets, jobs)
+        else:
+            entries = (collect_cu_cache_entry(dwarf_info.get_CU_at(cu_offset)) for cu_offset in missing_offsets)
+        for (_, cu_key), entry in zip(missing, entries):
+            with profile_phase('Cache access'):
+                cache.put_cu(cu_key, entry)
+
+        with profile_phase('Cache access'):
+            cache.put_elf(elf_key, cached_cus)
+            cache.commit()
+
+    for cu_offset, cu_key in cached_cus:
+        with profile_phase('Cache access'):
+            names, _ = cache.get_cu_header(cu_key)
+        with profile_phase('Whitelist matching'):
+            matched = matches(names)
+        if not matched:
+            continue
+
+        with profile_phase('Cache access'):
+            entry = cache.get_cu(cu_key)
+            types = select_cached_types(entry, whitelist_re) if entry.types is not None else None
+        if types is not None:
+            yield entry.location, types
+        else:
+            if dwarf_info is None:
+                dwarf_info = elf.get_dwarf_info()
+            yield entry.location, collect_cu_types(dwarf_info.get_CU_at(cu_offset), whitelist_re)
+
+
+def parse_dwarf_info(elf, whitelist_re, skip_duplicated_symbols, jobs: int = 1, cache: TypeCache = None):
+    """
+    Parse the types matching the whitelist out of the ELF's DWARF info.
+
+    :param jobs:    The number of processes used for collecting types out of compile units.
+                    Merging is done in the order of the compile units either way, so the result is deterministic.
+    :param cache:   [Optional] A cache of the collected types, reused across runs and whitelists.
+    :return:        The finalized types, ordered so that every type comes after its dependencies.
+    """
+    # A mapping of `(namespace, name): type` across all translation units.
+    aggregated_types_by_name = {}
+    # A mapping of `structural hash: type` across all translation units.
+    aggregated_types_by_hash = {}
+    # List of types by finalization order
+    finalization_order = []
+
+    if cache is not None:
+        cu_types = _iter_cached_cu_types(elf, whitelist_re, jobs, cache)
+    else:
+        with profile_phase('ELF open'):
+            dwarf_info = elf.get_dwarf_info()
+        with profile_phase('Whitelist matching'):
+            pubtypes_roots = find_pubtypes_roots(dwarf_info, whitelist_re)
+        if jobs > 1:
+            cu_types = _iter_cu_types_parallel(elf, whitelist_re, pubtypes_roots, jobs)
+        else:
+            cu_types = ((_get_cu_location(cu), collect_cu_types(cu, whitelist_re, pubtypes_roots.get(cu.cu_offset)))
+                        for cu in dwarf_info.iter_CUs())
+
+    if profiler is not None:
+        # With multiple jobs, the types are collected by the workers, while waiting for them is CU iteration.
+        cu_types = profiler.iter_cus(cu_types)
+
+    for location, types in cu_types:
+        info(f'Processing {os.path.basename(location)}')
+        merge_cu_types(types, skip_duplicated_symbols, aggregated_types_by_name, finalization_order,
+                       aggregated_types_by_hash)
+
+    if profiler is not None:
+        profiler.unique_kinds.update(type(typ).__name__ for typ in finalization_order)
     return finalization_order
 
 
+class TypeTable(object):
+    """ The descriptions of types for `hydras.lazy.LazyTypes`, by name, in the order of their dependencies. """
+
+    def __init__(self):
+        self.descriptions = OrderedDict()
+        # The names given to the described types, by their ids.
+        self._names = {}
+
+    def reserve_name(self, typ: Type, name: str):
+        """ Describe an anonymous type by the given name, unless it was already described. """
+        self._names.setdefault(id(typ), name)
+
+    def describe(self, typ: Type, describe) -> str:
+        """
+        Describe a type, if it wasn't described yet.
+
+        :param describe:    A function returning the description of the type.
+        :return:            The name of the type in the table.
+        """
+        name = self._names.get(id(typ))
+        if name is None:
+            name = self._names[id(typ)] = f'_anonymous_{len(self._names)}' if typ.is_anonymous() else typ.name
+        if name not in self.descriptions:
+            # Dependencies are described first, by `describe`.
+            self.descriptions[name] = describe()
+        return name
+
+
+def describe_types(structs, whitelist_re) -> Dict[str, tuple]:
+    """ Describe the whitelisted types, and their dependencies, for `hydras.lazy.LazyTypes`. """
+    table = TypeTable()
+    for struct in sorted(filter(lambda s: not s.is_anonymous() and whitelist_re.match(s.name), structs),
+                         key=lambda x: x.name):
+        struct.get_hydras_ref(table)
+    return table.descriptions
+
+
 def generate_hydra_file(structs, whitelist_re, fp: TextIO):
     fp.writelines([
             '# File was automatically generated using the dwarf2hydra.py tool.\n'
@@ -714,15 +1595,97 @@ def generate_hydra_file(structs, whitelist_re, fp: TextIO):
             'from typing import List\n'
         ])
 
-    structs = filter(lambda s: s.name is not None and whitelist_re.match(s.name), structs)
+    structs = filter(lambda s: not s.is_anonymous() and whitelist_re.match(s.name), structs)
     structs = sorted(structs, key=lambda x: x.name)
     fp = CodeOutput(fp)
     for struct in structs:
         struct.generate_hydras_definition(fp)
 
 
-def main():
+def write_lazy_hydra_module(descriptions: Dict[str, tuple], fp: TextIO):
+    """
+    Write a module whose types are described in a table, and built by `hydras.lazy.LazyTypes` on first access.
+    Importing it only evaluates the table, regardless of the number of types.
+    """
+    fp.writelines([
+        '# File was automatically generated using the dwarf2hydra.py tool.\n',
+        '# Types are built when first accessed, see `hydras.lazy.LazyTypes`.\n',
+        'from hydras.lazy import LazyTypes\n',
+        '\n',
+        '_types = LazyTypes({\n',
+    ])
+    for name, description in descriptions.items():
+        fp.write(f'    {name!r}: {description!r},\n')
+    fp.writelines([
+        '}, module=__name__)\n',
+        '\n',
+        '# Note that `from ... import *` builds all the types.\n',
+        '__all__ = tuple(_types)\n',
+        '\n',
+        '\n',
+        'def __getattr__(name):\n',
+        '    if name not in _types:\n',
+        "        raise AttributeError(f'module {__name__!r} has no attribute {name!r}')\n",
+        '    typ = globals()[name] = _types[name]\n',
+        '    return typ\n',
+        '\n',
+        '\n',
+        'def __dir__():\n',
+        '    return sorted(set(globals()) | set(_types))\n',
+    ])
+
+
+def generate_lazy_hydra_file(structs, whitelist_re, fp: TextIO):
+    write_lazy_hydra_module(describe_types(structs, whitelist_re), fp)
+
+
+def compile_whitelist(patterns: List[str]):
+    return re.compile('|'.join(map('(?:{0})'.format, patterns)))
+
+
+def load_types(elf_path: str,
+               whitelist: Union[str, List[str]],
+               type_set: str = 'default',
+               flatten: bool = False,
+               jobs: int = 1,
+               cache: str = None,
+               check_duplicates: bool = False) -> LazyTypes:
+    """
+    Load the whitelisted types of an ELF file as live Hydras types, without generating code.
+    Every type is only built when it is first accessed, along with its dependencies:
+
+        types = load_types('libfoo.so', ['packet_.*'])
+        packet = types.packet_header()
+
+    :param whitelist:   Regex patterns used to choose the types.
+    :param type_set:    The type-set used for primitives.
+    :param flatten:     Whether to treat C matrices as long one dimensional arrays.
+    :param jobs:        The number of processes used for parsing compile units.
+    :param cache:       [Optional] The path of a type cache (see `TypeCache`), reused across runs.
+    :param check_duplicates:    Fail on conflicting definitions of a type, rather than using the first one.
+    """
     global flatten_arrays, chosen_type_set
+    whitelist_re = compile_whitelist([whitelist] if isinstance(whitelist, str) else whitelist)
+    chosen_type_set = TYPE_SETS[type_set]
+    flatten_arrays = flatten
+
+    with open(elf_path, 'rb') as f:
+        elf = ELFFile(f)
+        if not elf.has_dwarf_info():
+            raise ValueError('Object file has no dwarf info!', elf_path)
+
+        type_cache = TypeCache(cache) if cache is not None else None
+        try:
+            structs = parse_dwarf_info(elf, whitelist_re, not check_duplicates, jobs, type_cache)
+        finally:
+            if type_cache is not None:
+                type_cache.close()
+
+    return LazyTypes(describe_types(structs, whitelist_re))
+
+
+def main():
+    global flatten_arrays, chosen_type_set, emit_layouts, materialize_padding, profiler
     args = argparse.ArgumentParser(description='Parses an ELF file with DWARF debug symbols and generates Hydra '
                                                'definitions for the selected structs.'
                                                ''
@@ -735,16 +1698,45 @@ def main():
     args.add_argument('-o', '--output', help='Name of output file.')
     args.add_argument('--type-set', help='Choose which type-set to use for primitives',
                       default='default', choices=TYPE_SETS.keys())
+    args.add_argument('-j', '--jobs', help='Number of processes used for parsing compile units. '
+                                           '0 uses all available CPUs.', type=int, default=1)
+    args.add_argument('--lazy', help='Generate a module that only builds its types when they are first accessed.',
+                      action='store_true')
+    args.add_argument('--cache', help='Cache the types parsed out of ELF files in the given SQLite database, '
+                                      'reusing them on later runs. Defaults to ~/.cache/hydras/dwarf2hydra.sqlite3.',
+                      nargs='?', const=TypeCache.default_path(), default=None, metavar='PATH')
+    args.add_argument('--layout', help='Give every generated struct a `__hydras_layout__` of its flattened `struct` '
+                                       'format and member offsets, and assert the sizes of the structs on import.',
+                      action='store_true')
+    args.add_argument('--materialize-padding', help='Generate compiler introduced padding as byte arrays, '
+                                                    'whose values are kept by the structs, rather than as `Padding`.',
+                      action='store_true')
+    args.add_argument('--check-duplicates', help='Parse every definition of a type that is defined by multiple '
+                                                 'compile units, and fail if they conflict, '
+                                                 'rather than using the first definition.',
+                      action='store_true')
+    args.add_argument('--profile', '--stats', help='Report the time and peak memory of every phase of the run, '
+                                                   'and statistics of the parsed types, to stderr.',
+                      action='store_true')
     args = args.parse_args()
 
-    whitelist_re = re.compile('|'.join(map('(?:{0})'.format, args.whitelist)))
+    if args.layout and args.lazy:
+        error('--layout cannot be used with --lazy')
+        sys.exit(1)
+
+    whitelist_re = compile_whitelist(args.whitelist)
 
     chosen_type_set = TYPE_SETS[args.type_set]
     flatten_arrays = args.flatten_arrays
+    emit_layouts = args.layout
+    materialize_padding = args.materialize_padding
+    profiler = Profiler() if args.profile else None
 
     with open(args.input_file, 'rb') as f:
-        elf = ELFFile(f)
-        if not elf.has_dwarf_info():
+        with profile_phase('ELF open'):
+            elf = ELFFile(f)
+            has_dwarf_info = elf.has_dwarf_info()
+        if not has_dwarf_info:
             error("Object file has no dwarf info!")
             sys.exit(1)
 
@@ -752,9 +1744,24 @@ def main():
         if args.output is not None:
             output = open(args.output, 'w')
 
-        structs = parse_dwarf_info(elf, whitelist_re, True)
-        generate_hydra_file(structs, whitelist_re, output)
+        cache = TypeCache(args.cache) if args.cache is not None else None
+        try:
+            structs = parse_dwarf_info(elf, whitelist_re, not args.check_duplicates, args.jobs or os.cpu_count(),
+                                       cache)
+        finally:
+            if cache is not None:
+                cache.close()
+        with profile_phase('Code generation'):
+            if args.lazy:
+                generate_lazy_hydra_file(structs, whitelist_re, output)
+            else:
+                generate_hydra_file(structs, whitelist_re, output)
+
+    if profiler is not None:
+        profiler.report()
 
 
 if __name__ == '__main__':
-    main()
+    # Run the importable module rather than `__main__`, so that cached (pickled) types refer to its classes.
+    from hydras.tools.dwarf2hydra import main as _main
+    _main()
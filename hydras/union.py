@@ -0,0 +1,217 @@
+"""
+Contains the C-style union type.
+
+:file:  union.py
+:date:  18/10/2026
+"""
+
+from .base import *
+from .struct import *
+from .struct import StructMeta, StructMetadata
+from .utils import *
+
+__all__ = ('Union', )
+
+# Values of these types cannot be modified in-place, so there is no need to keep them around
+# in order to write them back into the union's buffer.
+_IMMUTABLE_TYPES = (int, float, bytes)
+
+
+class UnionAlternative:
+    """ A descriptor that reinterprets the union's buffer as one of its alternatives. """
+
+    def __init__(self, name: str, serializer: Serializer):
+        self.name = name
+        self.serializer = serializer
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self.serializer
+        return instance._hydras_get(self.name)
+
+    def __set__(self, instance, value):
+        instance._hydras_set(self.name, value)
+
+
+class UnionMeta(StructMeta):
+    def __new__(mcs, name, bases, attributes):
+        members = collections.OrderedDict()
+        for base in bases:
+            if isinstance(base, UnionMeta):
+                members.update(base._hydras_metadata.members)
+
+        for member_name, value in list(attributes.items()):
+            for _name, _fmt in mcs._hydras_member_serializers(member_name, value):
+                if _name in members:
+                    raise TypeError('Name-clash detected')
+                elif not _fmt.is_constant_size:
+                    raise TypeError('Union alternatives must be of constant size')
+                members[_name] = _fmt
+                attributes[_name] = UnionAlternative(_name, _fmt)
+
+        metadata = StructMetadata()
+        metadata.name = name
+        metadata.size = max((m.byte_size for m in members.values()), default=0)
+        metadata.members = members
+        # All alternatives begin at the start of the union
+        metadata.offsets = {member_name: 0 for member_name in members}
+        metadata.is_constant_size = True
+        attributes[mcs.HYDRAS_METAATTR] = metadata
+
+        return type.__new__(mcs, name, bases, attributes)
+
+
+class Union(metaclass=UnionMeta):
+    """
+    A base class for C-style unions.
+
+    A union holds a single buffer, the size of its largest alternative.
+    Every alternative is decoded from the buffer when it is accessed, and is written into it when assigned,
+    so reading an alternative after writing another reinterprets the same bytes.
+    """
+    _hydras_metadata: StructMetadata
+
+    def __init__(self, initial_values: dict = None):
+        """
+        Creates a zeroed union.
+
+        :param initial_values:  May be used to set alternatives, in order.
+        """
+        super(Union, self).__init__()
+        self._hydras_buffer = bytearray(self._hydras_metadata.size)
+        # The settings the buffer is encoded with, e.g. its endianness.
+        self._hydras_settings = None
+        # The last accessed alternative, if it may have been modified in-place since (e.g. a nested struct).
+        self._hydras_active = None
+        # The name of the last assigned alternative, which is re-encoded when serializing with other settings.
+        # Reading an alternative doesn't change it.
+        self._hydras_stored = None
+
+        for name, value in (initial_values or {}).items():
+            setattr(self, name, value)
+
+    @classmethod
+    def _hydras_members(cls) -> collections.OrderedDict:
+        return cls._hydras_metadata.members
+
+    @classmethod
+    def is_constant_size(cls):
+        return True
+
+    def _hydras_flush(self):
+        """ Write the active alternative back into the buffer. """
+        if self._hydras_active is not None:
+            name, value = self._hydras_active
+            self._hydras_metadata.members[name].serialize_into(memoryview(self._hydras_buffer), 0, value,
+                                                               self._hydras_settings)
+
+    def _hydras_get(self, name):
+        if self._hydras_active is not None:
+            if self._hydras_active[0] == name:
+                return self._hydras_active[1]
+            self._hydras_flush()
+            self._hydras_active = None
+
+        serializer = self._hydras_metadata.members[name]
+        value = serializer.deserialize(memoryview(self._hydras_buffer)[:serializer.byte_size], self._hydras_settings)
+        if not isinstance(value, _IMMUTABLE_TYPES):
+            # May be modified in-place, and so is written back when flushed
+            self._hydras_active = (name, value)
+        return value
+
+    def _hydras_set(self, name, value):
+        serializer = self._hydras_metadata.members[name]
+        if HydraSettings.resolve(self._hydras_settings).validate:
+            serializer.validate(value)
+
+        self._hydras_active = None
+        serializer.serialize_into(memoryview(self._hydras_buffer), 0, value, self._hydras_settings)
+        self._hydras_stored = name
+        if not isinstance(value, _IMMUTABLE_TYPES):
+            self._hydras_active = (name, value)
+
+    def _hydras_encode(self, settings: HydraSettings = None) -> bytearray:
+        """
+        Get the contents of the buffer, encoded with the given settings.
+
+        When the target endianness differs from the buffer's, the last written alternative is re-encoded.
+        Raw data that no alternative was written over since deserialization is returned as is.
+        """
+        self._hydras_flush()
+        buffer = bytearray(self._hydras_buffer)
+        if self._hydras_stored is not None and \
+                HydraSettings.resolve(settings).target_endian != \
+                HydraSettings.resolve(self._hydras_settings).target_endian:
+            serializer = self._hydras_metadata.members[self._hydras_stored]
+            value = serializer.deserialize(memoryview(self._hydras_buffer)[:serializer.byte_size],
+                                           self._hydras_settings)
+            serializer.serialize_into(memoryview(buffer), 0, value, settings)
+        return buffer
+
+    def serialize(self, settings: HydraSettings = None, as_bytearray: bool = False):
+        """ Get the raw bytes of this union. """
+        buffer = self._hydras_encode(settings)
+        return buffer if as_bytearray else bytes(buffer)
+
+    def serialize_into(self, storage: memoryview, offset: int, settings: HydraSettings = None):
+        end = offset + len(self._hydras_buffer)
+        storage[offset:end] = self._hydras_encode(settings)
+        return end
+
+    def serialize_iov(self, settings: HydraSettings = None, copy_threshold: int = 512) -> List[memoryview]:
+        return [memoryview(self.serialize(settings))]
+
+    @classmethod
+    def deserialize(cls, raw_data, settings=None):
+        """ Create a union holding the given raw data, whose alternatives are decoded with the given settings. """
+        size = cls._hydras_metadata.size
+        if len(raw_data) < size:
+            raise ValueError('The supplied raw data is too short for a union of type "%s"' % get_type_name(cls))
+
+        union = cls()
+        union._hydras_buffer[:] = raw_data[:size]
+        union._hydras_settings = settings
+        return union
+
+    def validate(self):
+        """ Any bytes form a valid union. """
+        pass
+
+    def __len__(self):
+        return self._hydras_metadata.size
+
+    def __bytes__(self):
+        return self.serialize()
+
+    def __eq__(self, other):
+        if type(other) != type(self):
+            raise TypeError('Cannot equate unions of differing types.')
+        return self.serialize() == other.serialize()
+
+    def __ne__(self, other):
+        return not (self == other)
+
+    def __repr__(self):
+        return f'{get_type_name(self)}.deserialize({self.serialize()!r})'
+
+    def render_lines(self, options: RenderOptions = None) -> List[str]:
+        options = options or RenderOptions()
+        lines = [
+            f'{get_type_name(self)} {{'
+        ]
+
+        for name, serializer in self._hydras_metadata.members.items():
+            try:
+                sub_lines = serializer.render_lines(name, getattr(self, name), options)
+            except ValueError:
+                sub_lines = [f'{name}: <invalid>']
+            lines.extend(options.indent + sub_line for sub_line in sub_lines)
+
+        lines.append('}')
+        return lines
+
+    def render(self, options: RenderOptions = None) -> str:
+        return '\n'.join(self.render_lines(options))
+
+    def __str__(self):
+        return self.render()
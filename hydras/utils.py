@@ -23,7 +23,13 @@ class Endianness(enum.Enum):
         return self == Endianness.LITTLE or (self == Endianness.HOST and sys.byteorder == 'little')
 
     def is_equivalent_to_big_endian(self):
-        return self == Endianness.LITTLE or (self == Endianness.HOST and sys.byteorder == 'little')
+        return self == Endianness.BIG or (self == Endianness.HOST and sys.byteorder == 'big')
+
+    def is_byteswapped(self):
+        """ Determines whether data in this endianness must be byte-swapped in order to be read by the host. """
+        if sys.byteorder == 'little':
+            return self.is_equivalent_to_big_endian()
+        return self.is_equivalent_to_little_endian()
 
 
 def create_array(size: Union[int, slice], underlying_type):
@@ -32,6 +38,12 @@ def create_array(size: Union[int, slice], underlying_type):
     return Array[size, underlying_type]
 
 
+def create_bitfield(underlying_type, fields: dict):
+    # Importing locally in order to avoid weird import-cycle issues
+    from .bitfield import Bitfield
+    return Bitfield[underlying_type, fields]
+
+
 def fit_bytes_to_size(byte_string, length):
     """
     Ensure the given byte_string is in the correct length
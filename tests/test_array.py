@@ -9,6 +9,7 @@ Contains tests for type formatters from the `array.py` module.
 """
 
 from .utils import *
+import struct
 
 
 class ThatStruct(Struct):
@@ -74,3 +75,60 @@ class VectorTests(HydrasTestCase):
         a.array = [0, 0]
         self.assertEqual(a.serialize(), b'\00\x00\x00\x00')
 
+    def test_bulk_conversion_endianness(self):
+        count = Scalar.BULK_THRESHOLD * 2
+        data = list(range(count))
+        for item_type, fmt in ((u32_le, '<'), (u32_be, '>'), (i16_be, '>'), (f64_be, '>'), (f32_le, '<')):
+            array = item_type[count]()
+            expected = struct.pack(f'{fmt}{count}{item_type._hydras_metadata.fmt}', *data)
+            self.assertEqual(array.serialize(data), expected)
+            self.assertEqual(array.deserialize(expected), data)
+
+    def test_bulk_conversion_target_endianness(self):
+        count = Scalar.BULK_THRESHOLD
+        data = list(range(count))
+        array = u16[count]()
+        big_endian = HydraSettings(target_endian=Endianness.BIG)
+        little_endian = HydraSettings(target_endian=Endianness.LITTLE)
+
+        self.assertEqual(array.serialize(data, big_endian), struct.pack(f'>{count}H', *data))
+        self.assertEqual(array.serialize(data, little_endian), struct.pack(f'<{count}H', *data))
+        self.assertEqual(array.deserialize(struct.pack(f'>{count}H', *data), big_endian), data)
+        self.assertEqual(array.deserialize(struct.pack(f'<{count}H', *data), little_endian), data)
+
+    def test_interned_array_types(self):
+        self.assertIs(u16[4], u16[4])
+        self.assertIs(u16[4:8], u16[4:8])
+        self.assertIs(u16[2][3], u16[2][3])
+        self.assertIs(ThatStruct[2], ThatStruct[2])
+        self.assertIs(u16(5)[4], u16(5)[4])
+
+        self.assertIsNot(u16[4], u16[5])
+        self.assertIsNot(u16[4], u16[4:])
+        self.assertIsNot(u16[4], u16_be[4])
+        self.assertIsNot(u16[4], u16(5)[4])
+        self.assertIsNot(f32(0)[4], f32(0.0)[4])
+        self.assertIsNot(f32(-0.0)[2], f32(0.0)[2])
+        self.assertIsNot(f32[2]([0.0, -0.0])[3], f32[2]([0.0, 0.0])[3])
+        self.assertIsNot(u8[2]([True, 0])[3], u8[2]([1, 0])[3])
+        self.assertIs(f32(-0.0)[2], f32(-0.0)[2])
+
+        validator = RangeValidator(0, 10)
+        self.assertIs(u16(0, validator)[4], u16(0, validator)[4])
+        self.assertIsNot(u16(0, validator)[4], u16[4])
+
+    def test_interned_nested_struct_types(self):
+        self.assertIs(NestedStruct[ThatStruct], NestedStruct[ThatStruct])
+        self.assertIsNot(NestedStruct[ThatStruct], NestedStruct[HasArray])
+        # Structs objects may carry custom values, and are never shared.
+        self.assertIsNot(NestedStruct[ThatStruct()], NestedStruct[ThatStruct()])
+
+        class A(Struct):
+            member = ThatStruct
+
+        class B(Struct):
+            member = ThatStruct
+            array = ThatStruct[2]
+
+        self.assertIs(type(A._hydras_members()['member']), type(B._hydras_members()['member']))
+        self.assertIs(type(B._hydras_members()['array']), ThatStruct[2])
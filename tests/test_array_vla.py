@@ -131,3 +131,89 @@ class TestVLA(HydrasTestCase):
             a.a = [0] * 18
 
         a.a = [0] * 5
+
+    def test_length_linked_arrays(self):
+        class Header(Struct):
+            opcode = u8
+            data_length = u16_le
+
+        class Message(Struct):
+            header = Header
+            payload = u8[Ref('header.data_length')]
+            count = u8
+            items = u16_le[Ref('count')]
+            trailer = u8(0xFF)
+
+        self.assertFalse(Message.is_constant_size())
+        self.assertTrue(Message.is_self_delimiting())
+        self.assertEqual(len(Message), 5)
+        self.assertEqual(Message.offset_of('header.data_length')[0], 1)
+        with self.assertRaises(TypeError):
+            Message.offset_of('count')
+
+        m = Message()
+        m.payload = b'abc'
+        m.items = [1, 2]
+        self.assertEqual(len(m), 12)
+
+        # The length members are updated on serialization
+        data = m.serialize()
+        self.assertEqual(data, b'\x00\x03\x00abc\x02\x01\x00\x02\x00\xFF')
+        self.assertEqual(m.header.data_length, 3)
+        self.assertEqual(m.count, 2)
+
+        parsed = Message.deserialize(data + b'trailing garbage')
+        self.assertEqual(parsed, m)
+        self.assertEqual(len(parsed), len(data))
+
+        with self.assertRaises(ValueError):
+            Message.deserialize(data[:6])
+
+    def test_nested_length_linked_struct(self):
+        class Chunk(Struct):
+            length = u8
+            data = u8[Ref('length')]
+
+        class TwoChunks(Struct):
+            first = Chunk
+            second = Chunk
+            tail = u8[:]
+
+        raw_data = b'\x02ab\x01c\x99\x98'
+        parsed = TwoChunks.deserialize(raw_data)
+        self.assertEqual(parsed.first.data, b'ab')
+        self.assertEqual(parsed.second.data, b'c')
+        self.assertEqual(parsed.tail, b'\x99\x98')
+        self.assertEqual(parsed.serialize(), raw_data)
+
+    def test_negative_length_ref(self):
+        class SignedLength(Struct):
+            n = i8
+            data = u8[Ref('n')]
+            tail = u8
+
+        with self.assertRaises(ValueError):
+            SignedLength.deserialize(b'\xff\x01\x02\x03')
+        with self.assertRaises(ValueError):
+            SignedLength.peek_length(b'\xff\x01\x02\x03')
+
+        parsed = SignedLength.deserialize(b'\x02\x01\x02\x03')
+        self.assertEqual((parsed.data, parsed.tail), (b'\x01\x02', 3))
+        self.assertEqual(SignedLength.peek_length(b'\x02'), 4)
+
+    def test_invalid_length_refs(self):
+        with self.assertRaises(TypeError):
+            class RefToLaterMember(Struct):
+                data = u8[Ref('length')]
+                length = u8
+
+        with self.assertRaises(TypeError):
+            class RefToNonInteger(Struct):
+                length = f32
+                data = u8[Ref('length')]
+
+        with self.assertRaises(TypeError):
+            class AfterUnlinkedVLA(Struct):
+                length = u8
+                data = u8[:]
+                more = u8[Ref('length')]
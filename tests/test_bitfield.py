@@ -0,0 +1,85 @@
+#!/usr/bin/env python
+"""
+Contains tests for the `Bitfield` type formatter.
+
+:file: test_bitfield.py
+:date: 18/10/2026
+"""
+
+from .utils import *
+
+
+class Register(Struct):
+    header = u32_le.bits(version=3, kind=5, length=24)
+    status = u8.bits(ready=1, error=1, code=4)({'ready': 1})
+
+
+class BitfieldTests(HydrasTestCase):
+    def test_layout(self):
+        self.assertEqual(len(Register), 5)
+        self.assertIs(u32_le.bits(version=3, kind=5, length=24), type(Register._hydras_members()['header']))
+        self.assertEqual(repr(u32_le.bits(version=3, kind=5, length=24)), 'u32_le.bits(version=3, kind=5, length=24)')
+
+    def test_serialization(self):
+        r = Register()
+        self.assertEqual(r.serialize(), b'\x00\x00\x00\x00\x01')
+
+        r.header.version = 5
+        r.header.kind = 0x11
+        r.header.length = 0xABCDEF
+        r.status.code = 0xF
+        data = r.serialize()
+        self.assertEqual(data, bytes([5 | (0x11 << 3), 0xEF, 0xCD, 0xAB, 0b00111101]))
+
+        parsed = Register.deserialize(data)
+        self.assertEqual(dict(parsed.header), dict(version=5, kind=0x11, length=0xABCDEF))
+        self.assertEqual(dict(parsed.status), dict(ready=1, error=0, code=0xF))
+        self.assertEqual(parsed, r)
+
+    def test_defaults_are_not_shared(self):
+        a, b = Register(), Register()
+        a.status.error = 1
+        self.assertEqual(b.status.error, 0)
+
+    def test_reserved_bits(self):
+        data = b'\x00\x00\x00\x00\xC1'
+        parsed = Register.deserialize(data)
+        self.assertEqual(dict(parsed.status), dict(ready=1, error=0, code=0))
+        self.assertEqual(repr(parsed.status), '{ready=1, error=0, code=0, <reserved>=0xc0}')
+        self.assertEqual(parsed.serialize(), data)
+
+        parsed.status.code = 3
+        self.assertEqual(parsed.serialize()[-1], 0xCD)
+        self.assertEqual(copy.copy(parsed.status), parsed.status)
+        self.assertNotEqual(parsed.status, type(parsed.status)(dict(parsed.status)))
+        self.assertEqual(Register().status._hydras_reserved, 0)
+
+    def test_field_bounds(self):
+        r = Register()
+        r.header.version = 7
+        with self.assertRaises(ValueError):
+            r.header.version = 8
+        with self.assertRaises(ValueError):
+            r.header.version = -1
+        with self.assertRaises(AttributeError):
+            r.header.florp = 1
+        with self.assertRaises(TypeError):
+            r.header = 5
+
+    def test_invalid_declarations(self):
+        with self.assertRaises(ValueError):
+            u8.bits(a=4, b=5)
+        with self.assertRaises(ValueError):
+            u8.bits(a=0)
+        with self.assertRaises(TypeError):
+            i32.bits(a=1)
+
+    def test_bitfield_array(self):
+        array = u8.bits(low=4, high=4)[2]()
+        values = array.deserialize(b'\x21\x43')
+        self.assertEqual([dict(v) for v in values], [dict(low=1, high=2), dict(low=3, high=4)])
+        self.assertEqual(array.serialize(values), b'\x21\x43')
+
+
+if __name__ == '__main__':
+    unittest.main()
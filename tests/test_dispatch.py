@@ -0,0 +1,80 @@
+#!/usr/bin/env python
+"""
+Contains tests for the `Dispatcher` class.
+
+:file: test_dispatch.py
+:date: 18/10/2026
+"""
+
+from .utils import *
+
+
+class Opcodes(Enum, underlying_type=u8):
+    KEEP_ALIVE = 3
+    DATA = 15
+    UNKNOWN = 20
+
+
+class Header(Struct):
+    opcode = Opcodes
+    data_length = u32
+
+
+class DataPacket(Struct):
+    header = Header(dict(opcode=Opcodes.DATA, data_length=4))
+    payload = u8[4]
+
+
+class KeepAlivePacket(Struct):
+    header = Header(dict(opcode=Opcodes.KEEP_ALIVE))
+
+
+class Frame(Struct):
+    magic = u16
+    header = Header
+
+
+class KeepAliveBody(Struct):
+    counter = u8
+
+
+class DispatcherTests(HydrasTestCase):
+    def test_dispatch(self):
+        dispatcher = Dispatcher(Header, 'opcode', {Opcodes.DATA: DataPacket,
+                                                   Opcodes.KEEP_ALIVE: KeepAlivePacket})
+
+        data = DataPacket(dict(payload=b'abcd'))
+        parsed = dispatcher.deserialize(data.serialize())
+        self.assertIsInstance(parsed, DataPacket)
+        self.assertEqual(parsed, data)
+
+        self.assertIsInstance(dispatcher.deserialize(KeepAlivePacket().serialize()), KeepAlivePacket)
+        self.assertIs(dispatcher.get_struct_type(KeepAlivePacket().serialize()), KeepAlivePacket)
+
+    def test_unknown_tag(self):
+        dispatcher = Dispatcher(Header, 'opcode', {Opcodes.DATA: DataPacket})
+        raw_data = KeepAlivePacket().serialize()
+        self.assertEqual(dispatcher.peek(raw_data), int(Opcodes.KEEP_ALIVE))
+        self.assertEqual(dispatcher.deserialize(raw_data), raw_data)
+
+    def test_nested_tag_and_body_offset(self):
+        dispatcher = Dispatcher(Frame, 'header.opcode', body_offset=len(Frame))
+        dispatcher.register(Opcodes.KEEP_ALIVE, KeepAliveBody)
+        self.assertEqual(dispatcher.tag_offset, 2)
+
+        raw_data = Frame(dict(header=Header(dict(opcode=Opcodes.KEEP_ALIVE)))).serialize() + b'\x07'
+        parsed = dispatcher.deserialize(raw_data)
+        self.assertIsInstance(parsed, KeepAliveBody)
+        self.assertEqual(parsed.counter, 7)
+
+    def test_invalid_tags(self):
+        with self.assertRaises(AttributeError):
+            Dispatcher(Header, 'florp')
+        with self.assertRaises(TypeError):
+            Dispatcher(Frame, 'header')
+        with self.assertRaises(ValueError):
+            Dispatcher(Header, 'opcode').peek(b'\x03')
+
+
+if __name__ == '__main__':
+    unittest.main()
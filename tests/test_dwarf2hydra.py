@@ -0,0 +1,311 @@
+#!/usr/bin/env python
+"""
+Contains tests for the `dwarf2hydra` tool, using ELF files compiled from C fixtures.
+
+:file: test_dwarf2hydra.py
+:date: 18/10/2026
+"""
+
+from .utils import *
+from unittest import mock
+import contextlib
+import importlib.util
+import io
+import os
+import re
+import shutil
+import struct
+import subprocess
+import sys
+import tempfile
+
+try:
+    from hydras.tools import dwarf2hydra
+    from elftools.elf.elffile import ELFFile
+except ImportError:
+    # pyelftools isn't installed
+    dwarf2hydra = None
+
+REPOSITORY_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CC = shutil.which('cc')
+
+PACKETS_C = '''
+#include <stdint.h>
+typedef struct { uint8_t kind; uint32_t length; } hdr_t;
+struct point { int32_t x; int32_t y; };
+struct packet { hdr_t header; struct point points[2]; struct { uint16_t a; uint16_t b; } inner; };
+struct packet g_packet;
+'''
+
+SEGMENTS_C = '''
+#include <stdint.h>
+struct point { int32_t x; int32_t y; };
+struct segment { struct point from; struct point to; };
+struct segment g_segment;
+'''
+
+BITFIELDS_C = '''
+#include <stdint.h>
+struct gaps { uint32_t low : 3; uint32_t : 5; uint32_t high : 4; uint16_t after; };
+struct spill { uint64_t a : 32; uint64_t b : 20; };
+struct shared { uint64_t a : 30; uint64_t b : 20; uint8_t tail; };
+struct gaps g_gaps; struct spill g_spill; struct shared g_shared;
+'''
+
+CONFLICTING_POINT_C = '''
+#include <stdint.h>
+struct point { int64_t x; int64_t y; };
+struct point g_conflicting_point;
+'''
+
+TYPEDEF_C = '''
+#include <stdint.h>
+typedef struct foo { uint32_t x; } foo;
+foo g_foo;
+'''
+
+MESSAGE_C = '''
+#include <stdint.h>
+struct message { uint8_t message_kind_alpha; uint32_t message_size; };
+struct message g_message;
+'''
+
+
+@unittest.skipUnless(dwarf2hydra is not None and CC is not None, 'Requires pyelftools and a C compiler')
+class Dwarf2HydraTests(HydrasTestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.directory = tempfile.mkdtemp()
+        cls.addClassCleanup(shutil.rmtree, cls.directory)
+        # A shared object of multiple compile units
+        cls.library = cls.compile('libfixture.so', packets=PACKETS_C, segments=SEGMENTS_C)
+        cls.object = cls.compile('packets.o', packets=PACKETS_C)
+        cls.pubtypes_object = cls.compile('pubtypes.o', '-gpubnames', packets=PACKETS_C)
+        cls.message_object = cls.compile('message.o', message=MESSAGE_C)
+        cls.bitfields_object = cls.compile('bitfields.o', bitfields=BITFIELDS_C)
+        cls.conflicting_library = cls.compile('libconflicting.so', packets=PACKETS_C, conflicting=CONFLICTING_POINT_C)
+        cls.typedefs_library = cls.compile('libtypedefs.so', typedef=TYPEDEF_C,
+                                               typedef_again=TYPEDEF_C.replace('g_foo', 'g_foo_again'))
+
+    @classmethod
+    def compile(cls, output: str, *flags: str, **sources: str) -> str:
+        """ Compile the given C sources (by name) into an object or a shared object, with debug info. """
+        paths = []
+        for name, source in sources.items():
+            paths.append(os.path.join(cls.directory, f'{name}.c'))
+            with open(paths[-1], 'w') as f:
+                f.write(source)
+
+        output = os.path.join(cls.directory, output)
+        kind = ['-shared', '-fPIC'] if output.endswith('.so') else ['-c']
+        subprocess.run([CC, '-g', *kind, *flags, '-o', output, *paths], check=True, cwd=cls.directory)
+        return output
+
+    def run_tool(self, *args: str, expected_code: int = 0) -> subprocess.CompletedProcess:
+        process = subprocess.run([sys.executable, '-m', 'hydras.tools.dwarf2hydra', *args],
+                                 cwd=REPOSITORY_ROOT, capture_output=True, text=True)
+        self.assertEqual(process.returncode, expected_code, process.stderr)
+        return process
+
+    def generate(self, *args: str) -> str:
+        return self.run_tool(*args).stdout
+
+    @staticmethod
+    def parse(path: str, skip_duplicated_symbols: bool, stderr: io.StringIO = None) -> dict:
+        """ Parse all the types of an ELF file in-process, by name. """
+        with open(path, 'rb') as f, contextlib.redirect_stderr(stderr or io.StringIO()):
+            types = dwarf2hydra.parse_dwarf_info(ELFFile(f), re.compile('.*'), skip_duplicated_symbols)
+        return {typ.name: typ for typ in types if not typ.is_anonymous()}
+
+    def test_jobs(self):
+        output = self.generate('--whitelist', '.*', self.library)
+        self.assertIn('class packet(Struct):', output)
+        self.assertIn('class segment(Struct):', output)
+        self.assertEqual(self.generate('-j', '2', '--whitelist', '.*', self.library), output)
+        self.assertEqual(self.generate('-j', '2', '--lazy', '--whitelist', '.*', self.library),
+                         self.generate('--lazy', '--whitelist', '.*', self.library))
+
+    def load_module(self, name: str, source: str):
+        """ Import generated code as a module. """
+        path = os.path.join(self.directory, f'{name}.py')
+        with open(path, 'w') as f:
+            f.write(source)
+        spec = importlib.util.spec_from_file_location(name, path)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        return module
+
+    def test_lazy_module(self):
+        eager = self.load_module('eager_packets', self.generate('--whitelist', 'packet', self.object))
+        lazy = self.load_module('lazy_packets', self.generate('--lazy', '--whitelist', 'packet', self.object))
+
+        names = {'hdr_t', 'point', 'packet'}
+        self.assertTrue(names <= set(lazy.__all__))
+        self.assertEqual(set(lazy.__all__), set(lazy._types))
+        self.assertTrue(set(lazy.__all__) <= set(dir(lazy)))
+        self.assertEqual(lazy._types.built_types(), [])
+        self.assertFalse(names & set(vars(lazy)))
+
+        # Accessing a type only builds it (and its dependencies), and binds only it in the module.
+        self.assertEqual(len(lazy.point), 8)
+        self.assertEqual(lazy._types.built_types(), ['point'])
+        self.assertEqual(names & set(vars(lazy)), {'point'})
+        packet = lazy.packet
+        self.assertIs(lazy.packet, packet)
+        self.assertTrue({'hdr_t', 'packet'} <= set(lazy._types.built_types()))
+        self.assertEqual(names & set(vars(lazy)), {'point', 'packet'})
+        with self.assertRaises(AttributeError):
+            lazy.nothing
+
+        self.assertEqual(len(packet), len(eager.packet))
+        packets = []
+        for packet_type in (packet, eager.packet):
+            packets.append(packet_type())
+            packets[-1].header.kind = 1
+            packets[-1].header.length = 2
+            packets[-1].points[1].y = -3
+            packets[-1].inner.b = 4
+        lazy_packet, eager_packet = packets
+        self.assertEqual(lazy_packet.serialize(), eager_packet.serialize())
+        self.assertEqual(packet.deserialize(eager_packet.serialize()), lazy_packet)
+
+    def test_roots(self):
+        whitelist = re.compile('packet')
+        with open(self.pubtypes_object, 'rb') as f:
+            dwarf_info = ELFFile(f).get_dwarf_info()
+            (cu_offset, offsets), = dwarf2hydra.find_pubtypes_roots(dwarf_info, whitelist).items()
+            names = [dwarf_info.get_DIE_from_refaddr(cu_offset + offset).attributes['DW_AT_name'].value
+                     for offset in offsets]
+        self.assertEqual(names, [b'packet'])
+
+        with open(self.object, 'rb') as f:
+            self.assertEqual(dwarf2hydra.find_pubtypes_roots(ELFFile(f).get_dwarf_info(), whitelist), {})
+
+        # Without `.debug_pubtypes`, the roots are found among the named top-level DIEs.
+        output = self.generate('--whitelist', 'packet', self.object)
+        self.assertIn('class packet(Struct):', output)
+        self.assertIn('class point(Struct):', output)
+        self.assertNotIn('g_packet', output)
+        self.assertEqual(self.generate('--whitelist', 'packet', self.pubtypes_object), output)
+
+    def test_cache(self):
+        cache = os.path.join(self.directory, 'cache.sqlite3')
+        first = self.run_tool('--cache', cache, '--whitelist', 'message', self.message_object)
+        self.assertIn('Collecting 1 of 1 compile units', first.stderr)
+        self.assertIn('message_kind_alpha = u8', first.stdout)
+
+        # The ELF was seen before, so its compile units are taken from the cache.
+        second = self.run_tool('--cache', cache, '--whitelist', 'message', self.message_object)
+        self.assertNotIn('Collecting', second.stderr)
+        self.assertEqual(second.stdout, first.stdout)
+
+        # Rename a member in the string table, so that `.debug_info` remains the same.
+        with open(self.message_object, 'rb') as f:
+            data = f.read()
+        self.assertEqual(data.count(b'message_kind_alpha\0'), 1)
+        renamed_object = os.path.join(self.directory, 'renamed.o')
+        with open(renamed_object, 'wb') as f:
+            f.write(data.replace(b'message_kind_alpha\0', b'message_kind_gamma\0'))
+
+        keys = []
+        for path in (self.message_object, renamed_object):
+            with open(path, 'rb') as f:
+                dwarf_info = ELFFile(f).get_dwarf_info()
+                keys.append(dwarf2hydra.get_cu_cache_key(dwarf_info, next(dwarf_info.iter_CUs())))
+        self.assertEqual(keys[0], keys[1])
+
+        renamed = self.run_tool('--cache', cache, '--whitelist', 'message', renamed_object)
+        self.assertIn('Collecting 1 of 1 compile units', renamed.stderr)
+        self.assertIn('message_kind_gamma = u8', renamed.stdout)
+        self.assertNotIn('message_kind_alpha', renamed.stdout)
+
+    def test_deduplication(self):
+        # Both compile units define `struct point`, identically.
+        types = self.parse(self.library, skip_duplicated_symbols=False)
+        point, packet, segment = types['point'], types['packet'], types['segment']
+        self.assertIs(dict((name, typ) for _, typ, name in segment.members)['from'], point)
+        self.assertIs(dict((name, typ) for _, typ, name in packet.members)['points'].item_type, point)
+
+        stderr = io.StringIO()
+        # Conflicts are printed with their members' types.
+        with mock.patch.object(dwarf2hydra, 'chosen_type_set', dwarf2hydra.TYPE_SETS['default']), \
+                self.assertRaises(SystemExit):
+            self.parse(self.conflicting_library, skip_duplicated_symbols=False, stderr=stderr)
+        self.assertIn('Conflicting definitions for type `point`', stderr.getvalue())
+
+        # By default, the first definition of a name is used.
+        self.assertEqual(self.parse(self.conflicting_library, skip_duplicated_symbols=True)['point'].byte_size, 8)
+        self.run_tool('--check-duplicates', '--whitelist', 'point', self.conflicting_library, expected_code=1)
+
+    def test_typedef_of_same_named_struct(self):
+        # `typedef struct foo foo;` names two types, a tag and a typedef, which don't conflict.
+        with open(self.typedefs_library, 'rb') as f, contextlib.redirect_stderr(io.StringIO()):
+            types = dwarf2hydra.parse_dwarf_info(ELFFile(f), re.compile('.*'), False)
+        self.assertEqual(sorted(type(typ).__name__ for typ in types if typ.name == 'foo'), ['Struct', 'Typedef'])
+
+        output = self.generate('--check-duplicates', '--whitelist', 'foo', self.typedefs_library)
+        self.assertEqual(output, self.generate('--whitelist', 'foo', self.typedefs_library))
+        self.assertIn('class foo(Struct):', output)
+
+    def test_bitfields(self):
+        output = self.generate('--whitelist', 'gaps|spill|shared', self.bitfields_object)
+        # Unnamed bitfields leave gaps, which are filled by reserved fields.
+        self.assertIn('bitfield_0 = u16.bits(low=3, _reserved_1=5, high=4)', output)
+        # Bitfields that span more than 32 bits are stored in a 64-bit unit.
+        self.assertIn('bitfield_0 = u64.bits(a=32, b=20)', output)
+        # Units can't share bytes, and no scalar fits between `shared.a` and `shared.tail`.
+        self.assertIn('bitfield_0 = u8[7]', output)
+
+        namespace = {}
+        exec(output, namespace)
+        types = self.parse(self.bitfields_object, skip_duplicated_symbols=True)
+        for name in ('gaps', 'spill', 'shared'):
+            self.assertEqual(len(namespace[name]), types[name].byte_size, name)
+
+        gaps = namespace['gaps'].deserialize(b'\x05\x09\x34\x12')
+        self.assertEqual((gaps.bitfield_0.low, gaps.bitfield_0.high, gaps.after), (5, 9, 0x1234))
+
+    def test_layout(self):
+        output = self.generate('--layout', '--whitelist', 'packet|hdr_t', self.object)
+        # Typedefs name the anonymous structs they alias.
+        self.assertIn('class hdr_t(Struct):', output)
+        self.assertIn("    __hydras_layout__ = ('B3xI', (('kind', 0), ('length', 4)))", output)
+        self.assertIn('assert len(hdr_t) == 8', output)
+        self.assertIn('assert len(packet) == 28', output)
+        self.assertNotIn('None', output)
+
+        namespace = {}
+        exec(output, namespace)
+        packet_type = namespace['packet']
+        fmt, offsets = packet_type.__hydras_layout__
+        self.assertEqual(dict(offsets), {'header': 0, 'points': 8, 'inner': 24})
+
+        packet = packet_type()
+        packet.header.kind = 1
+        packet.header.length = 2
+        packet.points[1].y = -3
+        packet.inner.b = 4
+        self.assertEqual(struct.unpack('<' + fmt, packet.serialize(HydraSettings(target_endian=Endianness.LITTLE))),
+                         (1, 2, 0, 0, 0, -3, 0, 4))
+
+        # The lazy module names the same types.
+        lazy_output = self.generate('--lazy', '--whitelist', 'packet|hdr_t', self.object)
+        self.assertIn("'hdr_t': ('struct', (('kind', 'u8'), ('_padding_0', 3), ('length', 'u32')))", lazy_output)
+        self.assertIn("('header', 'hdr_t')", lazy_output)
+
+        self.run_tool('--layout', '--lazy', '--whitelist', 'packet', self.object, expected_code=1)
+
+    def test_profile(self):
+        process = self.run_tool('--profile', '--whitelist', '.*', self.library)
+        self.assertEqual(process.stdout, self.generate('--whitelist', '.*', self.library))
+        for phase in ('DIE collection', 'Deduplication', 'Finalization', 'Code generation', 'Total'):
+            self.assertIn(phase, process.stderr)
+        self.assertIn('Slowest compile units (of 2)', process.stderr)
+
+        cache = os.path.join(self.directory, 'profile.sqlite3')
+        process = self.run_tool('--stats', '--cache', cache, '-j', '2', '--whitelist', '.*', self.library)
+        self.assertIn('Cache access', process.stderr)
+
+
+if __name__ == '__main__':
+    unittest.main()
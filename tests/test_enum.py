@@ -87,6 +87,48 @@ class EnumClassTests(HydrasTestCase):
         self.assertEqual(lit, EOpcodeThingie.a)
         self.assertEqual(lit_ty, EOpcodeThingie.a)
 
+    def test_interned_literals(self):
+        self.assertIs(EOpcodeThingie.c, EOpcodeThingie.c)
+        self.assertIs(EOpcodeThingie.get_literal_by_name('c'), EOpcodeThingie.c)
+        self.assertIs(EOpcodeThingie.get_literal_by_value(10), EOpcodeThingie.c)
+        self.assertIs(StructThingie.deserialize(b'\x0a\x00\x00\x00\xFF').opcode, EOpcodeThingie.c)
+        self.assertIs(StructThingie().opcode, EOpcodeThingie.a)
+        self.assertIn(EOpcodeThingie.c, EOpcodeThingie)
+        self.assertNotIn(ESizedOpcodeThingie.c, EOpcodeThingie)
+
+    def test_literal_immutability(self):
+        with self.assertRaises(AttributeError):
+            EOpcodeThingie.a.value = 5
+
+    def test_literal_copies(self):
+        import copy
+        import pickle
+        self.assertIs(copy.copy(EOpcodeThingie.b), EOpcodeThingie.b)
+        self.assertIs(copy.deepcopy(EOpcodeThingie.b), EOpcodeThingie.b)
+        self.assertIs(pickle.loads(pickle.dumps(EOpcodeThingie.b)), EOpcodeThingie.b)
+
+    def test_unknown_value(self):
+        with self.assertRaises(ValidationError):
+            SizedStructThingie.deserialize(b'\x05')
+
+    def test_enum_array_deserialization(self):
+        literals = [ESizedOpcodeThingie.a, ESizedOpcodeThingie.d, ESizedOpcodeThingie.c]
+        for count in (3, Scalar.BULK_THRESHOLD * 3):
+            array = ESizedOpcodeThingie[count]()
+            values = array.deserialize(bytes([0, 11, 10]) * (count // 3))
+            self.assertEqual(values, literals * (count // 3))
+            self.assertTrue(all(a is b for a, b in zip(values, literals * (count // 3))))
+
+        with self.assertRaises(ValueError):
+            ESizedOpcodeThingie[3]().deserialize(b'\x00\x05\x00')
+
+    def test_enum_codes_deserialization(self):
+        raw_data = b'\x0a\x00\x00\x00\x01\x00\x00\x00'
+        settings = HydraSettings(target_endian=Endianness.LITTLE)
+        self.assertEqual(EOpcodeThingie().deserialize_codes(raw_data, settings), [10, 1])
+        with self.assertRaises(ValueError):
+            EOpcodeThingie().deserialize_codes(raw_data[:-1], settings)
+
 
 if __name__ == '__main__':
     unittest.main()
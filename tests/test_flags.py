@@ -0,0 +1,125 @@
+#!/usr/bin/env python
+"""
+Contains tests for the `Flags` type formatter.
+
+:file: test_flags.py
+:date: 18/10/2026
+"""
+
+from .utils import *
+from hydras.enum import FLAG_SETS_CACHE_SIZE
+
+
+class Permissions(Flags):
+    read = auto()
+    write = auto()
+    execute = auto()
+    read_write = 3
+
+
+class SmallPermissions(Flags, underlying_type=u8):
+    none = 0
+    a = 1
+    b = 4
+    c = auto()
+
+
+class File(Struct):
+    permissions = Permissions(Permissions.read)
+    small = SmallPermissions
+
+
+class FlagsTests(HydrasTestCase):
+    def test_auto_values(self):
+        self.assertEqual(Permissions.literals, dict(read=1, write=2, execute=4, read_write=3))
+        self.assertEqual(SmallPermissions.literals, dict(none=0, a=1, b=4, c=8))
+        self.assertEqual(len(Permissions), 4)
+        self.assertEqual(len(SmallPermissions), 1)
+
+    def test_operators(self):
+        rw = Permissions.read | Permissions.write
+        self.assertIs(rw, Permissions.read_write)
+        self.assertIs(rw & Permissions.write, Permissions.write)
+        self.assertIs(rw ^ Permissions.write, Permissions.read)
+        self.assertIs(~rw, Permissions.execute)
+        self.assertIs(rw | 4, Permissions.read | Permissions.write | Permissions.execute)
+        self.assertIn(Permissions.read, rw)
+        self.assertNotIn(Permissions.execute, rw)
+        self.assertEqual(list(rw), [Permissions.read, Permissions.write, Permissions.read_write])
+        self.assertFalse(rw & Permissions.execute)
+
+        with self.assertRaises(ValueError):
+            Permissions.read | 8
+
+    def test_repr(self):
+        self.assertEqual(repr(Permissions.read), 'Permissions.read')
+        self.assertEqual(repr(Permissions.read | Permissions.write), 'Permissions.read_write')
+        self.assertEqual(repr(Permissions.read | Permissions.execute), 'Permissions.read|Permissions.execute')
+        self.assertEqual(repr(Permissions.get_flag_set(0)), 'Permissions(0)')
+        self.assertEqual(repr(SmallPermissions.get_flag_set(0)), 'SmallPermissions.none')
+
+    def test_serialization(self):
+        f = File()
+        self.assertEqual(f.serialize(), b'\x01\x00\x00\x00\x00')
+
+        f.permissions = Permissions.read | Permissions.execute
+        f.small = SmallPermissions.a | SmallPermissions.c
+        data = f.serialize()
+        self.assertEqual(data, b'\x05\x00\x00\x00\x09')
+
+        parsed = File.deserialize(data)
+        self.assertIs(parsed.permissions, Permissions.read | Permissions.execute)
+        self.assertIs(parsed.small, SmallPermissions.a | SmallPermissions.c)
+        self.assertEqual(parsed, f)
+
+    def test_validation(self):
+        with self.assertRaises(ValidationError):
+            File.deserialize(b'\x08\x00\x00\x00\x00')
+        with self.assertRaises(ValueError):
+            File().permissions = 8
+        with self.assertRaises(ValueError):
+            Permissions(8)
+
+        self.assertIn(7, Permissions)
+        self.assertNotIn(8, Permissions)
+        self.assertIn(Permissions.write, Permissions)
+        self.assertNotIn(SmallPermissions.a, Permissions)
+
+    def test_deserialization_without_validation(self):
+        settings = HydraSettings(validate=False)
+        parsed = File.deserialize(b'\x09\x00\x00\x00\x00', settings)
+        self.assertEqual(int(parsed.permissions), 9)
+        self.assertEqual(repr(parsed.permissions), 'Permissions.read|Permissions(0x8)')
+        self.assertEqual(parsed.serialize(settings), b'\x09\x00\x00\x00\x00')
+        self.assertEqual(SmallPermissions[2]().deserialize(b'\x10\x01', settings), [0x10, SmallPermissions.a])
+
+        with self.assertRaises(ValueError):
+            Permissions().deserialize(b'\x09\x00\x00\x00')
+
+    def test_bounded_cache(self):
+        class ManyFlags(Flags, underlying_type=u16):
+            f0, f1, f2, f3, f4, f5, f6, f7, f8, f9, f10, f11 = (1 << bit for bit in range(12))
+
+        for value in range(1 << 12):
+            self.assertEqual(int(ManyFlags.get_flag_set(value)), value)
+        self.assertEqual(len(ManyFlags._hydras_metadata.flag_sets), FLAG_SETS_CACHE_SIZE)
+
+        # Literals are never evicted
+        self.assertIs(ManyFlags.get_flag_set(1 << 11), ManyFlags.f11)
+        self.assertIs(ManyFlags.f0 | ManyFlags.f1, ManyFlags.f0 | ManyFlags.f1)
+
+    def test_flags_array(self):
+        array = SmallPermissions[3]()
+        values = array.deserialize(b'\x00\x05\x0d')
+        self.assertEqual(values, [0, SmallPermissions.a | SmallPermissions.b, 13])
+
+    def test_copies(self):
+        import copy
+        import pickle
+        value = Permissions.read | Permissions.execute
+        self.assertIs(copy.deepcopy(value), value)
+        self.assertIs(pickle.loads(pickle.dumps(value)), value)
+
+
+if __name__ == '__main__':
+    unittest.main()
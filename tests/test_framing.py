@@ -0,0 +1,143 @@
+#!/usr/bin/env python
+"""
+Contains tests for the `Framer` class.
+
+:file: test_framing.py
+:date: 18/10/2026
+"""
+
+from .utils import *
+
+
+class Opcodes(Enum, underlying_type=u8):
+    KEEP_ALIVE = 3
+    DATA = 15
+
+
+class Header(Struct):
+    opcode = Opcodes
+    data_length = u16_le
+
+
+class KeepAlive(Struct):
+    header = Header(dict(opcode=Opcodes.KEEP_ALIVE))
+    counter = u32_le
+
+
+class Data(Struct):
+    header = Header(dict(opcode=Opcodes.DATA))
+    payload = u8[Ref('header.data_length')]
+    checksum = u8
+
+
+class FramingTests(HydrasTestCase):
+    def test_constant_size(self):
+        framer = Framer(KeepAlive)
+        messages = [KeepAlive(dict(counter=i)) for i in range(10)]
+        stream = b''.join(m.serialize() for m in messages)
+
+        received = []
+        for i in range(0, len(stream), 3):
+            received.extend(framer.feed(stream[i:i + 3]))
+        self.assertEqual(received, messages)
+        self.assertEqual(len(framer), 0)
+
+    def test_variable_size(self):
+        framer = Framer(Data, initial_capacity=4)
+        messages = [Data(dict(payload=bytes(range(i)), checksum=i)) for i in range(20)]
+        stream = b''.join(m.serialize() for m in messages)
+
+        received = []
+        for chunk_size in (1, 7, 100):
+            for i in range(0, len(stream), chunk_size):
+                received.extend(framer.feed(stream[i:i + chunk_size]))
+        self.assertEqual(received, messages * 3)
+
+    def test_partial_message(self):
+        framer = Framer(Data)
+        data = Data(dict(payload=b'abcd')).serialize()
+        self.assertEqual(list(framer.feed(data[:2])), [])
+        self.assertEqual(list(framer.feed(data[2:5])), [])
+        self.assertEqual(len(framer), 5)
+        self.assertEqual(list(framer.feed(data[5:] + data[:1])), [Data.deserialize(data)])
+        self.assertEqual(len(framer), 1)
+
+    def test_dispatcher(self):
+        framer = Framer(Dispatcher(Header, 'opcode', {Opcodes.DATA: Data, Opcodes.KEEP_ALIVE: KeepAlive}))
+        messages = [KeepAlive(dict(counter=1)), Data(dict(payload=b'xyz')), KeepAlive(dict(counter=2))]
+        stream = b''.join(m.serialize() for m in messages)
+        received = [m for i in range(len(stream)) for m in framer.feed(stream[i:i + 1])]
+        self.assertEqual([type(m) for m in received], [KeepAlive, Data, KeepAlive])
+        self.assertEqual(received[1], messages[1])
+
+    def test_unknown_tag(self):
+        framer = Framer(Dispatcher(Header, 'opcode', {Opcodes.KEEP_ALIVE: KeepAlive}))
+        keep_alive = KeepAlive(dict(counter=1)).serialize()
+        data = Data(dict(payload=b'xyz')).serialize()
+
+        with self.assertRaises(FramingError) as context:
+            framer.feed(keep_alive + data + keep_alive)
+        self.assertEqual(context.exception.messages, [KeepAlive(dict(counter=1))])
+        # The rest of the stream cannot be framed, and is dropped rather than wedging the framer.
+        self.assertEqual(len(framer), 0)
+        self.assertEqual(framer.feed(keep_alive), [KeepAlive(dict(counter=1))])
+
+    def test_undecodable_message(self):
+        framer = Framer(KeepAlive)
+        # An unknown opcode
+        bad = b'\xFF' + bytes(len(KeepAlive) - 1)
+        good = KeepAlive(dict(counter=2)).serialize()
+
+        with self.assertRaises(FramingError) as context:
+            framer.feed(good + bad + good)
+        self.assertEqual(context.exception.messages, [KeepAlive(dict(counter=2))])
+        # Only the bad message is dropped.
+        self.assertEqual(len(framer), len(good))
+        self.assertEqual(framer.feed(b''), [KeepAlive(dict(counter=2))])
+
+    def test_invalid_length(self):
+        class EmptyMessage(Struct):
+            pass
+
+        framer = Framer(EmptyMessage)
+        with self.assertRaises(FramingError):
+            framer.feed(b'\x01')
+        self.assertEqual(len(framer), 0)
+
+        class NegativeLength:
+            @staticmethod
+            def peek_length(raw_data, settings=None):
+                return -1
+
+        framer = Framer(NegativeLength)
+        with self.assertRaises(FramingError):
+            framer.feed(b'\x01\x02')
+        self.assertEqual(len(framer), 0)
+
+    def test_interleaved_feeds(self):
+        framer = Framer(KeepAlive, initial_capacity=1)
+        messages = [KeepAlive(dict(counter=i)) for i in range(4)]
+        stream = b''.join(m.serialize() for m in messages)
+
+        # Messages are framed eagerly, so results are not affected by later feeds that reuse the buffer.
+        first = framer.feed(stream[:10])
+        second = framer.feed(stream[10:])
+        self.assertEqual(first, messages[:1])
+        self.assertEqual(second, messages[1:])
+
+    def test_peek_length(self):
+        data = Data(dict(payload=b'abcd')).serialize()
+        self.assertIsNone(Data.peek_length(data[:2]))
+        self.assertEqual(Data.peek_length(data[:3]), len(data))
+        self.assertEqual(KeepAlive.peek_length(b''), len(KeepAlive))
+
+    def test_unframeable_struct(self):
+        class Unbound(Struct):
+            data = u8[:]
+
+        with self.assertRaises(TypeError):
+            Framer(Unbound)
+
+
+if __name__ == '__main__':
+    unittest.main()
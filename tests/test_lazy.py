@@ -0,0 +1,100 @@
+#!/usr/bin/env python
+"""
+Contains tests for the `LazyTypes` namespace.
+
+:file: test_lazy.py
+:date: 18/10/2026
+"""
+
+import pickle
+from .utils import *
+
+DESCRIPTIONS = {
+    'opcode_t': ('enum', 'u16', (('OP_READ', 1), ('OP_WRITE', 2))),
+    'header_t': ('struct', (('opcode', 'opcode_t'), ('_padding_0', ('u8', 2)), ('length', 'u32'))),
+    'word_t': ('union', (('word', 'u32'), ('bytes', ('u8', 4)))),
+    'length_t': ('alias', 'u32'),
+    'packet': ('struct', (('header', 'header_t'), ('w', 'word_t'), ('values', ('f64', 3, 2)))),
+    'unused': ('struct', (('x', 'i8'), )),
+}
+
+types = LazyTypes(DESCRIPTIONS, module=__name__)
+
+
+# Lets the built types be pickled by reference, like in a generated module.
+def __getattr__(name):
+    try:
+        return types[name]
+    except KeyError:
+        raise AttributeError(name) from None
+
+
+class LazyTypesTests(HydrasTestCase):
+    def test_build_on_access(self):
+        lazy = LazyTypes(DESCRIPTIONS)
+        self.assertEqual(len(lazy), len(DESCRIPTIONS))
+        self.assertEqual(lazy.built_types(), [])
+
+        packet = lazy.packet
+        self.assertEqual(set(lazy.built_types()), {'opcode_t', 'header_t', 'word_t', 'packet'})
+        self.assertIs(lazy.packet, packet)
+        self.assertIs(lazy['header_t'], lazy.header_t)
+        self.assertNotIn('unused', lazy.built_types())
+
+    def test_types(self):
+        self.assertTrue(issubclass(types.header_t, Struct))
+        self.assertTrue(issubclass(types.word_t, Union))
+        self.assertTrue(issubclass(types.opcode_t, Enum))
+        self.assertIs(types.length_t, u32)
+
+        self.assertEqual(len(types.header_t), 8)
+        self.assertEqual(len(types.word_t), 4)
+        self.assertEqual(len(types.packet), 8 + 4 + 48)
+        self.assertEqual(list(types.packet._hydras_metadata.members), ['header', 'w', 'values'])
+
+    def test_serialize(self):
+        packet = types.packet()
+        packet.header.opcode = types.opcode_t.OP_WRITE
+        packet.header.length = 5
+        packet.w.bytes = [1, 2, 3, 4]
+        packet.values[1][2] = 1.5
+
+        data = packet.serialize(HydraSettings(target_endian=Endianness.LITTLE))
+        self.assertEqual(data[:12], b'\x02\0\0\0\x05\0\0\0\x01\x02\x03\x04')
+        self.assertEqual(types.packet.deserialize(data, HydraSettings(target_endian=Endianness.LITTLE)), packet)
+
+    def test_vla(self):
+        lazy = LazyTypes({'blob': ('struct', (('length', 'u32'), ('data', ('u8', None))))})
+        self.assertFalse(lazy.blob.is_constant_size())
+        self.assertEqual(lazy.blob(dict(length=3, data=[1, 2, 3])).serialize()[4:], b'\1\2\3')
+
+    def test_bitfields(self):
+        lazy = LazyTypes({'reg_t': ('struct', (
+            ('bitfield_0', {'bits': 'u16', 'fields': (('enabled', 1), ('_reserved_1', 3), ('divider', 12))}),
+            ('other', 'u16'),
+        ))})
+        reg = lazy.reg_t.deserialize(b'\x51\x02\x07\x00', HydraSettings(target_endian=Endianness.LITTLE))
+        self.assertEqual(dict(reg.bitfield_0), {'enabled': 1, '_reserved_1': 0, 'divider': 0x25})
+        self.assertEqual(reg.other, 7)
+
+    def test_padding(self):
+        lazy = LazyTypes({'padded_t': ('struct', (('opcode', 'u8'), ('_padding_0', 3), ('length', 'u32')))})
+        self.assertEqual(len(lazy.padded_t), 8)
+        self.assertEqual(list(dict(lazy.padded_t())), ['opcode', 'length'])
+
+    def test_missing(self):
+        with self.assertRaises(AttributeError):
+            _ = types.missing_t
+        with self.assertRaises(KeyError):
+            _ = types['missing_t']
+        self.assertNotIn('missing_t', types)
+        self.assertIn('packet', dir(types))
+
+    def test_pickle(self):
+        header = types.header_t(dict(length=7))
+        self.assertEqual(types.header_t.__module__, __name__)
+        self.assertEqual(pickle.loads(pickle.dumps(header)), header)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,65 @@
+#!/usr/bin/env python
+"""
+Contains tests for the `Padding` formatter.
+
+:file: test_padding.py
+:date: 18/10/2026
+"""
+
+from .utils import *
+
+
+class Padded(Struct):
+    opcode = u8
+    _padding_0 = Padding(3)
+    length = u32_le
+    _padding_1 = Padding(2, fill=0xff)
+    flags = u16_le
+
+
+class PaddingTests(HydrasTestCase):
+    def test_layout(self):
+        self.assertEqual(len(Padded), 12)
+        self.assertEqual(Padded.offset_of('length')[0], 4)
+        self.assertEqual(Padded.offset_of('flags')[0], 10)
+        self.assertEqual(repr(Padding(3)), 'Padding(3)')
+        self.assertEqual(repr(Padding(2, fill=0xff)), 'Padding(2, fill=0xff)')
+
+    def test_serialization(self):
+        p = Padded(dict(opcode=1, length=2, flags=3))
+        data = p.serialize()
+        self.assertEqual(data, b'\x01\0\0\0\x02\0\0\0\xff\xff\x03\0')
+
+        # Padding is written even into storage that isn't zeroed.
+        storage = bytearray(b'\xaa' * 12)
+        p.serialize_into(memoryview(storage), 0)
+        self.assertEqual(storage, data)
+
+        parsed = Padded.deserialize(b'\x01\x11\x22\x33\x02\0\0\0\x44\x55\x03\0')
+        self.assertEqual(parsed, p)
+        self.assertNotIn('_padding_0', vars(parsed))
+
+    def test_no_value(self):
+        p = Padded()
+        self.assertEqual(list(dict(p)), ['opcode', 'length', 'flags'])
+        self.assertNotIn('_padding', p.render())
+        self.assertNotIn('_padding', repr(p))
+        self.assertEqual(p.serialize_iov()[0].tobytes(), p.serialize())
+
+    def test_short_data(self):
+        with self.assertRaises(ValueError):
+            Padded.deserialize(b'\x01\0\0\0\x02\0\0\0\xff')
+
+    def test_invalid_declarations(self):
+        with self.assertRaises(ValueError):
+            Padding(-1)
+        with self.assertRaises(ValueError):
+            Padding(1, fill=0x100)
+
+    def test_array_interning(self):
+        self.assertIsNot(Padding(2)[3], Padding(4)[3])
+        self.assertIs(Padding(2)[3], Padding(2)[3])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,84 @@
+#!/usr/bin/env python
+"""
+Contains tests for the `BufferPool` class and copy-free serialization.
+
+:file: test_pool.py
+:date: 18/10/2026
+"""
+
+from .utils import *
+
+
+class Header(Struct):
+    opcode = u8
+    data_length = u32
+
+
+class DataPacket(Struct):
+    header = Header(dict(opcode=15, data_length=128))
+    payload = u8[128]
+
+
+class ShortArrays(Struct):
+    opcode = u8
+    payload = u8[8]
+    values = u16[3]
+
+
+class BufferPoolTests(HydrasTestCase):
+    def test_serialize_as_bytearray(self):
+        packet = DataPacket(dict(payload=bytes(range(128))))
+        output = packet.serialize(as_bytearray=True)
+        self.assertIsInstance(output, bytearray)
+        self.assertEqual(output, packet.serialize())
+
+        self.assertEqual(u32_be().serialize(5, as_bytearray=True), bytearray(b'\0\0\0\5'))
+        self.assertIsInstance(DataPacket._hydras_members()['header'].serialize(packet.header, as_bytearray=True), bytearray)
+
+    def test_size_classes(self):
+        pool = BufferPool(min_size=64, max_size=1024)
+        self.assertEqual(len(pool.acquire(1)), 64)
+        self.assertEqual(len(pool.acquire(65)), 128)
+        self.assertEqual(len(pool.acquire(1024)), 1024)
+        self.assertEqual(len(pool.acquire(1025)), 1025)
+
+    def test_reuse(self):
+        pool = BufferPool(min_size=64, max_size=1024, max_free=1)
+        first, second = pool.acquire(100), pool.acquire(100)
+        pool.release(first)
+        pool.release(second)
+        self.assertIs(pool.acquire(100), first)
+        self.assertIsNot(pool.acquire(100), second)
+
+        # Foreign buffers of odd sizes are not kept
+        odd = bytearray(100)
+        pool.release(odd)
+        self.assertIsNot(pool.acquire(100), odd)
+
+    def test_serialize(self):
+        pool = BufferPool()
+        packet = DataPacket(dict(payload=bytes(range(128))))
+        with pool.serialize(packet) as data:
+            self.assertEqual(data, packet.serialize())
+            buffer = data.obj
+        self.assertIs(pool.acquire(len(packet)), buffer)
+
+    def test_serialize_short_arrays_into_reused_buffer(self):
+        pool = BufferPool(max_free=1)
+        with pool.serialize(ShortArrays(dict(opcode=1, payload=b'SECRETXX', values=[0xffff] * 3))):
+            pass
+
+        short = ShortArrays(dict(opcode=2, payload=b'ab', values=[1]))
+        with pool.serialize(short) as data:
+            self.assertEqual(data, short.serialize())
+            self.assertEqual(data, b'\x02ab' + bytes(6) + b'\x01\x00' + bytes(4))
+
+        short.payload = [1, 2]
+        with pool.serialize(short) as data:
+            self.assertEqual(data, short.serialize())
+
+    def test_invalid_bounds(self):
+        with self.assertRaises(ValueError):
+            BufferPool(min_size=0)
+        with self.assertRaises(ValueError):
+            BufferPool(min_size=1024, max_size=64)
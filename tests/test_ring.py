@@ -0,0 +1,122 @@
+#!/usr/bin/env python
+"""
+Contains tests for the `RingQueue` class.
+
+:file: test_ring.py
+:date: 18/10/2026
+"""
+
+import time
+import multiprocessing
+from .utils import *
+
+
+class Record(Struct):
+    producer = u8
+    sequence = u32
+
+
+class Message(Struct):
+    payload = u8[8]
+    values = u16[2]
+
+
+def _produce(name, producer, count, lock=None):
+    with RingQueue(Record, 8, name, producer_lock=lock) as queue:
+        for i in range(count):
+            while not queue.push(Record(dict(producer=producer, sequence=i))):
+                pass
+
+
+class RingQueueTests(HydrasTestCase):
+    def setUp(self):
+        super().setUp()
+        self.queue = RingQueue(Record, 4, create=True)
+        self.addCleanup(self.queue.unlink)
+        self.addCleanup(self.queue.close)
+
+    def test_push_pop(self):
+        self.assertIsNone(self.queue.pop())
+        self.assertTrue(self.queue.push(Record(dict(sequence=1))))
+        self.assertTrue(self.queue.push(Record(dict(sequence=2))))
+        self.assertEqual(len(self.queue), 2)
+        self.assertEqual(self.queue.pop().sequence, 1)
+        self.assertEqual(self.queue.pop().sequence, 2)
+        self.assertIsNone(self.queue.pop())
+
+    def test_full_and_wraparound(self):
+        for round in range(3):
+            records = [Record(dict(sequence=round * 10 + i)) for i in range(5)]
+            self.assertEqual(self.queue.push_many(records), 4)
+            self.assertFalse(self.queue.push(records[4]))
+            self.assertEqual(self.queue.pop_many(3), records[:3])
+            self.assertEqual(self.queue.pop_many(), records[3:4])
+
+    def test_consume_views(self):
+        self.queue.push_many([Record(dict(sequence=i)) for i in range(3)])
+        with self.queue.consume(2) as views:
+            self.assertEqual([bytes(v) for v in views], [Record(dict(sequence=i)).serialize() for i in range(2)])
+            self.assertEqual(len(self.queue), 3)
+        self.assertEqual(len(self.queue), 1)
+
+        # Structs stay queued if their handling fails
+        with self.assertRaises(RuntimeError):
+            with self.queue.consume():
+                raise RuntimeError()
+        self.assertEqual(self.queue.pop().sequence, 2)
+
+    def test_short_arrays_after_long_ones(self):
+        with RingQueue(Message, 2, create=True) as queue:
+            self.addCleanup(queue.unlink)
+            long_messages = [Message(dict(payload=b'SECRETXX', values=[0xffff, 0xffff]))] * 2
+            self.assertEqual(queue.push_many(long_messages), 2)
+            queue.pop_many()
+
+            # The short messages reuse the slots of the long ones.
+            short = Message(dict(payload=b'ab', values=[1]))
+            self.assertEqual(queue.push_many([short] * 2), 2)
+            with queue.consume() as views:
+                self.assertEqual([bytes(v) for v in views], [short.serialize()] * 2)
+            self.assertEqual(short.serialize(), b'ab' + bytes(6) + b'\x01\x00' + bytes(2))
+
+    def test_attach(self):
+        with RingQueue(Record, 4, self.queue.name) as other:
+            other.push(Record(dict(sequence=7)))
+        self.assertEqual(self.queue.pop().sequence, 7)
+
+    def test_invalid(self):
+        class Dynamic(Struct):
+            payload = u8[:]
+
+        with self.assertRaises(TypeError):
+            RingQueue(Dynamic, 4, create=True)
+        with self.assertRaises(ValueError):
+            RingQueue(Record, 0, create=True)
+        with self.assertRaises(ValueError):
+            RingQueue(Record, 1000, self.queue.name)
+
+    def test_processes(self):
+        lock = multiprocessing.Lock()
+        count = 200
+        with RingQueue(Record, 8, create=True) as queue:
+            self.addCleanup(queue.unlink)
+            producers = [multiprocessing.Process(target=_produce, args=(queue.name, p, count, lock)) for p in range(2)]
+            for producer in producers:
+                producer.start()
+
+            for producer in producers:
+                self.addCleanup(producer.kill)
+
+            received = {0: [], 1: []}
+            deadline = time.monotonic() + 60
+            while sum(map(len, received.values())) < 2 * count:
+                for record in queue.pop_many():
+                    received[record.producer].append(record.sequence)
+                # Don't hang if a producer crashed.
+                exit_codes = [producer.exitcode for producer in producers]
+                if any(code not in (None, 0) for code in exit_codes) or time.monotonic() > deadline:
+                    self.fail(f'The producers stopped after {received} (exit codes {exit_codes})')
+            for producer in producers:
+                producer.join()
+
+            self.assertEqual(received, {0: list(range(count)), 1: list(range(count))})
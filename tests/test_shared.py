@@ -0,0 +1,108 @@
+#!/usr/bin/env python
+"""
+Contains tests for the `SharedStruct` class.
+
+:file: test_shared.py
+:date: 18/10/2026
+"""
+
+import time
+import multiprocessing
+from .utils import *
+
+
+class Header(Struct):
+    opcode = u8
+    data_length = u32
+
+
+class DataPacket(Struct):
+    header = Header(dict(opcode=15, data_length=16))
+    payload = u8[16]
+
+
+def _produce(name, count):
+    with SharedStruct(DataPacket, name, seqlock=True) as shared:
+        for i in range(1, count + 1):
+            with shared.writing():
+                shared.set('header.data_length', i)
+                shared.payload = bytes([i % 256]) * 16
+
+
+class SharedStructTests(HydrasTestCase):
+    def setUp(self):
+        super().setUp()
+        self.shared = SharedStruct(DataPacket, create=True)
+        self.addCleanup(self.shared.unlink)
+        self.addCleanup(self.shared.close)
+
+    def test_initial_value(self):
+        self.assertEqual(self.shared.read(), DataPacket())
+        self.assertEqual(bytes(self.shared.buf), DataPacket().serialize())
+
+    def test_members(self):
+        self.shared.set('header.opcode', 3)
+        self.shared.payload = bytes(range(16))
+        self.assertEqual(self.shared.get('header.opcode'), 3)
+        self.assertEqual(self.shared.header.opcode, 3)
+        self.assertEqual(bytes(self.shared.payload), bytes(range(16)))
+
+        with self.assertRaises(AttributeError):
+            self.shared.nothing = 1
+        with self.assertRaises(AttributeError):
+            self.shared.get('header.nothing')
+
+    def test_attach(self):
+        with SharedStruct(DataPacket, self.shared.name) as other:
+            other.write(DataPacket(dict(payload=b'x' * 16)))
+            with other.view('header.data_length') as view:
+                view[:] = b'\x20\0\0\0'
+        self.assertEqual(self.shared.read(), DataPacket(dict(header=Header(dict(opcode=15, data_length=32)),
+                                                             payload=b'x' * 16)))
+
+    def test_short_array_after_long_one(self):
+        self.shared.payload = b'SECRET' * 2
+        self.shared.payload = b'ab'
+        self.assertEqual(bytes(self.shared.buf[5:]), b'ab' + bytes(14))
+
+        self.shared.write(DataPacket(dict(payload=b'SECRET' * 2)))
+        self.shared.write(DataPacket(dict(payload=b'cd')))
+        self.assertEqual(bytes(self.shared.buf), DataPacket(dict(payload=b'cd')).serialize())
+
+    def test_invalid(self):
+        class Dynamic(Struct):
+            payload = u8[:]
+
+        with self.assertRaises(TypeError):
+            SharedStruct(Dynamic, create=True)
+        with self.assertRaises(ValueError):
+            self.shared.set('header.opcode', 256)
+
+    def test_seqlock_snapshots(self):
+        with SharedStruct(DataPacket, create=True, seqlock=True) as shared:
+            self.addCleanup(shared.unlink)
+            shared.write(DataPacket(dict(header=Header(dict(data_length=0)))))
+            process = multiprocessing.Process(target=_produce, args=(shared.name, 2000))
+            process.start()
+            self.addCleanup(process.kill)
+            deadline = time.monotonic() + 60
+            while True:
+                length, payload = shared.snapshot('header.data_length', 'payload')
+                self.assertEqual(bytes(payload), bytes([length % 256]) * 16)
+                if length == 2000:
+                    break
+                # Don't hang if the producer crashed.
+                if process.exitcode not in (None, 0) or time.monotonic() > deadline:
+                    self.fail(f'The producer stopped at {length} (exit code {process.exitcode})')
+            process.join()
+            self.assertEqual(shared._version[0] % 2, 0)
+
+    def test_seqlock_dead_writer(self):
+        with SharedStruct(DataPacket, create=True, seqlock=True, read_timeout=0.1) as shared:
+            self.addCleanup(shared.unlink)
+            # A writer that died mid-write leaves the version odd.
+            shared._version[0] = 1
+            with self.assertRaises(TimeoutError):
+                shared.read()
+            with self.assertRaises(TimeoutError):
+                shared.snapshot('header.opcode', 'payload')
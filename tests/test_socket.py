@@ -0,0 +1,141 @@
+#!/usr/bin/env python
+"""
+Contains tests for the socket helpers of `Struct`.
+
+:file: test_socket.py
+:date: 18/10/2026
+"""
+
+import socket
+from .utils import *
+
+
+class Header(Struct):
+    opcode = u8
+    data_length = u16_le
+
+
+class DataPacket(Struct):
+    header = Header
+    payload = u8[Ref('header.data_length')]
+
+
+class FixedPacket(Struct):
+    opcode = u8
+    payload = u8[8]
+
+
+class SocketTests(HydrasTestCase):
+    def test_recv_from_datagram(self):
+        left, right = socket.socketpair(socket.AF_UNIX, socket.SOCK_DGRAM)
+        with left, right:
+            buffer = bytearray(1024)
+            for payload in (b'\x01\x02\x03', b'', bytes(range(100))):
+                left.send(DataPacket(dict(header=Header(dict(opcode=7)), payload=payload)).serialize())
+                packet, _ = DataPacket.recv_from(right, buffer)
+                self.assertEqual(packet.header.opcode, 7)
+                self.assertEqual(bytes(packet.payload), payload)
+
+    def test_recv_from_truncated(self):
+        left, right = socket.socketpair(socket.AF_UNIX, socket.SOCK_DGRAM)
+        with left, right:
+            left.send(DataPacket(dict(payload=bytes(100))).serialize())
+            with self.assertRaises(ValueError):
+                DataPacket.recv_from(right, bytearray(50))
+
+            # The next datagram is received normally.
+            left.send(DataPacket(dict(payload=b'ab')).serialize())
+            packet, _ = DataPacket.recv_from(right, bytearray(50))
+            self.assertEqual(bytes(packet.payload), b'ab')
+
+    def test_recv_from_udp_loopback(self):
+        receiver = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        sender = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        with receiver, sender:
+            receiver.bind(('127.0.0.1', 0))
+            sender.bind(('127.0.0.1', 0))
+            sender.sendto(DataPacket(dict(payload=b'hello')).serialize(), receiver.getsockname())
+            packet, address = DataPacket.recv_from(receiver)
+            self.assertEqual(bytes(packet.payload), b'hello')
+            self.assertEqual(address, sender.getsockname())
+
+    def test_send_many(self):
+        left, right = socket.socketpair()
+        with left, right:
+            packets = [DataPacket(dict(header=Header(dict(opcode=i)), payload=bytes(i))) for i in range(10)]
+            sent = Struct.send_many(left, packets)
+            expected = b''.join(p.serialize() for p in packets)
+            self.assertEqual(sent, len(expected))
+
+            received = b''
+            while len(received) < sent:
+                received += right.recv(sent - len(received))
+            self.assertEqual(received, expected)
+
+            framer = Framer(DataPacket)
+            self.assertEqual([p.header.opcode for p in framer.feed(received)], list(range(10)))
+
+    def test_send_many_reuses_buffer(self):
+        left, right = socket.socketpair()
+        with left, right:
+            packets = [DataPacket(dict(payload=b'ab'))] * 3
+            buffer = bytearray(64)
+            self.assertEqual(Struct.send_many(left, packets, buffer), 15)
+            self.assertEqual(right.recv(64), packets[0].serialize() * 3)
+            self.assertEqual(buffer[:15], packets[0].serialize() * 3)
+
+    def test_send_short_array_after_long_one(self):
+        left, right = socket.socketpair()
+        with left, right:
+            buffer = bytearray(64)
+            Struct.send_many(left, [FixedPacket(dict(payload=b'SECRETXX'))], buffer)
+            self.assertEqual(right.recv(64), FixedPacket(dict(payload=b'SECRETXX')).serialize())
+
+            short = FixedPacket(dict(payload=b'a'))
+            Struct.send_many(left, [short], buffer)
+            self.assertEqual(right.recv(64), b'\x00a' + bytes(7))
+            self.assertEqual(short.serialize(), b'\x00a' + bytes(7))
+
+
+class SerializeIovTests(HydrasTestCase):
+    def test_payload_is_referenced(self):
+        payload = bytes(range(256)) * 4
+        packet = DataPacket(dict(header=Header(dict(opcode=3)), payload=payload))
+        buffers = packet.serialize_iov()
+
+        self.assertEqual(b''.join(buffers), packet.serialize())
+        self.assertEqual(len(buffers), 2)
+        self.assertIs(buffers[1].obj, payload)
+
+    def test_segments_around_payload(self):
+        class Framed(Struct):
+            header = Header
+            payload = u8[Ref('header.data_length')]
+            checksum = u32_le
+
+        packet = Framed(dict(payload=bytearray(1000), checksum=0xdeadbeef))
+        buffers = packet.serialize_iov()
+        self.assertEqual([len(b) for b in buffers], [3, 1000, 4])
+        self.assertEqual(b''.join(buffers), packet.serialize())
+
+    def test_small_payloads_are_copied(self):
+        packet = DataPacket(dict(payload=b'abc'))
+        buffers = packet.serialize_iov()
+        self.assertEqual(len(buffers), 1)
+        self.assertEqual(bytes(buffers[0]), packet.serialize())
+        self.assertEqual(len(packet.serialize_iov(copy_threshold=0)), 2)
+
+    def test_list_payloads_are_serialized(self):
+        packet = DataPacket(dict(payload=[1] * 1000))
+        self.assertEqual(b''.join(packet.serialize_iov()), packet.serialize())
+        self.assertEqual(len(packet.serialize_iov()), 1)
+
+    def test_sendmsg(self):
+        left, right = socket.socketpair()
+        with left, right:
+            packet = DataPacket(dict(payload=bytes(4096)))
+            sent = left.sendmsg(packet.serialize_iov())
+            received = b''
+            while len(received) < sent:
+                received += right.recv(sent - len(received))
+            self.assertEqual(received, packet.serialize())
@@ -0,0 +1,127 @@
+#!/usr/bin/env python
+"""
+Contains tests for the `Union` type.
+
+:file: test_union.py
+:date: 18/10/2026
+"""
+
+from .utils import *
+
+
+class Pair(Struct):
+    low = u16_le
+    high = u16_le
+
+
+class Word(Union):
+    as_u32 = u32_le
+    as_float = f32_le
+    as_bytes = u8[4]
+    as_pair = Pair
+    as_u8 = u8
+
+
+class Packet(Struct):
+    kind = u8
+    word = Word
+    words = Word[2]
+
+
+class TargetWord(Union):
+    as_u32 = u32
+    as_halves = u16[2]
+
+
+class TargetPacket(Struct):
+    word = TargetWord
+
+
+class UnionTests(HydrasTestCase):
+    def test_size(self):
+        self.assertEqual(len(Word), 4)
+        self.assertEqual(len(Word()), 4)
+        self.assertEqual(len(Packet), 13)
+        self.assertEqual(Packet.offset_of('word.as_pair.high')[0], 3)
+
+    def test_reinterpretation(self):
+        w = Word()
+        w.as_u32 = 0x3F800000
+        self.assertEqual(w.as_float, 1.0)
+        self.assertEqual(w.as_bytes, bytearray(b'\x00\x00\x80\x3F'))
+        self.assertEqual(w.as_pair.high, 0x3F80)
+        self.assertEqual(w.as_u8, 0)
+
+        w.as_u8 = 0xFF
+        self.assertEqual(w.as_u32, 0x3F8000FF)
+
+    def test_in_place_modification(self):
+        w = Word()
+        w.as_pair.high = 0x1234
+        w.as_pair.low = 0x5678
+        self.assertEqual(w.as_u32, 0x12345678)
+
+        w.as_bytes[0] = 0xAA
+        self.assertEqual(w.serialize(), b'\xAA\x56\x34\x12')
+
+    def test_nested_serialization(self):
+        p = Packet()
+        p.kind = 1
+        p.word.as_u32 = 0xDEADBEEF
+        p.words[1].as_pair = Pair(dict(low=1, high=2))
+        data = p.serialize()
+        self.assertEqual(data, b'\x01\xEF\xBE\xAD\xDE' + b'\x00' * 4 + b'\x01\x00\x02\x00')
+
+        parsed = Packet.deserialize(data)
+        self.assertEqual(parsed.word.as_float, Word.deserialize(b'\xEF\xBE\xAD\xDE').as_float)
+        self.assertEqual(parsed.words[1].as_u32, 0x00020001)
+        self.assertEqual(parsed, p)
+
+    def test_invalid_alternatives(self):
+        with self.assertRaises(TypeError):
+            class VariableUnion(Union):
+                a = u8[1:4]
+
+        with self.assertRaises(ValueError):
+            Word().as_u8 = 0x100
+
+    def test_target_endianness(self):
+        big = HydraSettings(target_endian=Endianness.BIG)
+        little = HydraSettings(target_endian=Endianness.LITTLE)
+
+        self.assertEqual(TargetWord(dict(as_u32=1)).serialize(big), b'\x00\x00\x00\x01')
+        self.assertEqual(TargetWord(dict(as_u32=1)).serialize(little), b'\x01\x00\x00\x00')
+        p = TargetPacket(dict(word=TargetWord(dict(as_u32=1))))
+        self.assertEqual(p.serialize(big), b'\x00\x00\x00\x01')
+
+        w = TargetWord.deserialize(b'\x00\x00\x00\x01', big)
+        self.assertEqual(w.as_u32, 1)
+        self.assertEqual(w.as_halves, [0, 1])
+        self.assertEqual(w.serialize(big), b'\x00\x00\x00\x01')
+
+        # Alternatives are written with the settings the union was deserialized with
+        w.as_u32 = 0x01020304
+        self.assertEqual(w.serialize(big), b'\x01\x02\x03\x04')
+        self.assertEqual(w.serialize(little), b'\x04\x03\x02\x01')
+
+        # Reading another alternative doesn't change which one is re-encoded
+        w = TargetWord.deserialize(bytes(4), big)
+        w.as_u32 = 1
+        self.assertEqual(w.serialize(little), b'\x01\x00\x00\x00')
+        self.assertEqual(w.as_halves, [0, 1])
+        self.assertEqual(w.serialize(little), b'\x01\x00\x00\x00')
+        self.assertEqual(w.serialize(big), b'\x00\x00\x00\x01')
+
+        parsed = TargetPacket.deserialize(b'\x00\x02\x00\x03', big)
+        self.assertEqual(parsed.word.as_halves, [2, 3])
+        parsed.word.as_halves[1] = 4
+        self.assertEqual(parsed.serialize(big), b'\x00\x02\x00\x04')
+
+    def test_render(self):
+        lines = Word.deserialize(b'\x01\x00\x00\x00').render_lines()
+        self.assertEqual(lines[0], 'Word {')
+        self.assertIn('    as_u32: 1', lines)
+
+
+if __name__ == '__main__':
+    unittest.main()